@@ -1,46 +1,166 @@
-from fastapi import FastAPI, HTTPException, Depends
+from fastapi import FastAPI, HTTPException, Depends, Request, Response, UploadFile, File
 from pydantic import BaseModel, EmailStr
-from motor.motor_asyncio import AsyncIOMotorClient
+from motor.motor_asyncio import AsyncIOMotorGridFSBucket
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
-from bson import ObjectId
-import bcrypt
+from fastapi.responses import FileResponse, PlainTextResponse, StreamingResponse
 import os
 from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
-from jose import jwt, JWTError
+from jose import jwt
+import asyncio
 import datetime
+import hashlib
 from bson import ObjectId, errors
-from fastapi_mail import FastMail, MessageSchema, ConnectionConfig
+from pymongo import ReturnDocument
+from pymongo.errors import DuplicateKeyError
 from typing import List
-from email.mime.multipart import MIMEMultipart
-from email.mime.text import MIMEText
-from fastapi.security import OAuth2PasswordBearer
 from dotenv import load_dotenv
 import logging
+import time
+from contextlib import asynccontextmanager
+from auth import TokenVerifier, token_digest
+from cache import ResponseCache
+from compression import MIN_COMPRESS_BYTES, CompressionMiddleware, negotiate
+from crud import Repository, create_crud_router, to_response
+from database import DB_NAME, MONGODB_URL, create_client, init_db, warm_pool
+from events import LiveFeed
+from export import stream_export
+from hashing import password_hasher
+from invalidation import create_channel
+from images import MEDIA_TYPES, image_pipeline, read_image_upload
+from metrics import InstrumentedRoute, MetricsMiddleware, render_metrics
+from limits import AdmissionControl, InMemoryBucketBackend
+from outbox import EmailOutbox
+from stats import DashboardStats
+from archive import Archiver
+from dedup import SUBMISSION_KEY, SubmissionDeduplicator
+from resumes import ResumeSweeper, resume_response, store_resume
+from search import SearchIndex
+from serialization import MongoJSONResponse, dumps
+from pagination import DEFAULT_PAGE_SIZE, fetch_page, parse_date, parse_fields
 
 # Load environment variables
 load_dotenv()
 
-# Email Configuration
-email_conf = ConnectionConfig(
-    MAIL_USERNAME=os.getenv("MAIL_USERNAME"),
-    MAIL_PASSWORD=os.getenv("MAIL_PASSWORD"),
-    MAIL_FROM=os.getenv("MAIL_FROM"),
-    MAIL_PORT=int(os.getenv("MAIL_PORT", "587")),
-    MAIL_SERVER=os.getenv("MAIL_SERVER"),
-    MAIL_FROM_NAME=os.getenv("MAIL_FROM_NAME"),
-    MAIL_STARTTLS=True,
-    MAIL_SSL_TLS=False,
-    USE_CREDENTIALS=True
-)
+# Email Configuration, built by the outbox on its first send: fastapi_mail
+# is slow to import and not needed to serve requests
+def load_mail_config():
+    from fastapi_mail import ConnectionConfig
+
+    return ConnectionConfig(
+        MAIL_USERNAME=os.getenv("MAIL_USERNAME"),
+        MAIL_PASSWORD=os.getenv("MAIL_PASSWORD"),
+        MAIL_FROM=os.getenv("MAIL_FROM"),
+        MAIL_PORT=int(os.getenv("MAIL_PORT", "587")),
+        MAIL_SERVER=os.getenv("MAIL_SERVER"),
+        MAIL_FROM_NAME=os.getenv("MAIL_FROM_NAME"),
+        MAIL_STARTTLS=os.getenv("MAIL_STARTTLS", "True") == "True",
+        MAIL_SSL_TLS=os.getenv("MAIL_SSL_TLS", "False") == "True",
+        USE_CREDENTIALS=os.getenv("USE_CREDENTIALS", "True") == "True"
+    )
 
 # Constants
 SECRET_KEY = os.getenv("SECRET_KEY", "miniproject")
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_HOURS = 24  # Token expires after 24 hours
 
+# How workers tell each other about writes: "mongo" (capped collection) for
+# multi-worker deployments such as `uvicorn app:app --workers 4`, "local"
+# for a single process
+CACHE_CHANNEL = os.getenv("CACHE_CHANNEL", "mongo")
+
+# Application lifespan: one Mongo client per process, indexes ensured and
+# the pool warmed before the server starts accepting requests
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    global client, email_outbox, dashboard_stats, live_feed, cache_channel, archiver, submission_dedup
+    global resume_sweeper
+    global startup_seconds, shutting_down
+    started = time.perf_counter()
+    client = create_client()
+    bind_database(client[DB_NAME])
+    await init_db(db)
+    await warm_pool(client)
+    # FAQs are few; inquiries grow without bound, so their index is built in
+    # the background and /search answers 503 for them until it is ready
+    await faq_search_index.build(faqs_collection)
+    start_inquiry_index_build()
+    cache_channel = create_channel(CACHE_CHANNEL, db, apply_cache_event)
+    await cache_channel.start()
+    await load_revocations()
+    submission_dedup = SubmissionDeduplicator(
+        window=float(os.getenv("DEDUP_WINDOW_SECONDS", "600")),
+        max_keys=int(os.getenv("DEDUP_MAX_KEYS", "10000")),
+    )
+    print(f"Connected to MongoDB at {MONGODB_URL}, Database: {DB_NAME}")
+
+    email_outbox = EmailOutbox(
+        email_outbox_collection,
+        load_mail_config,
+        on_sent=mark_inquiry_replied,
+        batch_size=int(os.getenv("MAIL_BATCH_SIZE", "20")),
+        max_attempts=int(os.getenv("MAIL_MAX_ATTEMPTS", "5")),
+        lease_seconds=float(os.getenv("MAIL_LEASE_SECONDS", "300")),
+    )
+    email_outbox.start()
+
+    dashboard_stats = DashboardStats(
+        stats_collection,
+        contacts_collection,
+        job_applications_collection,
+        reconcile_interval=float(os.getenv("STATS_RECONCILE_INTERVAL", "3600")),
+        archived_contacts=archived_contacts_collection,
+        archived_applications=archived_job_applications_collection,
+    )
+    dashboard_stats.start()
+
+    archiver = Archiver(
+        contacts_collection,
+        job_applications_collection,
+        archived_contacts_collection,
+        archived_job_applications_collection,
+        monthly_rollups_collection,
+        min_age_days=float(os.getenv("ARCHIVE_MIN_AGE_DAYS", "90")),
+        batch_size=int(os.getenv("ARCHIVE_BATCH_SIZE", "500")),
+        interval=float(os.getenv("ARCHIVE_INTERVAL", "3600")),
+        on_archived=records_archived,
+    )
+    archiver.start()
+
+    resume_sweeper = ResumeSweeper(
+        resume_bucket,
+        db["resumes.files"],
+        [job_applications_collection, archived_job_applications_collection],
+        max_age_hours=float(os.getenv("RESUME_ORPHAN_MAX_AGE_HOURS", "24")),
+        interval=float(os.getenv("RESUME_SWEEP_INTERVAL", "3600")),
+    )
+    resume_sweeper.start()
+
+    live_feed = LiveFeed(
+        contacts_collection,
+        job_applications_collection,
+        formatters={"inquiry": format_inquiry, "application": format_application},
+        relay=lambda event: cache_channel.publish("feed", event),
+    )
+    await live_feed.start()
+    startup_seconds = time.perf_counter() - started
+    logging.info(f"Startup completed in {startup_seconds:.3f}s")
+    yield
+    shutting_down = True
+    await live_feed.stop()
+    await resume_sweeper.stop()
+    if inquiry_index_task is not None:
+        inquiry_index_task.cancel()
+    await archiver.stop()
+    await dashboard_stats.stop()
+    await email_outbox.stop()
+    await cache_channel.stop()
+    password_hasher.shutdown()
+    image_pipeline.shutdown()
+    client.close()
+
 # FastAPI Instance
-app = FastAPI()
+app = FastAPI(lifespan=lifespan, default_response_class=MongoJSONResponse)
+app.router.route_class = InstrumentedRoute
 
 # CORS Middleware
 app.add_middleware(
@@ -49,19 +169,133 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor"],
 )
 
-# MongoDB Connection
-MONGO_URI = os.getenv("MONGODB_URL", "mongodb://127.0.0.1:27017")
-DB_NAME = os.getenv("DB_NAME", "ESWEBSITE")
-client = AsyncIOMotorClient(MONGO_URI)
-db = client[DB_NAME]
-contacts_collection = db["contacts"]
-admins_collection = db["admins"]
-faqs_collection = db["faqs"]
-latest_works_collection = db["latest_works"]
-job_applications_collection = db["job_applications"]
-job_listings_collection = db["job_listings"]  # New collection for job listings
+# gzip/brotli for dynamic responses; cached public lists carry precompressed bodies
+app.add_middleware(CompressionMiddleware)
+
+# Per-route latency and error metrics, exposed at /metrics
+app.add_middleware(MetricsMiddleware)
+
+@app.get("/metrics", response_class=PlainTextResponse)
+async def get_metrics():
+    return PlainTextResponse(render_metrics(), media_type="text/plain; version=0.0.4")
+
+# Health probes: /healthz only says the process serves requests (liveness);
+# /healthz/ready also checks the dependencies a request needs (readiness)
+HEALTH_CHECK_TIMEOUT = float(os.getenv("HEALTH_CHECK_TIMEOUT", "2"))
+startup_seconds = None
+shutting_down = False
+
+@app.get("/healthz")
+async def liveness():
+    return {"status": "ok"}
+
+@app.get("/healthz/ready")
+async def readiness():
+    checks = {}
+    try:
+        await asyncio.wait_for(client.admin.command("ping"), timeout=HEALTH_CHECK_TIMEOUT)
+        checks["mongo"] = "ok"
+    except Exception as e:
+        checks["mongo"] = f"error: {str(e) or type(e).__name__}"
+    ready = not shutting_down and all(check == "ok" for check in checks.values())
+    return MongoJSONResponse(
+        status_code=200 if ready else 503,
+        content={
+            "status": "ready" if ready else "unavailable",
+            "shutting_down": shutting_down,
+            "checks": checks,
+            # Not a readiness check: only /search depends on these
+            "search_indexes": {name: index.ready for name, index in search_indexes.items()},
+            "startup_seconds": startup_seconds,
+        },
+    )
+
+# MongoDB Connection (opened by the lifespan hook below)
+client = None
+db = None
+contacts_collection = None
+admins_collection = None
+faqs_collection = None
+latest_works_collection = None
+job_applications_collection = None
+job_listings_collection = None  # New collection for job listings
+email_outbox_collection = None
+stats_collection = None
+gallery_images_collection = None
+revoked_tokens_collection = None  # Admin tokens revoked before their expiry
+# Solved inquiries and closed applications past ARCHIVE_MIN_AGE_DAYS, plus per-month totals
+archived_contacts_collection = None
+archived_job_applications_collection = None
+monthly_rollups_collection = None
+resume_bucket = None
+
+# Repositories for the resources with plain CRUD routes
+faqs_repository = Repository("faqs")
+latest_works_repository = Repository("latest_works")
+job_listings_repository = Repository("job_listings")
+job_applications_repository = Repository("job_applications")
+gallery_events_repository = Repository("gallery_events")
+
+# In-memory search indexes, built in the lifespan hook and updated on writes
+faq_search_index = SearchIndex({"question": 2.0, "answer": 1.0})
+inquiry_search_index = SearchIndex({"subject": 2.0, "name": 1.5, "email": 1.5, "message": 1.0})
+search_indexes = {"faqs": faq_search_index, "inquiries": inquiry_search_index}
+
+# Channel that keeps the in-memory state of all workers in step (set up in lifespan)
+cache_channel = None
+
+def bind_database(database):
+    global db, contacts_collection, admins_collection, faqs_collection, latest_works_collection
+    global job_applications_collection, job_listings_collection, email_outbox_collection, stats_collection
+    global gallery_images_collection, revoked_tokens_collection, resume_bucket
+    global archived_contacts_collection, archived_job_applications_collection, monthly_rollups_collection
+    db = database
+    contacts_collection = db["contacts"]
+    admins_collection = db["admins"]
+    faqs_collection = db["faqs"]
+    latest_works_collection = db["latest_works"]
+    job_applications_collection = db["job_applications"]
+    job_listings_collection = db["job_listings"]
+    email_outbox_collection = db["email_outbox"]
+    stats_collection = db["stats"]
+    gallery_images_collection = db["gallery_images"]
+    revoked_tokens_collection = db["revoked_tokens"]
+    archived_contacts_collection = db["contacts_archive"]
+    archived_job_applications_collection = db["job_applications_archive"]
+    monthly_rollups_collection = db["monthly_rollups"]
+    resume_bucket = AsyncIOMotorGridFSBucket(db, bucket_name="resumes")
+    for repository in (faqs_repository, latest_works_repository, job_listings_repository,
+                       job_applications_repository, gallery_events_repository):
+        repository.bind(db)
+
+# Read-through cache for the public list endpoints
+public_cache = ResponseCache(
+    ttl=float(os.getenv("PUBLIC_CACHE_TTL", "60")),
+    max_entries=int(os.getenv("PUBLIC_CACHE_MAX_ENTRIES", "128")),
+)
+
+# Admission control for the unauthenticated write endpoints
+limiter_backend = InMemoryBucketBackend()
+
+def public_write_admission(group: str) -> AdmissionControl:
+    return AdmissionControl(
+        group,
+        limiter_backend,
+        per_ip_rate=float(os.getenv("PUBLIC_WRITE_RATE_PER_IP", "0.1")),
+        per_ip_burst=float(os.getenv("PUBLIC_WRITE_BURST_PER_IP", "5")),
+        global_rate=float(os.getenv("PUBLIC_WRITE_RATE_GLOBAL", "20")),
+        global_burst=float(os.getenv("PUBLIC_WRITE_BURST_GLOBAL", "50")),
+        max_in_flight=int(os.getenv("PUBLIC_WRITE_MAX_IN_FLIGHT", "20")),
+    )
+
+contact_admission = public_write_admission("contact")
+application_admission = public_write_admission("applications")
+
+# Duplicate detection for the public forms (set up in lifespan)
+submission_dedup = None
 
 # Models
 class EmailSchema(BaseModel):
@@ -116,196 +350,446 @@ class JobApplication(BaseModel):
     phone: str
     experience: str
     address: str | None = None
-    resume: str | None = None
+    resume: str | None = None  # GridFS file ID returned by POST /job-applications/resume
     status: str = "pending"  # pending, approved, rejected
     appliedDate: str
 
+INQUIRY_FIELDS = ("name", "email", "subject", "message", "is_solved", "created_at")
+APPLICATION_FIELDS = tuple(JobApplication.model_fields)
+
+# Gallery Event Model; thumbnail and images hold uploaded image IDs or external URLs
+class GalleryEvent(BaseModel):
+    title: str
+    description: str
+    date: str
+    location: str
+    attendees: int = 0
+    category: str
+    thumbnail: str
+    images: List[str] = []
+    details: str = ""
+    highlights: List[str] = []
+
+class BulkIds(BaseModel):
+    ids: List[str]
+
+class BulkStatusUpdate(BaseModel):
+    ids: List[str]
+    status: str
+
 class ReplySchema(BaseModel):
     plain_text_body: str
     html_body: str
 
-# Password Hashing
-def hash_password(password: str) -> str:
-    salt = bcrypt.gensalt()
-    hashed_password = bcrypt.hashpw(password.encode("utf-8"), salt)
-    return hashed_password.decode("utf-8")
-
-def verify_password(plain_password: str, hashed_password: str) -> bool:
-    return bcrypt.checkpw(plain_password.encode("utf-8"), hashed_password.encode("utf-8"))
-
-# Generate JWT Token
+# Generate JWT Token; iat keeps sub-second precision so a revocation never
+# catches a token issued right after it
 def create_access_token(data: dict, expires_delta: datetime.timedelta | None = None):
     to_encode = data.copy()
     expire = datetime.datetime.utcnow() + (expires_delta or datetime.timedelta(hours=ACCESS_TOKEN_EXPIRE_HOURS))
-    to_encode.update({"exp": expire})
+    to_encode.update({"exp": expire, "iat": time.time()})
     return jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
 
-oauth2_scheme = OAuth2PasswordBearer(tokenUrl="token")
+oauth2_scheme = OAuth2PasswordBearer(tokenUrl="admin/login")
+optional_oauth2_scheme = OAuth2PasswordBearer(tokenUrl="admin/login", auto_error=False)
+
+# Verified tokens are cached until they expire; revocations apply immediately
+token_verifier = TokenVerifier(
+    SECRET_KEY, ALGORITHM, max_entries=int(os.getenv("TOKEN_CACHE_MAX_ENTRIES", "1024")))
 
 # Authenticate Admin and Protect Routes
 async def get_current_admin(token: str = Depends(oauth2_scheme)):
-    try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        email: str = payload.get("sub")
-        if email is None:
-            raise HTTPException(status_code=401, detail="Invalid token")
-        return {"email": email}
-    except JWTError:
-        raise HTTPException(status_code=401, detail="Invalid token")
+    return {"email": token_verifier.verify(token)["sub"]}
 
-# Latest Works Endpoints
-@app.get("/latest-works")
-async def get_latest_works():
-    try:
-        works = await latest_works_collection.find().to_list(length=None)
-        # Convert ObjectId to string for each work
-        for work in works:
-            work["_id"] = str(work["_id"])
-        return works
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+# EventSource and plain download links cannot set headers, so these routes
+# also accept the token as ?access_token=
+async def get_current_admin_or_query_token(request: Request, token: str | None = Depends(optional_oauth2_scheme)):
+    token = token or request.query_params.get("access_token")
+    if not token:
+        raise HTTPException(status_code=401, detail="Not authenticated", headers={"WWW-Authenticate": "Bearer"})
+    return {"email": token_verifier.verify(token)["sub"]}
+
+# Revocations are stored (so restarted workers load them) and published to the other workers
+def apply_revocation(revocation: dict):
+    if revocation["kind"] == "token":
+        token_verifier.revoke_token(revocation["key"], revocation["until"])
+    else:
+        token_verifier.revoke_subject(revocation["key"], revocation["revoked_at"], revocation["until"])
+
+async def store_revocation(revocation: dict):
+    apply_revocation(revocation)
+    cache_channel.publish("auth", revocation)
+    await revoked_tokens_collection.replace_one(
+        {"_id": f"{revocation['kind']}:{revocation['key']}"},
+        {**revocation, "expires_at": datetime.datetime.utcfromtimestamp(revocation["until"])},
+        upsert=True,
+    )
+
+async def revoke_token(token: str):
+    claims = token_verifier.verify(token)
+    await store_revocation({"kind": "token", "key": token_digest(token), "revoked_at": time.time(), "until": claims["exp"]})
+
+async def revoke_admin_tokens(email: str):
+    # Covers every token of this admin that can still be valid
+    now = time.time()
+    await store_revocation({
+        "kind": "subject", "key": email, "revoked_at": now, "until": now + ACCESS_TOKEN_EXPIRE_HOURS * 3600,
+    })
+
+async def load_revocations():
+    revocations = await revoked_tokens_collection.find(
+        {"expires_at": {"$gt": datetime.datetime.utcnow()}}, {"_id": 0, "expires_at": 0}
+    ).to_list(length=None)
+    token_verifier.clear_revocations()
+    for revocation in revocations:
+        apply_revocation(revocation)
 
-@app.post("/latest-works")
-async def create_latest_work(work: LatestWork):
+# Email Outbox
+async def mark_inquiry_replied(message: dict):
+    if message.get("inquiry_id"):
+        result = await contacts_collection.update_one(
+            {"_id": ObjectId(message["inquiry_id"])},
+            {"$set": {"is_solved": True}}
+        )
+        if result.modified_count:
+            await dashboard_stats.record_inquiry_solved()
+            live_feed.publish("inquiry.solved", message["inquiry_id"])
+
+email_outbox = None
+dashboard_stats = None
+live_feed = None
+archiver = None
+resume_sweeper = None
+
+# Dashboard Stats
+@app.get("/admin/stats", dependencies=[Depends(get_current_admin)])
+async def get_admin_stats():
     try:
-        result = await latest_works_collection.insert_one(work.dict())
-        if result.inserted_id:
-            created_work = await latest_works_collection.find_one({"_id": result.inserted_id})
-            created_work["_id"] = str(created_work["_id"])
-            return created_work
-        raise HTTPException(status_code=500, detail="Failed to create work")
+        return await dashboard_stats.get()
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
-@app.put("/latest-works/{work_id}")
-async def update_latest_work(work_id: str, work: LatestWork):
+# Archive: per-month totals of archived records and the archiver's progress
+@app.get("/archive/rollups", dependencies=[Depends(get_current_admin)])
+async def get_archive_rollups(month_from: str | None = None, month_to: str | None = None):
     try:
-        result = await latest_works_collection.update_one(
-            {"_id": ObjectId(work_id)},
-            {"$set": work.dict()}
-        )
-        if result.modified_count == 0:
-            raise HTTPException(status_code=404, detail="Work not found")
-        updated_work = await latest_works_collection.find_one({"_id": ObjectId(work_id)})
-        updated_work["_id"] = str(updated_work["_id"])
-        return updated_work
-    except errors.InvalidId:
-        raise HTTPException(status_code=400, detail="Invalid work ID")
+        query = {}
+        if month_from:
+            query.setdefault("_id", {})["$gte"] = month_from
+        if month_to:
+            query.setdefault("_id", {})["$lte"] = month_to
+        rollups = await monthly_rollups_collection.find(query, {"updated_at": 0}).sort("_id", 1).to_list(length=None)
+        return [{"month": rollup.pop("_id"), **rollup} for rollup in rollups]
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
-@app.delete("/latest-works/{work_id}")
-async def delete_latest_work(work_id: str):
+@app.get("/archive/stats", dependencies=[Depends(get_current_admin)])
+async def get_archive_stats():
+    return archiver.stats()
+
+@app.post("/archive/run", dependencies=[Depends(get_current_admin)])
+async def run_archive():
     try:
-        result = await latest_works_collection.delete_one({"_id": ObjectId(work_id)})
-        if result.deleted_count == 0:
-            raise HTTPException(status_code=404, detail="Work not found")
-        return {"message": "Work deleted successfully"}
-    except errors.InvalidId:
-        raise HTTPException(status_code=400, detail="Invalid work ID")
+        return await archiver.run_once()
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
-# FAQ Management Endpoints
-@app.get("/faqs")
-async def get_faqs():
+@app.get("/outbox/stats", dependencies=[Depends(get_current_admin)])
+async def get_outbox_stats():
+    counts = {}
+    async for row in email_outbox_collection.aggregate([{"$group": {"_id": "$status", "count": {"$sum": 1}}}]):
+        counts[row["_id"]] = row["count"]
+    return counts
+
+# Cross-worker coherence: every change is applied here and published to the
+# other workers, which apply it through apply_cache_event
+def invalidate_public_cache(*keys: str, prefixes=()):
+    if keys:
+        public_cache.invalidate(*keys)
+    for prefix in prefixes:
+        public_cache.invalidate_prefix(prefix)
+    cache_channel.publish("cache", {"keys": list(keys), "prefixes": list(prefixes)})
+
+def apply_search_change(index: str, item_id: str, document: dict | None):
+    if document is None:
+        search_indexes[index].remove(item_id)
+    else:
+        search_indexes[index].add(item_id, document)
+
+def update_search_index(index: str, item_id: str, document: dict | None):
+    apply_search_change(index, item_id, document)
+    cache_channel.publish("search", {"index": index, "id": item_id, "document": document})
+
+inquiry_index_task = None
+
+async def build_inquiry_index():
     try:
-        faqs = await faqs_collection.find().to_list(length=None)
-        # Convert ObjectId to string for each FAQ
-        for faq in faqs:
-            faq["_id"] = str(faq["_id"])
-        return faqs
+        started = time.perf_counter()
+        await inquiry_search_index.build(contacts_collection)
+        logging.info(f"Inquiry search index built in {time.perf_counter() - started:.3f}s "
+                     f"({len(inquiry_search_index)} inquiries)")
     except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+        logging.error(f"Building the inquiry search index failed: {str(e)}")
+
+def start_inquiry_index_build():
+    # A newer build supersedes one still running
+    global inquiry_index_task
+    if inquiry_index_task is not None:
+        inquiry_index_task.cancel()
+    inquiry_index_task = asyncio.create_task(build_inquiry_index())
+
+async def rebuild_search_indexes():
+    await faq_search_index.build(faqs_collection)
+    start_inquiry_index_build()
+
+def apply_cache_event(topic: str, payload: dict):
+    if topic == "cache":
+        if payload["keys"]:
+            public_cache.invalidate(*payload["keys"])
+        for prefix in payload["prefixes"]:
+            public_cache.invalidate_prefix(prefix)
+    elif topic == "search":
+        apply_search_change(payload["index"], payload["id"], payload["document"])
+    elif topic == "feed":
+        live_feed.receive(payload)
+    elif topic == "archived":
+        apply_archived(payload["kind"], payload["ids"])
+    elif topic == "auth":
+        apply_revocation(payload)
+    elif topic == "resync":
+        # Events may have been missed: drop every cached list, rebuild search and reload revocations
+        public_cache.invalidate()
+        asyncio.create_task(rebuild_search_indexes())
+        asyncio.create_task(load_revocations())
+
+# Write hooks for the public resources: drop cached lists and bundles, keep search current
+def latest_works_changed(item_id: str, document: dict | None):
+    invalidate_public_cache("latest-works", prefixes=["bundle:"])
+
+def faqs_changed(item_id: str, document: dict | None):
+    invalidate_public_cache("faqs", prefixes=["bundle:"])
+    update_search_index("faqs", item_id, document)
+
+def job_listings_changed(item_id: str, document: dict | None):
+    invalidate_public_cache("job-listings", prefixes=["bundle:"])
+
+def gallery_events_changed(item_id: str, document: dict | None):
+    invalidate_public_cache("gallery-events")
 
-@app.post("/faqs")
-async def create_faq(faq: FAQ):
+def apply_archived(kind: str, ids: List[str]):
+    # Archived inquiries leave search; they are read through ?archived=true
+    if kind == "inquiries":
+        for item_id in ids:
+            inquiry_search_index.remove(item_id)
+
+def records_archived(kind: str, ids: List[str]):
+    apply_archived(kind, ids)
+    cache_channel.publish("archived", {"kind": kind, "ids": ids})
+
+# Serve a cached list, answering If-None-Match with 304 when the ETag matches.
+# Compressed variants are built once per cached version, not per request.
+async def cached_list_response(request: Request, key: str, loader):
+    payload = await public_cache.get_or_load(key, loader)
+    encoding = negotiate(request.headers.get("accept-encoding"))
+    if len(payload.body) < MIN_COMPRESS_BYTES:
+        encoding = None
+    etag = payload.etag_for(encoding)
+    headers = {"ETag": etag, "Cache-Control": "no-cache", "Vary": "Accept-Encoding"}
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers=headers)
+    if encoding is None:
+        return Response(payload.body, media_type="application/json", headers=headers)
+    headers["Content-Encoding"] = encoding
+    return Response(await payload.encoded(encoding), media_type="application/json", headers=headers)
+
+@app.get("/cache/stats", dependencies=[Depends(get_current_admin)])
+async def get_cache_stats():
+    return {**public_cache.stats(), "channel": cache_channel.stats()}
+
+@app.get("/limits/stats", dependencies=[Depends(get_current_admin)])
+async def get_limit_stats():
+    return {
+        "contact": contact_admission.stats(),
+        "applications": application_admission.stats(),
+        "dedup": submission_dedup.stats(),
+    }
+
+@app.get("/admin/hasher/stats", dependencies=[Depends(get_current_admin)])
+async def get_hasher_stats():
+    return password_hasher.stats()
+
+# Public Bundle: section -> (collection, filter, projection) with only the
+# fields the public pages render
+PUBLIC_BUNDLE_SECTIONS = {
+    "latest-works": ("latest_works", {}, {"title": 1, "link": 1, "thumbnail": 1, "category": 1}),
+    "faqs": ("faqs", {}, {"question": 1, "answer": 1, "category": 1}),
+    "job-listings": (
+        "job_listings",
+        {"isActive": True},
+        {"id": 1, "title": 1, "description": 1, "requirements": 1, "type": 1, "icon": 1, "isActive": 1},
+    ),
+}
+
+async def load_public_bundle(sections: List[str]):
+    # One query per section, all in flight at once
+    results = await asyncio.gather(*(
+        db[collection].find(query, projection).to_list(length=None)
+        for collection, query, projection in (PUBLIC_BUNDLE_SECTIONS[section] for section in sections)
+    ))
+    content = dict(zip(sections, results))
+    return {"version": hashlib.sha1(dumps(content)).hexdigest()[:16], "sections": content}
+
+@app.get("/public/bundle")
+async def get_public_bundle(request: Request, sections: str | None = None):
+    # Sorted so every ordering of the same sections shares one cache entry
+    requested = sorted({section.strip() for section in (sections or "").split(",") if section.strip()})
+    if not requested:
+        requested = sorted(PUBLIC_BUNDLE_SECTIONS)
+    unknown = [section for section in requested if section not in PUBLIC_BUNDLE_SECTIONS]
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown sections: {', '.join(unknown)}")
     try:
-        result = await faqs_collection.insert_one(faq.dict())
-        if result.inserted_id:
-            created_faq = await faqs_collection.find_one({"_id": result.inserted_id})
-            created_faq["_id"] = str(created_faq["_id"])
-            return created_faq
-        raise HTTPException(status_code=500, detail="Failed to create FAQ")
+        key = "bundle:" + ",".join(requested)
+        return await cached_list_response(request, key, lambda: load_public_bundle(requested))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
-@app.put("/faqs/{faq_id}")
-async def update_faq(faq_id: str, faq: FAQ):
+# Latest Works Endpoints
+@app.get("/latest-works")
+async def get_latest_works(request: Request):
     try:
-        result = await faqs_collection.update_one(
-            {"_id": ObjectId(faq_id)},
-            {"$set": faq.dict()}
-        )
-        if result.modified_count == 0:
-            raise HTTPException(status_code=404, detail="FAQ not found")
-        updated_faq = await faqs_collection.find_one({"_id": ObjectId(faq_id)})
-        updated_faq["_id"] = str(updated_faq["_id"])
-        return updated_faq
-    except errors.InvalidId:
-        raise HTTPException(status_code=400, detail="Invalid FAQ ID")
+        return await cached_list_response(request, "latest-works", latest_works_repository.list)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
-@app.delete("/faqs/{faq_id}")
-async def delete_faq(faq_id: str):
+app.include_router(create_crud_router(
+    "/latest-works", LatestWork, latest_works_repository, "Work", "work",
+    on_change=latest_works_changed,
+    route_class=InstrumentedRoute,
+), dependencies=[Depends(get_current_admin)])
+
+# FAQ Management Endpoints
+@app.get("/faqs")
+async def get_faqs(request: Request):
     try:
-        result = await faqs_collection.delete_one({"_id": ObjectId(faq_id)})
-        if result.deleted_count == 0:
-            raise HTTPException(status_code=404, detail="FAQ not found")
-        return {"message": "FAQ deleted successfully"}
-    except errors.InvalidId:
-        raise HTTPException(status_code=400, detail="Invalid FAQ ID")
+        return await cached_list_response(request, "faqs", faqs_repository.list)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+app.include_router(create_crud_router(
+    "/faqs", FAQ, faqs_repository, "FAQ", "FAQ",
+    on_change=faqs_changed,
+    route_class=InstrumentedRoute,
+), dependencies=[Depends(get_current_admin)])
+
 # Submit Contact Form
-@app.post("/submit")
+@app.post("/submit", dependencies=[Depends(contact_admission)])
 async def submit_form(contact: Contact):
+    contact_data = contact.dict()
+    contact_data["is_solved"] = False  # Default status
+    contact_data["created_at"] = datetime.datetime.utcnow()
+    # The unique index on the key makes this insert reject duplicates
+    contact_data[SUBMISSION_KEY] = submission_dedup.key("inquiry", contact.email, contact.subject, contact.message)
     try:
-        contact_data = contact.dict()
-        contact_data["is_solved"] = False  # Default status
-        contact_data["created_at"] = datetime.datetime.utcnow()
-        
         result = await contacts_collection.insert_one(contact_data)
-        
-        if not result.acknowledged:
-            raise HTTPException(status_code=500, detail="Failed to save contact form")
-            
-        return {"message": "Form submitted successfully!"}
+    except DuplicateKeyError:
+        submission_dedup.duplicate(contact_data[SUBMISSION_KEY])
     except Exception as e:
-        print(f"Error submitting form: {str(e)}")
+        logging.error(f"Error submitting form: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
+    submission_dedup.accepted(contact_data[SUBMISSION_KEY])
+
+    # The inquiry is stored: a failure here must not make the client resend it
+    try:
+        await dashboard_stats.record_inquiry(contact_data["created_at"])
+        live_feed.publish("inquiry.created", str(result.inserted_id), format_inquiry(contact_data))
+        update_search_index("inquiries", str(result.inserted_id), contact_data)
+    except Exception as e:
+        logging.error(f"Error publishing submitted inquiry: {str(e)}")
+    return {"message": "Form submitted successfully!"}
+
+def format_application(document: dict) -> dict:
+    response = to_response(document)
+    response.pop(SUBMISSION_KEY, None)
+    return response
+
+def format_inquiry(inq: dict, selected=INQUIRY_FIELDS) -> dict:
+    formatted_inq = {"id": str(inq["_id"])}
+    for field in selected:
+        if field == "created_at":
+            formatted_inq["created_at"] = inq.get("created_at", datetime.datetime.utcnow()).isoformat()
+        elif field == "is_solved":
+            formatted_inq["is_solved"] = inq.get("is_solved", False)
+        else:
+            formatted_inq[field] = inq.get(field)
+    return formatted_inq
+
+# The same shape as format_inquiry, built by Mongo for list pages
+def inquiry_projection(selected=INQUIRY_FIELDS) -> dict:
+    projection = {"_id": 0, "id": {"$toString": "$_id"}}
+    for field in selected:
+        if field == "created_at":
+            projection["created_at"] = {"$ifNull": ["$created_at", "$$NOW"]}
+        elif field == "is_solved":
+            projection["is_solved"] = {"$ifNull": ["$is_solved", False]}
+        else:
+            projection[field] = 1
+    return projection
 
 # Fetch Unsolved Inquiries
-@app.get("/inquiries")
-async def get_inquiries():
+@app.get("/inquiries", dependencies=[Depends(get_current_admin)])
+async def get_inquiries(
+    limit: int = DEFAULT_PAGE_SIZE,
+    cursor: str | None = None,
+    is_solved: bool = False,
+    created_from: str | None = None,
+    created_to: str | None = None,
+    fields: str | None = None,
+    archived: bool = False,
+):
     try:
-        # Sort by created_at in descending order (newest first)
-        cursor = contacts_collection.find({"is_solved": False}).sort("created_at", -1)
-        inquiries = await cursor.to_list(length=None)
-        
-        # Convert ObjectId to string and format dates
-        formatted_inquiries = []
-        for inq in inquiries:
-            formatted_inq = {
-                "id": str(inq["_id"]),
-                "name": inq["name"],
-                "email": inq["email"],
-                "subject": inq["subject"],
-                "message": inq["message"],
-                "is_solved": inq.get("is_solved", False),
-                "created_at": inq.get("created_at", datetime.datetime.utcnow()).isoformat()
-            }
-            formatted_inquiries.append(formatted_inq)
-            
-        return formatted_inquiries
+        # Archived inquiries are all solved; the archive is only read when asked for
+        query = {} if archived else {"is_solved": is_solved}
+        date_range = {}
+        if created_from:
+            date_range["$gte"] = parse_date(created_from, "created_from")
+        if created_to:
+            date_range["$lte"] = parse_date(created_to, "created_to")
+        if date_range:
+            query["created_at"] = date_range
+        requested = parse_fields(fields, INQUIRY_FIELDS)
+        projection = inquiry_projection(list(requested) if requested else INQUIRY_FIELDS)
+
+        # Newest first; ObjectIds are time-ordered so _id doubles as the keyset
+        inquiries, next_cursor = await fetch_page(
+            archived_contacts_collection if archived else contacts_collection,
+            query, limit, cursor, projection, cursor_field="id")
+        headers = {"X-Next-Cursor": next_cursor} if next_cursor else None
+
+        # Documents come back already shaped; datetimes are encoded by orjson
+        return MongoJSONResponse(content=inquiries, headers=headers)
+    except HTTPException:
+        raise
     except Exception as e:
-        print(f"Error fetching inquiries: {str(e)}")
+        logging.error(f"Error fetching inquiries: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
 
+# Live Feed of inquiry and application changes (Server-Sent Events)
+@app.get("/admin/feed", dependencies=[Depends(get_current_admin_or_query_token)])
+async def admin_feed(request: Request):
+    return StreamingResponse(
+        live_feed.stream(request),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+# Export Inquiries
+@app.get("/inquiries/export", dependencies=[Depends(get_current_admin)])
+async def export_inquiries(format: str = "csv", is_solved: bool | None = None):
+    query = {} if is_solved is None else {"is_solved": is_solved}
+    return stream_export(contacts_collection, query, INQUIRY_FIELDS, format, "inquiries", {SUBMISSION_KEY: 0})
+
 # Mark Inquiry as Solved
-@app.patch("/inquiries/{inquiry_id}/solve")
+@app.patch("/inquiries/{inquiry_id}/solve", dependencies=[Depends(get_current_admin)])
 async def solve_inquiry(inquiry_id: str):
     try:
         result = await contacts_collection.update_one(
@@ -315,16 +799,19 @@ async def solve_inquiry(inquiry_id: str):
 
         if result.matched_count == 0:
             raise HTTPException(status_code=404, detail="Inquiry not found")
+        if result.modified_count:
+            await dashboard_stats.record_inquiry_solved()
+            live_feed.publish("inquiry.solved", inquiry_id)
 
         return {"message": "Inquiry marked as solved"}
     except errors.InvalidId:
         raise HTTPException(status_code=400, detail="Invalid inquiry ID")
     except Exception as e:
-        print(f"Error marking inquiry as solved: {str(e)}")
+        logging.error(f"Error marking inquiry as solved: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
 
 # Send Reply to Inquiry
-@app.post("/inquiries/{inquiry_id}/reply")
+@app.post("/inquiries/{inquiry_id}/reply", status_code=202, dependencies=[Depends(get_current_admin)])
 async def reply_to_inquiry(inquiry_id: str, reply: ReplySchema):
     try:
         # ✅ Validate ObjectId
@@ -341,31 +828,21 @@ async def reply_to_inquiry(inquiry_id: str, reply: ReplySchema):
         if not recipient_email:
             raise HTTPException(status_code=400, detail="Inquiry has no associated email")
 
-        # Initialize FastMail
-        fm = FastMail(email_conf)
-
-        # Create message schema
-        message = MessageSchema(
+        # Queue the email; the outbox worker marks the inquiry solved once it is delivered
+        outbox_id = await email_outbox.enqueue(
+            recipient=recipient_email,
             subject="Reply to Your Inquiry - E&S Decorations",
-            recipients=[recipient_email],
-            body=reply.html_body,
-            subtype="html",
-            alternatives=[(reply.plain_text_body, "plain")]
+            html_body=reply.html_body,
+            plain_text_body=reply.plain_text_body,
+            inquiry_id=inquiry_id,
         )
 
-        # Send email
-        await fm.send_message(message)
-
-        # Update inquiry status
-        await contacts_collection.update_one(
-            {"_id": ObjectId(inquiry_id)},
-            {"$set": {"is_solved": True}}
-        )
-
-        return {"message": "Reply sent successfully"}
+        return {"message": "Reply queued for delivery", "outbox_id": outbox_id}
+    except HTTPException:
+        raise
     except Exception as e:
-        logging.error(f"Error sending reply: {str(e)}")
-        raise HTTPException(status_code=500, detail="Failed to send reply")
+        logging.error(f"Error queueing reply: {str(e)}")
+        raise HTTPException(status_code=500, detail="Failed to queue reply")
 
 # Admin Login with JWT
 @app.post("/admin/login", response_model=Token)
@@ -373,24 +850,50 @@ async def admin_login(form_data: OAuth2PasswordRequestForm = Depends()):
     try:
         admin = await admins_collection.find_one({"email": form_data.username})
         
-        if not admin or not verify_password(form_data.password, admin["password"]):
+        if not admin or not await password_hasher.verify(form_data.password, admin["password"]):
             raise HTTPException(status_code=401, detail="Invalid email or password")
 
         access_token = create_access_token(data={"sub": admin["email"]})
         return {"access_token": access_token, "token_type": "bearer"}
+    except HTTPException:
+        raise
+    except Exception as e:
+        logging.error(f"Error during login: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+# Logout: the token stops working on every worker right away
+@app.post("/admin/logout")
+async def admin_logout(token: str = Depends(oauth2_scheme)):
+    try:
+        await revoke_token(token)
+        return {"message": "Logged out"}
+    except HTTPException:
+        raise
     except Exception as e:
-        print(f"Error during login: {str(e)}")
+        logging.error(f"Error during logout: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.get("/admin/auth/stats", dependencies=[Depends(get_current_admin)])
+async def get_auth_stats():
+    return token_verifier.stats()
+
+# The very first admin can be added without a token; after that only admins can add admins
+async def require_admin_after_setup(token: str | None = Depends(optional_oauth2_scheme)):
+    if token:
+        return await get_current_admin(token)
+    if await admins_collection.count_documents({}, limit=1):
+        raise HTTPException(status_code=401, detail="Not authenticated", headers={"WWW-Authenticate": "Bearer"})
+    return None
+
 # Add New Admin
-@app.post("/admin/add")
+@app.post("/admin/add", dependencies=[Depends(require_admin_after_setup)])
 async def add_admin(admin: AdminCreate):
     try:
         existing_admin = await admins_collection.find_one({"email": admin.email})
         if existing_admin:
             raise HTTPException(status_code=400, detail="Admin with this email already exists")
 
-        hashed_password = hash_password(admin.password)
+        hashed_password = await password_hasher.hash(admin.password)
         new_admin = {
             "name": admin.name,
             "email": admin.email,
@@ -400,12 +903,14 @@ async def add_admin(admin: AdminCreate):
 
         result = await admins_collection.insert_one(new_admin)
         return {"message": "Admin added successfully", "admin_id": str(result.inserted_id)}
+    except HTTPException:
+        raise
     except Exception as e:
-        print(f"Error adding admin: {str(e)}")
+        logging.error(f"Error adding admin: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
 
 # Update Admin Details
-@app.patch("/admin/update/{admin_id}")
+@app.patch("/admin/update/{admin_id}", dependencies=[Depends(get_current_admin)])
 async def update_admin(admin_id: str, admin_update: AdminUpdate):
     try:
         update_data = {}
@@ -415,135 +920,414 @@ async def update_admin(admin_id: str, admin_update: AdminUpdate):
         if admin_update.email:
             update_data["email"] = admin_update.email
         if admin_update.new_password:
-            update_data["password"] = hash_password(admin_update.new_password)
+            update_data["password"] = await password_hasher.hash(admin_update.new_password)
 
         if not update_data:
             raise HTTPException(status_code=400, detail="No update data provided")
 
-        result = await admins_collection.update_one(
-            {"_id": ObjectId(admin_id)}, 
-            {"$set": update_data}
+        previous = await admins_collection.find_one_and_update(
+            {"_id": ObjectId(admin_id)},
+            {"$set": update_data},
+            projection={"email": 1},
+            return_document=ReturnDocument.BEFORE
         )
 
-        if result.matched_count == 0:
+        if previous is None:
             raise HTTPException(status_code=404, detail="Admin not found")
 
+        # A new password or email ends every session of this admin
+        if "password" in update_data or update_data.get("email", previous["email"]) != previous["email"]:
+            await revoke_admin_tokens(previous["email"])
+
         return {"message": "Admin updated successfully"}
     except errors.InvalidId:
         raise HTTPException(status_code=400, detail="Invalid admin ID")
+    except HTTPException:
+        raise
     except Exception as e:
-        print(f"Error updating admin: {str(e)}")
+        logging.error(f"Error updating admin: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
 
 # Job Listings Endpoints
 @app.get("/job-listings")
-async def get_job_listings():
+async def get_job_listings(request: Request):
     try:
-        listings = await job_listings_collection.find().to_list(length=None)
-        # Convert ObjectId to string for each listing
-        for listing in listings:
-            listing["_id"] = str(listing["_id"])
-        return listings
+        return await cached_list_response(request, "job-listings", job_listings_repository.list)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
-@app.post("/job-listings")
-async def create_job_listing(listing: JobListing):
-    try:
-        result = await job_listings_collection.insert_one(listing.dict())
-        if result.inserted_id:
-            created_listing = await job_listings_collection.find_one(
-                {"_id": result.inserted_id}
-            )
-            created_listing["_id"] = str(created_listing["_id"])
-            return created_listing
-        raise HTTPException(status_code=500, detail="Failed to create job listing")
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+app.include_router(create_crud_router(
+    "/job-listings", JobListing, job_listings_repository, "Job listing", "listing",
+    on_change=job_listings_changed,
+    route_class=InstrumentedRoute,
+), dependencies=[Depends(get_current_admin)])
 
-@app.put("/job-listings/{listing_id}")
-async def update_job_listing(listing_id: str, listing: JobListing):
+# Job Applications Endpoints
+@app.get("/job-applications", dependencies=[Depends(get_current_admin)])
+async def get_job_applications(
+    limit: int = DEFAULT_PAGE_SIZE,
+    cursor: str | None = None,
+    status: str | None = None,
+    jobId: str | None = None,
+    applied_from: str | None = None,
+    applied_to: str | None = None,
+    fields: str | None = None,
+    archived: bool = False,
+):
     try:
-        result = await job_listings_collection.update_one(
-            {"_id": ObjectId(listing_id)},
-            {"$set": listing.dict()}
-        )
-        if result.modified_count == 0:
-            raise HTTPException(status_code=404, detail="Job listing not found")
-        updated_listing = await job_listings_collection.find_one(
-            {"_id": ObjectId(listing_id)}
-        )
-        updated_listing["_id"] = str(updated_listing["_id"])
-        return updated_listing
-    except errors.InvalidId:
-        raise HTTPException(status_code=400, detail="Invalid listing ID")
+        query = {}
+        if status:
+            query["status"] = status
+        if jobId:
+            query["jobId"] = jobId
+        # appliedDate is stored as an ISO string, so string comparison orders it
+        date_range = {}
+        if applied_from:
+            date_range["$gte"] = parse_date(applied_from, "applied_from").isoformat()
+        if applied_to:
+            date_range["$lte"] = parse_date(applied_to, "applied_to").isoformat()
+        if date_range:
+            query["appliedDate"] = date_range
+        projection = parse_fields(fields, APPLICATION_FIELDS) or {SUBMISSION_KEY: 0}
+
+        collection = archived_job_applications_collection if archived else job_applications_collection
+        applications, next_cursor = await fetch_page(collection, query, limit, cursor, projection)
+        headers = {"X-Next-Cursor": next_cursor} if next_cursor else None
+        # ObjectIds are encoded by MongoJSONResponse, no per-document rewrite
+        return MongoJSONResponse(content=applications, headers=headers)
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
-@app.delete("/job-listings/{listing_id}")
-async def delete_job_listing(listing_id: str):
+@app.get("/job-applications/export", dependencies=[Depends(get_current_admin)])
+async def export_job_applications(format: str = "csv", status: str | None = None, jobId: str | None = None):
+    query = {}
+    if status:
+        query["status"] = status
+    if jobId:
+        query["jobId"] = jobId
+    return stream_export(job_applications_collection, query, APPLICATION_FIELDS, format, "job-applications",
+                         {SUBMISSION_KEY: 0})
+
+# The multipart body is parsed here rather than through UploadFile, which
+# would spool the whole upload to disk before the size limit could apply
+@app.post("/job-applications/resume", dependencies=[Depends(application_admission)])
+async def upload_resume(request: Request):
     try:
-        result = await job_listings_collection.delete_one(
-            {"_id": ObjectId(listing_id)}
-        )
-        if result.deleted_count == 0:
-            raise HTTPException(status_code=404, detail="Job listing not found")
-        return {"message": "Job listing deleted successfully"}
-    except errors.InvalidId:
-        raise HTTPException(status_code=400, detail="Invalid listing ID")
+        return {"resume_id": await store_resume(resume_bucket, request)}
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
-# Job Applications Endpoints
-@app.get("/job-applications")
-async def get_job_applications():
+@app.get("/job-applications/resume/stats", dependencies=[Depends(get_current_admin)])
+async def get_resume_stats():
+    return resume_sweeper.stats()
+
+@app.get("/job-applications/resume/{resume_id}", dependencies=[Depends(get_current_admin_or_query_token)])
+async def download_resume(resume_id: str, request: Request):
+    return await resume_response(resume_bucket, resume_id, request.headers.get("range"))
+
+@app.post("/job-applications", dependencies=[Depends(application_admission)])
+async def submit_job_application(application: JobApplication):
+    if application.resume is not None and not ObjectId.is_valid(application.resume):
+        raise HTTPException(status_code=400, detail="Invalid resume ID")
+    # Add current date to application; every new application starts pending,
+    # whatever status the (unauthenticated) client sent
+    application_dict = application.dict()
+    application_dict["appliedDate"] = datetime.datetime.now().isoformat()
+    application_dict["status"] = "pending"
+    submission_key = submission_dedup.key("application", application.email, application.jobId)
+    application_dict[SUBMISSION_KEY] = submission_key
     try:
-        applications = await job_applications_collection.find().to_list(length=None)
-        # Convert ObjectId to string for each application
-        for app in applications:
-            app["_id"] = str(app["_id"])
-        return applications
+        # Insert application into database; the response is built from the inserted document
+        created_application = format_application(await job_applications_repository.create(application_dict))
+    except DuplicateKeyError:
+        submission_dedup.duplicate(submission_key)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
+    submission_dedup.accepted(submission_key)
 
-@app.post("/job-applications")
-async def submit_job_application(application: JobApplication):
+    # The application is stored: a failure here must not make the client resend it
     try:
-        # Add current date to application
-        application_dict = application.dict()
-        application_dict["appliedDate"] = datetime.datetime.now().isoformat()
-        
-        # Insert application into database
-        result = await job_applications_collection.insert_one(application_dict)
-        
-        if result.inserted_id:
-            # Return the created application with string ID
-            created_application = await job_applications_collection.find_one(
-                {"_id": result.inserted_id}
-            )
-            created_application["_id"] = str(created_application["_id"])
-            return created_application
-        
-        raise HTTPException(status_code=500, detail="Failed to submit application")
+        await dashboard_stats.record_application(created_application["appliedDate"], created_application["status"])
+        live_feed.publish("application.created", created_application["_id"], created_application)
     except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+        logging.error(f"Error publishing submitted application: {str(e)}")
+    return created_application
 
-@app.patch("/job-applications/{application_id}/status")
+@app.patch("/job-applications/{application_id}/status", dependencies=[Depends(get_current_admin)])
 async def update_application_status(application_id: str, status: str):
     try:
         if status not in ["approved", "rejected"]:
             raise HTTPException(status_code=400, detail="Invalid status")
             
-        result = await job_applications_collection.update_one(
+        previous = await job_applications_collection.find_one_and_update(
             {"_id": ObjectId(application_id)},
-            {"$set": {"status": status}}
+            {"$set": {"status": status}},
+            projection={"status": 1},
+            return_document=ReturnDocument.BEFORE
         )
         
-        if result.modified_count == 0:
+        if previous is None:
             raise HTTPException(status_code=404, detail="Application not found")
+        await dashboard_stats.record_status_change(previous.get("status", "pending"), status)
+        live_feed.publish("application.status", application_id, {"status": status})
             
         return {"message": f"Application {status} successfully"}
     except errors.InvalidId:
         raise HTTPException(status_code=400, detail="Invalid application ID")
+    except HTTPException:
+        raise
     except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=str(e))
+
+# Bulk Operations
+# Bulk endpoints handle at most this many items per request
+BULK_MAX_ITEMS = int(os.getenv("BULK_MAX_ITEMS", "500"))
+
+def check_bulk_size(items: list):
+    if len(items) > BULK_MAX_ITEMS:
+        raise HTTPException(status_code=413, detail=f"At most {BULK_MAX_ITEMS} items per request")
+
+def parse_object_ids(ids: List[str]) -> List[ObjectId]:
+    check_bulk_size(ids)
+    invalid = [item_id for item_id in ids if not ObjectId.is_valid(item_id)]
+    if invalid:
+        raise HTTPException(status_code=400, detail=f"Invalid IDs: {', '.join(invalid)}")
+    return [ObjectId(item_id) for item_id in ids]
+
+@app.post("/job-applications/bulk-status", dependencies=[Depends(get_current_admin)])
+async def bulk_update_application_status(update: BulkStatusUpdate):
+    try:
+        if update.status not in ["approved", "rejected"]:
+            raise HTTPException(status_code=400, detail="Invalid status")
+        object_ids = parse_object_ids(update.ids)
+
+        current = {
+            doc["_id"]: doc.get("status", "pending")
+            async for doc in job_applications_collection.find({"_id": {"$in": object_ids}}, {"status": 1})
+        }
+        # One update per prior status (at most two); matching on that status
+        # makes each modified_count exact even if a document changed meanwhile
+        groups = {}
+        for object_id, status in current.items():
+            if status != update.status:
+                groups.setdefault(status, []).append(object_id)
+        changes = []
+        raced = []
+        for status, ids in groups.items():
+            result = await job_applications_collection.update_many(
+                {"_id": {"$in": ids}, "status": status}, {"$set": {"status": update.status}}
+            )
+            changes.extend([(status, update.status)] * result.modified_count)
+            if result.modified_count < len(ids):
+                raced.extend(ids)
+        if changes:
+            await dashboard_stats.record_status_changes(changes)
+        # Only when a document changed under us: the ones not left at the new
+        # status were moved elsewhere by someone else, so they are unchanged here
+        if raced:
+            async for doc in job_applications_collection.find(
+                {"_id": {"$in": raced}, "status": {"$ne": update.status}}, {"_id": 1}
+            ):
+                current[doc["_id"]] = update.status
+
+        results = []
+        for item_id, object_id in zip(update.ids, object_ids):
+            if object_id not in current:
+                results.append({"id": item_id, "result": "not_found"})
+            elif current[object_id] == update.status:
+                results.append({"id": item_id, "result": "unchanged"})
+            else:
+                results.append({"id": item_id, "result": "updated"})
+                live_feed.publish("application.status", item_id, {"status": update.status})
+        return {"results": results}
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.post("/inquiries/bulk-solve", dependencies=[Depends(get_current_admin)])
+async def bulk_solve_inquiries(bulk: BulkIds):
+    try:
+        object_ids = parse_object_ids(bulk.ids)
+
+        current = {
+            doc["_id"]: doc.get("is_solved", False)
+            async for doc in contacts_collection.find({"_id": {"$in": object_ids}}, {"is_solved": 1})
+        }
+        unsolved = [object_id for object_id, is_solved in current.items() if not is_solved]
+        if unsolved:
+            result = await contacts_collection.update_many(
+                {"_id": {"$in": unsolved}, "is_solved": False},
+                {"$set": {"is_solved": True}}
+            )
+            await dashboard_stats.record_inquiry_solved(result.modified_count)
+
+        results = []
+        for item_id, object_id in zip(bulk.ids, object_ids):
+            if object_id not in current:
+                results.append({"id": item_id, "result": "not_found"})
+            elif current[object_id]:
+                results.append({"id": item_id, "result": "unchanged"})
+            else:
+                results.append({"id": item_id, "result": "solved"})
+                live_feed.publish("inquiry.solved", item_id)
+        return {"results": results}
+    except HTTPException:
+        raise
+    except Exception as e:
+        logging.error(f"Error bulk solving inquiries: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+async def bulk_import(collection, items: List[BaseModel], on_change):
+    if not items:
+        return {"results": []}
+    documents = [item.dict() for item in items]
+    result = await collection.insert_many(documents, ordered=False)
+    for document in documents:
+        on_change(str(document["_id"]), document)
+    return {"results": [{"id": str(inserted_id), "result": "created"} for inserted_id in result.inserted_ids]}
+
+@app.post("/faqs/bulk", dependencies=[Depends(get_current_admin)])
+async def bulk_create_faqs(faqs: List[FAQ]):
+    check_bulk_size(faqs)
+    try:
+        return await bulk_import(faqs_collection, faqs, faqs_changed)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.post("/latest-works/bulk", dependencies=[Depends(get_current_admin)])
+async def bulk_create_latest_works(works: List[LatestWork]):
+    check_bulk_size(works)
+    try:
+        return await bulk_import(latest_works_collection, works, latest_works_changed)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.post("/job-listings/bulk", dependencies=[Depends(get_current_admin)])
+async def bulk_create_job_listings(listings: List[JobListing]):
+    check_bulk_size(listings)
+    try:
+        return await bulk_import(job_listings_collection, listings, job_listings_changed)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+# Search
+@app.get("/search")
+async def search(q: str, scope: str = "all", limit: int = 20, offset: int = 0,
+                 token: str | None = Depends(optional_oauth2_scheme)):
+    if scope not in ("all", "faqs", "inquiries"):
+        raise HTTPException(status_code=400, detail="Scope must be all, faqs or inquiries")
+    # FAQs are public; inquiries are only searchable by admins
+    if scope != "faqs":
+        if not token:
+            raise HTTPException(status_code=401, detail="Not authenticated", headers={"WWW-Authenticate": "Bearer"})
+        await get_current_admin(token)
+        if not inquiry_search_index.ready:
+            raise HTTPException(status_code=503, detail="Inquiry search index is still building",
+                                headers={"Retry-After": "5"})
+    limit = max(1, min(limit, 100))
+    offset = max(0, offset)
+    try:
+        hits = []
+        if scope in ("all", "faqs"):
+            hits += [("faq", doc_id, score) for doc_id, score in faq_search_index.search(q)]
+        if scope in ("all", "inquiries"):
+            hits += [("inquiry", doc_id, score) for doc_id, score in inquiry_search_index.search(q)]
+        hits.sort(key=lambda hit: hit[2], reverse=True)
+        page = hits[offset:offset + limit]
+
+        # Load only the documents on this page, one query per collection
+        faq_ids = [ObjectId(doc_id) for kind, doc_id, _ in page if kind == "faq"]
+        inquiry_ids = [ObjectId(doc_id) for kind, doc_id, _ in page if kind == "inquiry"]
+        documents = {}
+        if faq_ids:
+            async for faq in faqs_collection.find({"_id": {"$in": faq_ids}}):
+                documents[("faq", str(faq["_id"]))] = to_response(faq)
+        if inquiry_ids:
+            async for inq in contacts_collection.find({"_id": {"$in": inquiry_ids}}):
+                documents[("inquiry", str(inq["_id"]))] = format_inquiry(inq)
+
+        results = [
+            {"type": kind, "score": round(score, 4), "document": documents[(kind, doc_id)]}
+            for kind, doc_id, score in page
+            if (kind, doc_id) in documents
+        ]
+        return {"total": len(hits), "offset": offset, "limit": limit, "results": results}
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+# Gallery Events
+async def load_gallery_events():
+    events = await gallery_events_repository.list()
+    # Attach the variant manifests of uploaded images in one query per cached version
+    image_ids = {
+        image_id
+        for event in events
+        for image_id in (event.get("thumbnail"), *event.get("images", []))
+        if image_id
+    }
+    assets = {}
+    if image_ids:
+        async for image in gallery_images_collection.find({"_id": {"$in": list(image_ids)}}, {"created_at": 0}):
+            assets[image["_id"]] = image
+    for event in events:
+        event["assets"] = {
+            image_id: assets[image_id]
+            for image_id in (event.get("thumbnail"), *event.get("images", []))
+            if image_id in assets
+        }
+    return events
+
+@app.get("/gallery-events")
+async def get_gallery_events(request: Request):
+    try:
+        return await cached_list_response(request, "gallery-events", load_gallery_events)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+app.include_router(create_crud_router(
+    "/gallery-events", GalleryEvent, gallery_events_repository, "Gallery event", "event",
+    on_change=gallery_events_changed,
+    route_class=InstrumentedRoute,
+), dependencies=[Depends(get_current_admin)])
+
+@app.post("/gallery/images", dependencies=[Depends(get_current_admin)])
+async def upload_gallery_image(file: UploadFile = File(...)):
+    data = await read_image_upload(file)
+    # Images are addressed by the hash of the original, so a re-upload is free
+    image_id = hashlib.sha256(data).hexdigest()
+    try:
+        existing = await gallery_images_collection.find_one({"_id": image_id})
+        if existing and image_pipeline.has_variants(existing):
+            return existing
+        manifest = await image_pipeline.process(data)
+        image = {"_id": image_id, **manifest, "created_at": datetime.datetime.utcnow()}
+        await gallery_images_collection.replace_one({"_id": image_id}, image, upsert=True)
+        # Events referencing this image may now resolve its variants
+        invalidate_public_cache("gallery-events")
+        return image
+    except HTTPException:
+        raise
+    except Exception as e:
+        logging.error(f"Error processing gallery image: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.get("/gallery/images/{key}")
+async def get_gallery_image(key: str):
+    path = image_pipeline.path_for(key)
+    if path is None:
+        raise HTTPException(status_code=404, detail="Image not found")
+    # Keys are content hashes, so a given URL never changes content
+    return FileResponse(
+        path,
+        media_type=MEDIA_TYPES[key.rsplit(".", 1)[1]],
+        headers={"Cache-Control": "public, max-age=31536000, immutable"},
+    )
+
+@app.get("/gallery/stats", dependencies=[Depends(get_current_admin)])
+async def get_gallery_stats():
+    return image_pipeline.stats()
@@ -0,0 +1,145 @@
+import asyncio
+import datetime
+import logging
+from pymongo.errors import BulkWriteError
+
+logger = logging.getLogger(__name__)
+
+DUPLICATE_KEY = 11000
+CLOSED_STATUSES = ("approved", "rejected")
+
+
+def _month(value) -> str:
+    if isinstance(value, datetime.datetime):
+        return value.strftime("%Y-%m")
+    return str(value)[:7]
+
+
+class Archiver:
+    """Moves resolved records out of the hot collections in batches.
+
+    Solved inquiries and approved/rejected applications older than
+    ``min_age_days`` are copied into their archive collection and then
+    deleted from the hot one. Every moved record is counted in a per-month
+    rollup document (``_id`` "YYYY-MM"). Copies use the original ``_id``, so
+    a batch interrupted between copy and delete is simply redone; rollups are
+    incremented by what each delete actually removed, so several workers
+    archiving at once do not double count. ``on_archived(kind, ids)`` runs
+    after each batch.
+    """
+
+    def __init__(self, contacts, applications, archived_contacts, archived_applications, rollups,
+                 min_age_days: float = 90, batch_size: int = 500, interval: float = 3600.0, on_archived=None):
+        self.contacts = contacts
+        self.applications = applications
+        self.archived_contacts = archived_contacts
+        self.archived_applications = archived_applications
+        self.rollups = rollups
+        self.min_age_days = min_age_days
+        self.batch_size = batch_size
+        self.interval = interval
+        self.on_archived = on_archived
+        self.archived = {"inquiries": 0, "applications": 0}
+        self.last_run_at: datetime.datetime | None = None
+        self._task: asyncio.Task | None = None
+
+    def _cutoff(self) -> datetime.datetime:
+        return datetime.datetime.utcnow() - datetime.timedelta(days=self.min_age_days)
+
+    async def _copy(self, archive, documents: list[dict]):
+        now = datetime.datetime.utcnow()
+        for document in documents:
+            document["archived_at"] = now
+        try:
+            await archive.insert_many(documents, ordered=False)
+        except BulkWriteError as e:
+            # Already copied by an earlier, interrupted run
+            if any(error["code"] != DUPLICATE_KEY for error in e.details["writeErrors"]):
+                raise
+
+    async def _move(self, kind: str, source, archive, query: dict, group_key) -> int:
+        documents = await source.find(query).sort("_id", 1).limit(self.batch_size).to_list(length=self.batch_size)
+        if not documents:
+            return 0
+        await self._copy(archive, documents)
+
+        groups = {}
+        for document in documents:
+            groups.setdefault(group_key(document), []).append(document["_id"])
+        moved = 0
+        for (month, counter), ids in groups.items():
+            result = await source.delete_many({"_id": {"$in": ids}})
+            if result.deleted_count:
+                moved += result.deleted_count
+                await self.rollups.update_one(
+                    {"_id": month},
+                    {"$inc": {f"{kind}.{counter}": result.deleted_count}, "$set": {"updated_at": datetime.datetime.utcnow()}},
+                    upsert=True,
+                )
+        self.archived[kind] += moved
+        if self.on_archived is not None:
+            self.on_archived(kind, [str(document["_id"]) for document in documents])
+        return len(documents)
+
+    async def archive_inquiries(self) -> int:
+        return await self._move(
+            "inquiries",
+            self.contacts,
+            self.archived_contacts,
+            {"is_solved": True, "created_at": {"$lt": self._cutoff()}},
+            lambda document: (_month(document["created_at"]), "solved"),
+        )
+
+    async def archive_applications(self) -> int:
+        return await self._move(
+            "applications",
+            self.applications,
+            self.archived_applications,
+            # appliedDate is an ISO string, so the cutoff is compared as one
+            {"status": {"$in": list(CLOSED_STATUSES)}, "appliedDate": {"$lt": self._cutoff().isoformat()}},
+            lambda document: (_month(document["appliedDate"]), document["status"]),
+        )
+
+    async def run_once(self) -> dict:
+        """Archive everything currently eligible, one batch at a time."""
+        moved = {"inquiries": 0, "applications": 0}
+        for kind, step in (("inquiries", self.archive_inquiries), ("applications", self.archive_applications)):
+            while True:
+                count = await step()
+                moved[kind] += count
+                if count < self.batch_size:
+                    break
+                # Give request handlers a turn between batches
+                await asyncio.sleep(0)
+        self.last_run_at = datetime.datetime.utcnow()
+        return moved
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self):
+        while True:
+            try:
+                await self.run_once()
+            except Exception as e:
+                logger.error(f"Archiving failed: {str(e)}")
+            await asyncio.sleep(self.interval)
+
+    def stats(self) -> dict:
+        return {
+            "min_age_days": self.min_age_days,
+            "batch_size": self.batch_size,
+            "interval": self.interval,
+            "archived": dict(self.archived),
+            "last_run_at": self.last_run_at.isoformat() if self.last_run_at else None,
+        }
@@ -0,0 +1,99 @@
+import hashlib
+import time
+from collections import OrderedDict
+from fastapi import HTTPException
+from jose import jwt, JWTError
+
+
+def token_digest(token: str) -> str:
+    return hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+
+class TokenVerifier:
+    """Verifies admin JWTs once and remembers the result until they expire.
+
+    Verified claims are cached by token digest in an LRU of at most
+    ``max_entries`` tokens (0 disables the cache), so repeat requests skip
+    the signature check. Revocations are checked on every call, cached or
+    not: single tokens (logout) by digest, and whole subjects (password or
+    email change) for every token issued before the revocation. Revocations
+    are dropped once no token they cover can still be valid.
+    """
+
+    def __init__(self, secret_key: str, algorithm: str, max_entries: int = 1024):
+        self.secret_key = secret_key
+        self.algorithm = algorithm
+        self.max_entries = max_entries
+        self._verified: OrderedDict[str, dict] = OrderedDict()
+        self._revoked_tokens: dict[str, float] = {}
+        self._revoked_subjects: dict[str, tuple[float, float]] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def _decode(self, digest: str, token: str) -> dict:
+        claims = self._verified.get(digest)
+        if claims is not None and claims["exp"] > time.time():
+            self.hits += 1
+            self._verified.move_to_end(digest)
+            return claims
+        self._verified.pop(digest, None)
+        self.misses += 1
+        try:
+            claims = jwt.decode(token, self.secret_key, algorithms=[self.algorithm])
+        except JWTError:
+            raise HTTPException(status_code=401, detail="Invalid token")
+        if claims.get("sub") is None or claims.get("exp") is None:
+            raise HTTPException(status_code=401, detail="Invalid token")
+        if self.max_entries > 0:
+            self._verified[digest] = claims
+            while len(self._verified) > self.max_entries:
+                self._verified.popitem(last=False)
+        return claims
+
+    def is_revoked(self, digest: str, claims: dict) -> bool:
+        if digest in self._revoked_tokens:
+            return True
+        subject = self._revoked_subjects.get(claims["sub"])
+        return subject is not None and claims.get("iat", 0) < subject[0]
+
+    def verify(self, token: str) -> dict:
+        """Return the token's claims, or raise 401 if it is invalid, expired or revoked."""
+        digest = token_digest(token)
+        claims = self._decode(digest, token)
+        if self.is_revoked(digest, claims):
+            raise HTTPException(status_code=401, detail="Token has been revoked")
+        return claims
+
+    def revoke_token(self, digest: str, until: float):
+        """Reject the token with ``digest`` until its expiry ``until``."""
+        self._prune()
+        self._revoked_tokens[digest] = until
+        self._verified.pop(digest, None)
+
+    def revoke_subject(self, subject: str, revoked_at: float, until: float):
+        """Reject every token of ``subject`` issued before ``revoked_at``."""
+        self._prune()
+        previous = self._revoked_subjects.get(subject)
+        if previous is None or previous[0] < revoked_at:
+            self._revoked_subjects[subject] = (revoked_at, until)
+
+    def clear_revocations(self):
+        self._revoked_tokens.clear()
+        self._revoked_subjects.clear()
+
+    def _prune(self):
+        now = time.time()
+        self._revoked_tokens = {digest: until for digest, until in self._revoked_tokens.items() if until > now}
+        self._revoked_subjects = {
+            subject: entry for subject, entry in self._revoked_subjects.items() if entry[1] > now
+        }
+
+    def stats(self) -> dict:
+        return {
+            "entries": len(self._verified),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "revoked_tokens": len(self._revoked_tokens),
+            "revoked_subjects": len(self._revoked_subjects),
+        }
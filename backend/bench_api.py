@@ -0,0 +1,428 @@
+"""Load-test every API route in-process and gate on a JSON baseline.
+
+The app runs inside this process (httpx ASGITransport) against one of:
+
+    --mongo url      the server in MONGODB_URL (a throwaway DB_NAME is used)
+    --mongo mongod   a temporary mongod started from --mongod-bin
+    --mongo mock     an in-memory mongomock-motor client (pip install mongomock-motor)
+
+Examples:
+
+    python bench_api.py --size 1000 --concurrency 20 --requests 500
+    python bench_api.py --size 100000 --save-baseline bench_baseline.json
+    python bench_api.py --size 100000 --baseline bench_baseline.json --tolerance 0.2
+
+With --baseline the run exits non-zero when any route's p95 grows, or its
+throughput drops, by more than --tolerance compared with the baseline.
+
+Every route gets a scenario except those listed (with the reason) at the
+start of a run: the /admin/feed event stream never completes, and the
+resume and gallery image routes need GridFS and Pillow respectively.
+"""
+import argparse
+import asyncio
+import datetime
+import inspect
+import io
+import itertools
+import json
+import os
+import random
+import shutil
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+SEED_BATCH = 10000
+PUBLIC_SIZE = 100
+
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_mongod(binary: str):
+    dbpath = tempfile.mkdtemp(prefix="bench-mongod-")
+    port = free_port()
+    process = subprocess.Popen(
+        [binary, "--dbpath", dbpath, "--port", str(port), "--bind_ip", "127.0.0.1", "--quiet"],
+        stdout=subprocess.DEVNULL,
+    )
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        try:
+            socket.create_connection(("127.0.0.1", port), timeout=0.5).close()
+            break
+        except OSError:
+            time.sleep(0.2)
+    else:
+        process.kill()
+        raise RuntimeError("mongod did not start")
+    return process, dbpath, f"mongodb://127.0.0.1:{port}"
+
+
+def configure_environment(args):
+    """Set env before the app is imported: throwaway DB, limits out of the way."""
+    os.environ["DB_NAME"] = args.db_name
+    os.environ.setdefault("PUBLIC_WRITE_BURST_PER_IP", "1e9")
+    os.environ.setdefault("PUBLIC_WRITE_RATE_PER_IP", "1e9")
+    os.environ.setdefault("PUBLIC_WRITE_BURST_GLOBAL", "1e9")
+    os.environ.setdefault("PUBLIC_WRITE_RATE_GLOBAL", "1e9")
+    os.environ.setdefault("PUBLIC_WRITE_MAX_IN_FLIGHT", "100000")
+    os.environ.setdefault("STATS_RECONCILE_INTERVAL", "1e9")
+    os.environ.setdefault("BCRYPT_MAX_QUEUE", "100000")
+    os.environ.setdefault("IMAGE_MAX_QUEUE", "100000")
+    os.environ.setdefault("IMAGE_CACHE_DIR", tempfile.mkdtemp(prefix="bench-images-"))
+    if args.mongo == "mock":
+        # mongomock has no capped collections or tailable cursors
+        os.environ["CACHE_CHANNEL"] = "local"
+
+
+def use_mock_mongo(api):
+    from mongomock_motor import AsyncMongoMockClient
+
+    mock_client = AsyncMongoMockClient()
+
+    async def no_warm_pool(*args, **kwargs):
+        pass
+
+    api.create_client = lambda: mock_client
+    api.warm_pool = no_warm_pool
+    # GridFS needs a real server; resume routes are not exercised in mock mode
+    api.AsyncIOMotorGridFSBucket = lambda database, bucket_name: None
+
+
+async def seed(api, size: int, reconcile_stats: bool = True):
+    now = datetime.datetime.utcnow()
+    for collection in (api.contacts_collection, api.job_applications_collection, api.faqs_collection,
+                       api.latest_works_collection, api.job_listings_collection, api.db["gallery_events"],
+                       api.admins_collection):
+        await collection.delete_many({})
+
+    public = min(size, PUBLIC_SIZE)
+    await api.faqs_collection.insert_many([
+        {"question": f"Question {i} about wedding decoration", "answer": f"Answer {i}", "category": f"cat{i % 5}"}
+        for i in range(public)
+    ])
+    await api.latest_works_collection.insert_many([
+        {"title": f"Work {i}", "link": f"https://example.com/{i}", "thumbnail": "thumb.jpg", "category": "events"}
+        for i in range(public)
+    ])
+    await api.job_listings_collection.insert_many([
+        {"id": str(i), "title": f"Job {i}", "description": "Decorator", "requirements": ["Skill"],
+         "type": "Full-time", "icon": "Users", "isActive": True}
+        for i in range(public)
+    ])
+    await api.db["gallery_events"].insert_many([gallery_event(i) for i in range(public)])
+
+    for start in range(0, size, SEED_BATCH):
+        count = min(SEED_BATCH, size - start)
+        await api.contacts_collection.insert_many([
+            {"name": f"Name {i}", "email": f"user{i}@example.com", "subject": f"Subject {i}",
+             "message": "Hello, I would like a quote", "is_solved": i % 3 == 0,
+             "created_at": now - datetime.timedelta(minutes=i)}
+            for i in range(start, start + count)
+        ])
+        await api.job_applications_collection.insert_many([
+            {"jobId": str(i % public), "name": f"Applicant {i}", "email": f"applicant{i}@example.com",
+             "phone": "0000000000", "experience": "3", "status": ("pending", "approved", "rejected")[i % 3],
+             "appliedDate": (now - datetime.timedelta(minutes=i)).isoformat()}
+            for i in range(start, start + count)
+        ])
+
+    await api.faq_search_index.build(api.faqs_collection)
+    await api.inquiry_search_index.build(api.contacts_collection)
+    if reconcile_stats:
+        # mongomock lacks some aggregation operators, so mock runs skip this
+        await api.dashboard_stats.reconcile()
+
+
+def faq(i):
+    return {"question": f"Bench question {i}", "answer": "Answer", "category": "bench"}
+
+
+def latest_work(i):
+    return {"title": f"Bench work {i}", "link": f"https://example.com/bench/{i}", "thumbnail": "thumb.jpg",
+            "category": "bench"}
+
+
+def job_listing(i):
+    return {"id": f"bench-{i}", "title": f"Bench job {i}", "description": "Decorator", "requirements": ["Skill"],
+            "type": "Full-time", "icon": "Users", "isActive": True}
+
+
+def gallery_event(i):
+    return {"title": f"Event {i}", "description": "Wedding", "date": "2024-01-01", "location": "Hall",
+            "attendees": 100, "category": "wedding", "thumbnail": "thumb.jpg", "images": [], "details": "",
+            "highlights": []}
+
+
+def png(seed: int) -> bytes:
+    from PIL import Image
+
+    buffer = io.BytesIO()
+    Image.new("RGB", (64, 64), (seed % 256, seed // 256 % 256, seed // 65536 % 256)).save(buffer, "PNG")
+    return buffer.getvalue()
+
+
+async def scenarios(api):
+    """Return ``(routes, skipped)``: a request factory per route, and why any route is left out.
+
+    A factory returns ``(method, path, json_body)`` plus an optional dict of
+    extra ``client.request`` arguments; it may be async, for setup that must
+    not land in the measured latency (e.g. creating the document a DELETE
+    removes).
+    """
+    inquiry_ids = [str(doc["_id"]) async for doc in api.contacts_collection.find({}, {"_id": 1}).limit(1000)]
+    application_ids = [str(doc["_id"]) async for doc in api.job_applications_collection.find({}, {"_id": 1}).limit(1000)]
+    # Unique content per request, otherwise duplicate detection answers with 409s
+    serial = itertools.count()
+    contact = lambda: {"name": "Bench", "email": "bench@example.com", "subject": "Bench",
+                       "message": f"Load test {next(serial)}"}
+    application = lambda: {"jobId": str(next(serial)), "name": "Bench", "email": "bench@example.com", "phone": "0",
+                           "experience": "1", "appliedDate": "2024-01-01"}
+
+    login_email, login_password = "bench-login@example.com", "bench-password"
+    admin = await api.admins_collection.insert_one({
+        "name": "Bench", "email": login_email, "password": await api.password_hasher.hash(login_password),
+        "created_at": datetime.datetime.utcnow(),
+    })
+
+    routes = {
+        "GET /healthz": lambda: ("GET", "/healthz", None),
+        "GET /healthz/ready": lambda: ("GET", "/healthz/ready", None),
+        "GET /metrics": lambda: ("GET", "/metrics", None),
+        "GET /public/bundle": lambda: ("GET", "/public/bundle", None),
+        "GET /faqs": lambda: ("GET", "/faqs", None),
+        "GET /latest-works": lambda: ("GET", "/latest-works", None),
+        "GET /job-listings": lambda: ("GET", "/job-listings", None),
+        "GET /gallery-events": lambda: ("GET", "/gallery-events", None),
+        "GET /inquiries": lambda: ("GET", "/inquiries", None),
+        "GET /inquiries/export": lambda: ("GET", "/inquiries/export?format=csv", None),
+        "GET /job-applications": lambda: ("GET", "/job-applications", None),
+        "GET /job-applications?status": lambda: ("GET", "/job-applications?status=pending", None),
+        "GET /job-applications/export": lambda: ("GET", "/job-applications/export?format=csv", None),
+        "GET /search": lambda: ("GET", "/search?q=wed", None),
+        "GET /admin/stats": lambda: ("GET", "/admin/stats", None),
+        "GET /archive/rollups": lambda: ("GET", "/archive/rollups", None),
+        "GET /archive/stats": lambda: ("GET", "/archive/stats", None),
+        "POST /archive/run": lambda: ("POST", "/archive/run", None),
+        "GET /outbox/stats": lambda: ("GET", "/outbox/stats", None),
+        "GET /cache/stats": lambda: ("GET", "/cache/stats", None),
+        "GET /limits/stats": lambda: ("GET", "/limits/stats", None),
+        "GET /admin/hasher/stats": lambda: ("GET", "/admin/hasher/stats", None),
+        "GET /admin/auth/stats": lambda: ("GET", "/admin/auth/stats", None),
+        "GET /gallery/stats": lambda: ("GET", "/gallery/stats", None),
+        "GET /job-applications/resume/stats": lambda: ("GET", "/job-applications/resume/stats", None),
+        "POST /submit": lambda: ("POST", "/submit", contact()),
+        "POST /job-applications": lambda: ("POST", "/job-applications", application()),
+        "PATCH /inquiries/{id}/solve": lambda: ("PATCH", f"/inquiries/{random.choice(inquiry_ids)}/solve", None),
+        "POST /inquiries/{id}/reply": lambda: (
+            "POST", f"/inquiries/{random.choice(inquiry_ids)}/reply",
+            {"plain_text_body": "Thanks", "html_body": "<p>Thanks</p>"}),
+        "PATCH /job-applications/{id}/status": lambda: (
+            "PATCH", f"/job-applications/{random.choice(application_ids)}/status?status=approved", None),
+        "POST /job-applications/bulk-status": lambda: (
+            "POST", "/job-applications/bulk-status",
+            {"ids": random.sample(application_ids, min(20, len(application_ids))),
+             "status": random.choice(("approved", "rejected"))}),
+        "POST /inquiries/bulk-solve": lambda: (
+            "POST", "/inquiries/bulk-solve", {"ids": random.sample(inquiry_ids, min(20, len(inquiry_ids)))}),
+        "POST /admin/login": lambda: (
+            "POST", "/admin/login", None, {"data": {"username": login_email, "password": login_password}}),
+        # A fresh token per request: logging out revokes the token it is sent with
+        "POST /admin/logout": lambda: (
+            "POST", "/admin/logout", None,
+            {"headers": {"Authorization": f"Bearer {api.create_access_token({'sub': 'bench-logout@example.com'})}"}}),
+        "POST /admin/add": lambda: (
+            "POST", "/admin/add", {"name": "Bench", "email": f"bench-{next(serial)}@example.com", "password": "pw"}),
+        "PATCH /admin/update/{id}": lambda: (
+            "PATCH", f"/admin/update/{admin.inserted_id}", {"name": f"Bench {next(serial)}"}),
+    }
+
+    # CRUD and bulk import for every admin-managed collection
+    crud = (
+        ("/faqs", api.faqs_collection, faq),
+        ("/latest-works", api.latest_works_collection, latest_work),
+        ("/job-listings", api.job_listings_collection, job_listing),
+        ("/gallery-events", api.db["gallery_events"], gallery_event),
+    )
+    for path, collection, make in crud:
+        ids = [str(doc["_id"]) async for doc in collection.find({}, {"_id": 1}).limit(PUBLIC_SIZE)]
+
+        async def create_then_delete(path=path, collection=collection, make=make):
+            result = await collection.insert_one(make(next(serial)))
+            return "DELETE", f"{path}/{result.inserted_id}", None
+
+        routes[f"POST {path}"] = lambda path=path, make=make: ("POST", path, make(next(serial)))
+        routes[f"PUT {path}/{{id}}"] = lambda path=path, make=make, ids=ids: (
+            "PUT", f"{path}/{random.choice(ids)}", make(next(serial)))
+        routes[f"DELETE {path}/{{id}}"] = create_then_delete
+        if path != "/gallery-events":
+            routes[f"POST {path}/bulk"] = lambda path=path, make=make: (
+                "POST", f"{path}/bulk", [make(next(serial)) for _ in range(10)])
+
+    skipped = {"GET /admin/feed": "server-sent event stream that stays open, so it has no request latency"}
+
+    if api.resume_bucket is None:
+        for name in ("POST /job-applications/resume", "GET /job-applications/resume/{id}"):
+            skipped[name] = "needs GridFS, which --mongo mock does not provide"
+    else:
+        resume = b"%PDF-1.4 " + b"x" * 100_000
+        upload = lambda: ("POST", "/job-applications/resume", None,
+                          {"files": {"file": ("bench.pdf", resume, "application/pdf")}})
+        resume_id = await api.resume_bucket.upload_from_stream(
+            "bench.pdf", resume, metadata={"contentType": "application/pdf"})
+        routes["POST /job-applications/resume"] = upload
+        routes["GET /job-applications/resume/{id}"] = lambda: ("GET", f"/job-applications/resume/{resume_id}", None)
+
+    try:
+        manifest = await api.image_pipeline.process(png(0))
+    except ImportError:
+        for name in ("POST /gallery/images", "GET /gallery/images/{key}"):
+            skipped[name] = "needs Pillow"
+    else:
+        image_key = manifest["variants"]["thumb"]["webp"]
+        # A new image per request; identical uploads are answered from the stored manifest
+        routes["POST /gallery/images"] = lambda: (
+            "POST", "/gallery/images", None, {"files": {"file": ("bench.png", png(next(serial) + 1), "image/png")}})
+        routes["GET /gallery/images/{key}"] = lambda: ("GET", f"/gallery/images/{image_key}", None)
+    return routes, skipped
+
+
+async def run_route(client, make_request, total: int, concurrency: int) -> dict:
+    latencies = []
+    errors = 0
+    remaining = total
+
+    async def worker():
+        nonlocal remaining, errors
+        while remaining > 0:
+            remaining -= 1
+            request = make_request()
+            if inspect.isawaitable(request):
+                request = await request
+            method, path, body, *options = request
+            start = time.perf_counter()
+            response = await client.request(method, path, json=body, **(options[0] if options else {}))
+            latencies.append((time.perf_counter() - start) * 1000)
+            if response.status_code >= 400:
+                errors += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+    return {
+        "requests": total,
+        "errors": errors,
+        "throughput_rps": round(total / elapsed, 1),
+        "p50_ms": round(statistics.median(latencies), 3),
+        "p95_ms": round(percentile(latencies, 95), 3),
+        "p99_ms": round(percentile(latencies, 99), 3),
+    }
+
+
+def compare(results: dict, baseline: dict, tolerance: float) -> list[str]:
+    regressions = []
+    for route, current in results["routes"].items():
+        previous = baseline.get("routes", {}).get(route)
+        if previous is None:
+            continue
+        if current["p95_ms"] > previous["p95_ms"] * (1 + tolerance):
+            regressions.append(f"{route}: p95 {previous['p95_ms']}ms -> {current['p95_ms']}ms")
+        if current["throughput_rps"] < previous["throughput_rps"] * (1 - tolerance):
+            regressions.append(f"{route}: throughput {previous['throughput_rps']} -> {current['throughput_rps']} rps")
+    return regressions
+
+
+async def main(args) -> int:
+    import httpx
+    import app as api
+
+    if args.mongo == "mock":
+        use_mock_mongo(api)
+
+    async with api.app.router.lifespan_context(api.app):
+        print(f"Seeding {args.size} documents...")
+        await seed(api, args.size, reconcile_stats=args.mongo != "mock")
+        routes, skipped = await scenarios(api)
+        for name, reason in skipped.items():
+            print(f"Skipping {name}: {reason}")
+        selected = [name for name in routes if not args.routes or any(r in name for r in args.routes)]
+
+        transport = httpx.ASGITransport(app=api.app)
+        results = {"size": args.size, "concurrency": args.concurrency, "mongo": args.mongo, "routes": {}}
+        # Admin routes need a token; public routes ignore the header
+        headers = {"Authorization": f"Bearer {api.create_access_token({'sub': 'bench@example.com'})}"}
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=60, headers=headers) as client:
+            for name in selected:
+                # Warm caches and connections before measuring
+                await run_route(client, routes[name], min(args.requests, args.concurrency), args.concurrency)
+                stats = await run_route(client, routes[name], args.requests, args.concurrency)
+                results["routes"][name] = stats
+                print(f"{name:<38} {stats['throughput_rps']:>9.1f} rps  p50={stats['p50_ms']:>8.2f}ms  "
+                      f"p95={stats['p95_ms']:>8.2f}ms  p99={stats['p99_ms']:>8.2f}ms  errors={stats['errors']}")
+
+        if args.mongo != "mock":
+            await api.client.drop_database(args.db_name)
+
+    if args.output:
+        with open(args.output, "w") as output:
+            json.dump(results, output, indent=2)
+    if args.save_baseline:
+        with open(args.save_baseline, "w") as output:
+            json.dump(results, output, indent=2)
+        print(f"Baseline written to {args.save_baseline}")
+    if args.baseline:
+        with open(args.baseline) as baseline_file:
+            regressions = compare(results, json.load(baseline_file), args.tolerance)
+        for regression in regressions:
+            print(f"❌ {regression}")
+        if regressions:
+            return 1
+        print("✅ No regressions against baseline")
+    return 0
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--mongo", choices=("url", "mongod", "mock"), default="url")
+    parser.add_argument("--mongod-bin", default=shutil.which("mongod") or "mongod")
+    parser.add_argument("--db-name", default="ESWEBSITE_BENCH")
+    parser.add_argument("--size", type=int, default=1000, help="documents seeded into inquiries and applications")
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--requests", type=int, default=500, help="measured requests per route")
+    parser.add_argument("--routes", nargs="*", help="only run routes whose name contains one of these")
+    parser.add_argument("--output", help="write results JSON here")
+    parser.add_argument("--save-baseline", help="write results JSON as the new baseline")
+    parser.add_argument("--baseline", help="compare against this baseline JSON")
+    parser.add_argument("--tolerance", type=float, default=0.2)
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    configure_environment(args)
+    mongod = None
+    if args.mongo == "mongod":
+        mongod, dbpath, url = start_mongod(args.mongod_bin)
+        os.environ["MONGODB_URL"] = url
+    try:
+        exit_code = asyncio.run(main(args))
+    finally:
+        if mongod is not None:
+            mongod.terminate()
+            mongod.wait()
+            shutil.rmtree(dbpath, ignore_errors=True)
+    sys.exit(exit_code)
@@ -0,0 +1,83 @@
+"""Measure admin auth overhead with and without the verified-token cache.
+
+First times ``TokenVerifier.verify`` on its own, then a cheap protected route
+(/admin/auth/stats, no database work) through the app in-process, next to
+the unauthenticated /healthz as the no-auth baseline. "uncached" runs with
+the cache disabled, i.e. a full ``jwt.decode`` per request.
+
+    python bench_auth.py --mongo mock
+    python bench_auth.py --mongo url --requests 5000 --concurrency 50
+"""
+import argparse
+import asyncio
+import statistics
+import time
+from jose import jwt
+import bench_api
+from auth import TokenVerifier
+
+SECRET_KEY = "bench-secret"
+ALGORITHM = "HS256"
+
+
+def time_verify(verifier: TokenVerifier, token: str, calls: int) -> float:
+    """Median microseconds per ``verify`` over five rounds of ``calls``."""
+    verifier.verify(token)
+    rounds = []
+    for _ in range(5):
+        start = time.perf_counter()
+        for _ in range(calls):
+            verifier.verify(token)
+        rounds.append((time.perf_counter() - start) / calls * 1e6)
+    return statistics.median(rounds)
+
+
+def bench_verifier(calls: int):
+    token = jwt.encode({"sub": "bench@example.com", "exp": time.time() + 3600, "iat": time.time()},
+                       SECRET_KEY, algorithm=ALGORITHM)
+    uncached = time_verify(TokenVerifier(SECRET_KEY, ALGORITHM, max_entries=0), token, calls)
+    cached = time_verify(TokenVerifier(SECRET_KEY, ALGORITHM), token, calls)
+    print(f"verify()  uncached={uncached:>8.1f}us  cached={cached:>8.1f}us  speedup={uncached / cached:>6.1f}x")
+
+
+async def bench_routes(args):
+    import httpx
+    import app as api
+
+    if args.mongo == "mock":
+        bench_api.use_mock_mongo(api)
+    async with api.app.router.lifespan_context(api.app):
+        headers = {"Authorization": f"Bearer {api.create_access_token({'sub': 'bench@example.com'})}"}
+        transport = httpx.ASGITransport(app=api.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench", headers=headers) as client:
+            cases = [
+                ("GET /healthz (no auth)", "/healthz", None),
+                ("GET /admin/auth/stats uncached", "/admin/auth/stats", 0),
+                ("GET /admin/auth/stats cached", "/admin/auth/stats", 1024),
+            ]
+            for name, path, max_entries in cases:
+                if max_entries is not None:
+                    api.token_verifier.max_entries = max_entries
+                make_request = lambda: ("GET", path, None)
+                await bench_api.run_route(client, make_request, args.concurrency, args.concurrency)
+                stats = await bench_api.run_route(client, make_request, args.requests, args.concurrency)
+                print(f"{name:<32} {stats['throughput_rps']:>9.1f} rps  p50={stats['p50_ms']:>7.3f}ms  "
+                      f"p95={stats['p95_ms']:>7.3f}ms  errors={stats['errors']}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--mongo", choices=("url", "mock"), default="url")
+    parser.add_argument("--db-name", default="ESWEBSITE_BENCH")
+    parser.add_argument("--calls", type=int, default=20000, help="verify() calls per round")
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=20)
+    args = parser.parse_args()
+    bench_api.configure_environment(args)
+
+    bench_verifier(args.calls)
+    asyncio.run(bench_routes(args))
+
+
+if __name__ == "__main__":
+    main()
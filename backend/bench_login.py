@@ -0,0 +1,65 @@
+"""Measure /faqs latency while admin logins are in flight.
+
+Runs the app in-process against the MongoDB configured in .env, seeds a
+throwaway admin, then fires concurrent logins while timing /faqs reads.
+
+    python bench_login.py [logins] [faq_requests]
+"""
+import asyncio
+import statistics
+import sys
+import time
+import httpx
+import app as api
+from hashing import hash_password
+
+BENCH_EMAIL = "bench-login@example.com"
+BENCH_PASSWORD = "bench-password"
+
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+async def timed_get(client, url, samples):
+    start = time.perf_counter()
+    await client.get(url)
+    samples.append((time.perf_counter() - start) * 1000)
+
+
+async def main(logins: int, faq_requests: int):
+    async with api.app.router.lifespan_context(api.app):
+        await run(logins, faq_requests)
+
+
+async def run(logins: int, faq_requests: int):
+    admins_collection = api.admins_collection
+    await admins_collection.delete_many({"email": BENCH_EMAIL})
+    await admins_collection.insert_one({"name": "bench", "email": BENCH_EMAIL, "password": hash_password(BENCH_PASSWORD)})
+
+    transport = httpx.ASGITransport(app=api.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        idle = []
+        for _ in range(faq_requests):
+            await timed_get(client, "/faqs", idle)
+
+        loaded = []
+        login_form = {"username": BENCH_EMAIL, "password": BENCH_PASSWORD}
+        login_tasks = [client.post("/admin/login", data=login_form) for _ in range(logins)]
+        faq_tasks = [timed_get(client, "/faqs", loaded) for _ in range(faq_requests)]
+        results = await asyncio.gather(*login_tasks, *faq_tasks)
+        statuses = [r.status_code for r in results[:logins]]
+
+    await admins_collection.delete_many({"email": BENCH_EMAIL})
+
+    for label, samples in (("idle", idle), ("during logins", loaded)):
+        print(f"/faqs {label:>14}: p50={statistics.median(samples):7.2f}ms "
+              f"p99={percentile(samples, 99):7.2f}ms n={len(samples)}")
+    print("login statuses:", {code: statuses.count(code) for code in set(statuses)})
+
+
+if __name__ == "__main__":
+    args = [int(arg) for arg in sys.argv[1:3]]
+    asyncio.run(main(*(args + [50, 200][len(args):])))
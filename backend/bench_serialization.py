@@ -0,0 +1,110 @@
+"""Compare the old and new JSON paths for large list responses.
+
+"before" reproduces what the list handlers used to do: rewrite every
+document in Python (``str(_id)``, ``isoformat()``), run FastAPI's
+``jsonable_encoder`` and render with the stdlib ``json`` module.
+"after" hands the driver output (or the ``$project``-shaped inquiry
+documents) straight to ``MongoJSONResponse``.
+
+    python bench_serialization.py --documents 10000 --rounds 20
+"""
+import argparse
+import datetime
+import json
+import statistics
+import time
+from bson import ObjectId
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from serialization import MongoJSONResponse
+
+
+def make_applications(count: int) -> list[dict]:
+    now = datetime.datetime.utcnow()
+    return [
+        {"_id": ObjectId(), "jobId": str(i % 20), "name": f"Applicant {i}", "email": f"applicant{i}@example.com",
+         "phone": "0000000000", "experience": "3 years", "address": "12 Main Street", "resume": str(ObjectId()),
+         "status": ("pending", "approved", "rejected")[i % 3], "appliedDate": now.isoformat()}
+        for i in range(count)
+    ]
+
+
+def make_inquiries(count: int) -> list[dict]:
+    now = datetime.datetime.utcnow()
+    return [
+        {"_id": ObjectId(), "name": f"Name {i}", "email": f"user{i}@example.com", "subject": f"Subject {i}",
+         "message": "Hello, I would like a quote for a wedding stage decoration. " * 3, "is_solved": False,
+         "created_at": now - datetime.timedelta(minutes=i)}
+        for i in range(count)
+    ]
+
+
+def before_applications(documents):
+    for document in documents:
+        document["_id"] = str(document["_id"])
+    return JSONResponse(content=jsonable_encoder(documents)).body
+
+
+def after_applications(documents):
+    return MongoJSONResponse(content=documents).body
+
+
+def before_inquiries(documents):
+    formatted = [
+        {"id": str(inq["_id"]), "name": inq.get("name"), "email": inq.get("email"), "subject": inq.get("subject"),
+         "message": inq.get("message"), "is_solved": inq.get("is_solved", False),
+         "created_at": inq["created_at"].isoformat()}
+        for inq in documents
+    ]
+    return JSONResponse(content=jsonable_encoder(formatted)).body
+
+
+def after_inquiries(documents):
+    # Shape produced by inquiry_projection: id already a string, created_at a datetime
+    return MongoJSONResponse(content=documents).body
+
+
+def shaped_inquiries(documents):
+    return [
+        {"id": str(inq["_id"]), **{key: value for key, value in inq.items() if key != "_id"}}
+        for inq in documents
+    ]
+
+
+def measure(func, make_input, rounds: int) -> list[float]:
+    timings = []
+    for _ in range(rounds):
+        documents = make_input()
+        start = time.perf_counter()
+        func(documents)
+        timings.append((time.perf_counter() - start) * 1000)
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--documents", type=int, default=10000)
+    parser.add_argument("--rounds", type=int, default=20)
+    args = parser.parse_args()
+
+    applications = make_applications(args.documents)
+    inquiries = make_inquiries(args.documents)
+    shaped = shaped_inquiries(inquiries)
+    cases = [
+        # The old handler mutated its input, so each round gets fresh copies
+        ("applications", before_applications, lambda: [dict(doc) for doc in applications],
+         after_applications, lambda: applications),
+        ("inquiries", before_inquiries, lambda: inquiries, after_inquiries, lambda: shaped),
+    ]
+
+    print(f"{args.documents} documents, {args.rounds} rounds (median ms)")
+    for name, before, before_input, after, after_input in cases:
+        if json.loads(before(before_input())) != json.loads(after(after_input())):
+            raise SystemExit(f"{name}: before and after payloads differ")
+        before_ms = statistics.median(measure(before, before_input, args.rounds))
+        after_ms = statistics.median(measure(after, after_input, args.rounds))
+        print(f"{name:<14} before={before_ms:>8.2f}  after={after_ms:>8.2f}  speedup={before_ms / after_ms:>5.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,143 @@
+import asyncio
+import hashlib
+import time
+from collections import OrderedDict
+from compression import compress
+from serialization import dumps
+
+
+class CachedPayload:
+    """Rendered JSON body of one cache entry plus its compressed variants.
+
+    Each variant is compressed once, at the highest level, the first time a
+    client asks for that encoding, and reused until the entry is replaced.
+    The compression runs on a worker thread (brotli at quality 11 takes
+    ~100ms on a large list) and concurrent requests share that one run.
+    """
+
+    __slots__ = ("body", "etag", "_encoded", "_encoding")
+
+    def __init__(self, body: bytes):
+        self.body = body
+        self.etag = '"' + hashlib.sha1(body).hexdigest() + '"'
+        self._encoded: dict[str, bytes] = {}
+        self._encoding: dict[str, asyncio.Future] = {}
+
+    def etag_for(self, encoding: str | None) -> str:
+        # Each encoding is a different representation, so it gets its own ETag
+        return self.etag if encoding is None else self.etag[:-1] + f'-{encoding}"'
+
+    async def encoded(self, encoding: str) -> bytes:
+        body = self._encoded.get(encoding)
+        if body is not None:
+            return body
+        pending = self._encoding.get(encoding)
+        if pending is None:
+            loop = asyncio.get_running_loop()
+            pending = self._encoding[encoding] = loop.run_in_executor(None, compress, self.body, encoding, True)
+        try:
+            body = await asyncio.shield(pending)
+        finally:
+            if pending.done():
+                self._encoding.pop(encoding, None)
+        self._encoded[encoding] = body
+        return body
+
+
+class ResponseCache:
+    """In-process read-through cache for rarely changing public lists.
+
+    Entries expire after ``ttl`` seconds and the least recently used entry is
+    evicted once ``max_entries`` is reached. Each entry carries an ETag derived
+    from its content so handlers can answer ``If-None-Match`` with a 304.
+    Values are stored already rendered to JSON as ``CachedPayload`` objects.
+
+    Concurrent misses for one key share a single load. Every invalidation
+    bumps the key's generation; a load that overlapped one is returned to
+    its waiters but not stored, so a write landing mid-load is never masked
+    by the pre-write result.
+    """
+
+    def __init__(self, ttl: float = 60.0, max_entries: int = 128):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries: OrderedDict[str, tuple[float, CachedPayload]] = OrderedDict()
+        self._generations: dict[str, int] = {}
+        self._loads: dict[str, asyncio.Task] = {}
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: str):
+        """Return the ``CachedPayload`` for a live entry, or ``None``."""
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        expires_at, payload = entry
+        if expires_at < time.monotonic():
+            del self._entries[key]
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return payload
+
+    def set(self, key: str, value) -> CachedPayload:
+        return self._store(key, CachedPayload(dumps(value)))
+
+    def _store(self, key: str, payload: CachedPayload) -> CachedPayload:
+        self._entries[key] = (time.monotonic() + self.ttl, payload)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+        return payload
+
+    async def get_or_load(self, key: str, loader):
+        """Return the cached payload for ``key``, calling ``loader`` on a miss."""
+        cached = self.get(key)
+        if cached is not None:
+            return cached
+        load = self._loads.get(key)
+        if load is None:
+            load = self._loads[key] = asyncio.create_task(self._load(key, loader))
+        # Shielded: one waiter disconnecting must not cancel the others' load
+        return await asyncio.shield(load)
+
+    async def _load(self, key: str, loader) -> CachedPayload:
+        generation = self._generations.get(key, 0)
+        try:
+            payload = CachedPayload(dumps(await loader()))
+        finally:
+            if self._loads.get(key) is asyncio.current_task():
+                del self._loads[key]
+        if self._generations.get(key, 0) == generation:
+            self._store(key, payload)
+        return payload
+
+    def _bump(self, keys):
+        for key in keys:
+            self._generations[key] = self._generations.get(key, 0) + 1
+            self._entries.pop(key, None)
+            # Later misses start a fresh load instead of joining the stale one
+            self._loads.pop(key, None)
+
+    def invalidate(self, *keys: str):
+        """Drop the given keys, or every entry when called without arguments."""
+        self._bump(keys or list(self._entries.keys() | self._loads.keys()))
+
+    def invalidate_prefix(self, prefix: str):
+        """Drop every entry whose key starts with ``prefix``."""
+        self._bump([key for key in self._entries.keys() | self._loads.keys() if key.startswith(prefix)])
+
+    def stats(self) -> dict:
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "ttl": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "loading": len(self._loads),
+        }
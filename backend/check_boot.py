@@ -0,0 +1,66 @@
+"""Report what importing the app costs and fail when boot gets too slow.
+
+Imports app.py in a fresh interpreter with ``-X importtime``, prints the
+modules with the highest cumulative import time and exits non-zero when the
+whole import exceeds the budget, or when a module that should only load on
+first use (mail, SMTP, Pillow) is imported at boot.
+
+    python check_boot.py
+    python check_boot.py --budget-ms 800 --top 25
+"""
+import argparse
+import os
+import subprocess
+import sys
+
+# Loaded on first use; importing any of them at boot is a regression
+LAZY_MODULES = ("fastapi_mail", "aiosmtplib", "PIL")
+
+
+def import_times(module: str) -> list[tuple[str, int, int]]:
+    """Return ``(module, self_us, cumulative_us)`` for every import ``module`` triggers."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=os.path.dirname(os.path.abspath(__file__)),
+        capture_output=True,
+        text=True,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"Importing {module} failed:\n{result.stderr}")
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        rows.append((name.strip(), int(self_us), int(cumulative_us)))
+    return rows
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--module", default="app")
+    parser.add_argument("--budget-ms", type=float, default=float(os.getenv("BOOT_BUDGET_MS", "1500")))
+    parser.add_argument("--top", type=int, default=15)
+    args = parser.parse_args()
+
+    rows = import_times(args.module)
+    total_ms = next(cumulative for name, _, cumulative in rows if name == args.module) / 1000
+    print(f"{'module':<40} {'self ms':>9} {'cumulative ms':>14}")
+    for name, self_us, cumulative_us in sorted(rows, key=lambda row: row[2], reverse=True)[:args.top]:
+        print(f"{name:<40} {self_us / 1000:>9.1f} {cumulative_us / 1000:>14.1f}")
+
+    failures = []
+    eager = sorted({name.split(".")[0] for name, _, _ in rows} & set(LAZY_MODULES))
+    if eager:
+        failures.append(f"imported at boot instead of on first use: {', '.join(eager)}")
+    if total_ms > args.budget_ms:
+        failures.append(f"import {args.module} took {total_ms:.0f}ms, budget {args.budget_ms:.0f}ms")
+    for failure in failures:
+        print(f"❌ {failure}")
+    if not failures:
+        print(f"✅ import {args.module} took {total_ms:.0f}ms (budget {args.budget_ms:.0f}ms)")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
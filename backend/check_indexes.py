@@ -0,0 +1,27 @@
+"""Fail if any endpoint query falls back to a collection scan.
+
+Creates the declared indexes on the MongoDB configured in .env, explains each
+query in database.ENDPOINT_QUERIES and exits non-zero on any COLLSCAN.
+
+    python check_indexes.py
+"""
+import asyncio
+import sys
+from database import DB_NAME, create_client, find_collscans, init_db
+
+
+async def main() -> int:
+    client = create_client()
+    database = client[DB_NAME]
+    await init_db(database)
+    offenders = await find_collscans(database)
+    client.close()
+    for offender in offenders:
+        print(f"❌ COLLSCAN: {offender}")
+    if not offenders:
+        print("✅ All endpoint queries use an index")
+    return 1 if offenders else 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
@@ -0,0 +1,98 @@
+import gzip
+import os
+
+try:
+    import brotli
+except ImportError:  # gzip only when the brotli package is not installed
+    brotli = None
+
+# Responses smaller than this go out uncompressed; the headers would eat the saving
+MIN_COMPRESS_BYTES = int(os.getenv("COMPRESS_MIN_BYTES", "1024"))
+SUPPORTED_ENCODINGS = ("br", "gzip") if brotli is not None else ("gzip",)
+# Media types worth compressing; images and archives are already compressed
+COMPRESSIBLE_TYPES = (b"application/json", b"application/x-ndjson", b"text/")
+
+
+def negotiate(accept_encoding: str | None) -> str | None:
+    """Pick the best encoding the client accepts, preferring brotli over gzip."""
+    if not accept_encoding:
+        return None
+    weights = {}
+    for part in accept_encoding.split(","):
+        name, _, params = part.strip().partition(";")
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        weights[name.strip().lower()] = quality
+    for encoding in SUPPORTED_ENCODINGS:
+        if weights.get(encoding, weights.get("*", 0)) > 0:
+            return encoding
+    return None
+
+
+def compress(body: bytes, encoding: str, best: bool = False) -> bytes:
+    """Compress ``body``; ``best`` trades CPU for size when the result is stored."""
+    if encoding == "br":
+        return brotli.compress(body, quality=11 if best else 4)
+    return gzip.compress(body, compresslevel=9 if best else 6)
+
+
+class CompressionMiddleware:
+    """ASGI middleware compressing single-body responses the client accepts.
+
+    Responses that already carry a Content-Encoding (the precompressed cached
+    payloads), are not JSON or text, are below ``minimum_size`` or are
+    streamed in several chunks (exports, the SSE feed) pass through untouched.
+    """
+
+    def __init__(self, app, minimum_size: int = MIN_COMPRESS_BYTES):
+        self.app = app
+        self.minimum_size = minimum_size
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        headers = dict(scope["headers"])
+        encoding = negotiate(headers.get(b"accept-encoding", b"").decode("latin-1"))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start_message = None
+
+        async def send_wrapper(message):
+            nonlocal start_message
+            if message["type"] == "http.response.start":
+                start_message = message
+                return
+            if start_message is None:
+                await send(message)
+                return
+            start, start_message = start_message, None
+            body = message.get("body", b"")
+            response_headers = [(name.lower(), value) for name, value in start["headers"]]
+            header_values = dict(response_headers)
+            if (message.get("more_body", False) or b"content-encoding" in header_values
+                    or not header_values.get(b"content-type", b"").startswith(COMPRESSIBLE_TYPES)
+                    or len(body) < self.minimum_size):
+                await send(start)
+                await send(message)
+                return
+            body = compress(body, encoding)
+            response_headers = [
+                (name, value) for name, value in response_headers if name != b"content-length"
+            ]
+            response_headers += [
+                (b"content-encoding", encoding.encode("latin-1")),
+                (b"content-length", str(len(body)).encode("latin-1")),
+                (b"vary", b"Accept-Encoding"),
+            ]
+            await send({**start, "headers": response_headers})
+            await send({"type": "http.response.body", "body": body})
+
+        await self.app(scope, receive, send_wrapper)
@@ -0,0 +1,104 @@
+from typing import Callable, Type
+from bson import ObjectId
+from fastapi import APIRouter, HTTPException
+from fastapi.routing import APIRoute
+from pydantic import BaseModel
+from pymongo import ReturnDocument
+
+
+def parse_object_id(item_id: str, id_name: str) -> ObjectId:
+    if not ObjectId.is_valid(item_id):
+        raise HTTPException(status_code=400, detail=f"Invalid {id_name} ID")
+    return ObjectId(item_id)
+
+
+def to_response(document: dict) -> dict:
+    document["_id"] = str(document["_id"])
+    return document
+
+
+class Repository:
+    """Single-round-trip CRUD access to one collection.
+
+    The collection is attached with ``bind`` once the database client exists,
+    so repositories can be declared at import time.
+    """
+
+    def __init__(self, collection_name: str):
+        self.collection_name = collection_name
+        self.collection = None
+
+    def bind(self, database):
+        self.collection = database[self.collection_name]
+
+    async def list(self) -> list[dict]:
+        # Raw documents: MongoJSONResponse serializes the ObjectIds
+        return await self.collection.find().to_list(length=None)
+
+    async def create(self, data: dict) -> dict:
+        # insert_one fills data["_id"], so the response needs no second read
+        await self.collection.insert_one(data)
+        return to_response(data)
+
+    async def update(self, object_id: ObjectId, data: dict) -> dict | None:
+        document = await self.collection.find_one_and_update(
+            {"_id": object_id},
+            {"$set": data},
+            return_document=ReturnDocument.AFTER,
+        )
+        return to_response(document) if document else None
+
+    async def delete(self, object_id: ObjectId) -> bool:
+        result = await self.collection.delete_one({"_id": object_id})
+        return result.deleted_count > 0
+
+
+def create_crud_router(prefix: str, model: Type[BaseModel], repository: Repository, name: str,
+                       id_name: str, on_change: Callable[[str, dict | None], None] | None = None,
+                       route_class: Type[APIRoute] = APIRoute) -> APIRouter:
+    """Build POST/PUT/DELETE routes for ``repository`` under ``prefix``.
+
+    ``name`` and ``id_name`` fill the error messages ("FAQ not found",
+    "Invalid FAQ ID"); ``on_change(item_id, document)`` runs after every
+    successful write, with ``document`` set to ``None`` for deletes.
+    """
+    router = APIRouter(prefix=prefix, route_class=route_class)
+
+    def changed(item_id: str, document: dict | None):
+        if on_change is not None:
+            on_change(item_id, document)
+
+    @router.post("")
+    async def create_item(item: model):
+        try:
+            created = await repository.create(item.dict())
+            changed(created["_id"], created)
+            return created
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=str(e))
+
+    @router.put("/{item_id}")
+    async def update_item(item_id: str, item: model):
+        object_id = parse_object_id(item_id, id_name)
+        try:
+            updated = await repository.update(object_id, item.dict())
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=str(e))
+        if updated is None:
+            raise HTTPException(status_code=404, detail=f"{name} not found")
+        changed(item_id, updated)
+        return updated
+
+    @router.delete("/{item_id}")
+    async def delete_item(item_id: str):
+        object_id = parse_object_id(item_id, id_name)
+        try:
+            deleted = await repository.delete(object_id)
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=str(e))
+        if not deleted:
+            raise HTTPException(status_code=404, detail=f"{name} not found")
+        changed(item_id, None)
+        return {"message": f"{name} deleted successfully"}
+
+    return router
@@ -1,12 +1,23 @@
+import asyncio
+import datetime
 import os
 from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import ASCENDING, DESCENDING, IndexModel
 from dotenv import load_dotenv
+from metrics import MongoCommandTimer
 
 # Load environment variables
 load_dotenv()
 
 MONGODB_URL = os.getenv("MONGODB_URL", "mongodb://127.0.0.1:27017")
 DB_NAME = os.getenv("DB_NAME", "ESWEBSITE")
+MONGO_MAX_POOL_SIZE = int(os.getenv("MONGO_MAX_POOL_SIZE", "50"))
+MONGO_MIN_POOL_SIZE = int(os.getenv("MONGO_MIN_POOL_SIZE", "5"))
+MONGO_MAX_IDLE_TIME_MS = int(os.getenv("MONGO_MAX_IDLE_TIME_MS", "60000"))
+MONGO_CONNECT_TIMEOUT_MS = int(os.getenv("MONGO_CONNECT_TIMEOUT_MS", "5000"))
+MONGO_SERVER_SELECTION_TIMEOUT_MS = int(os.getenv("MONGO_SERVER_SELECTION_TIMEOUT_MS", "10000"))
+MONGO_SOCKET_TIMEOUT_MS = int(os.getenv("MONGO_SOCKET_TIMEOUT_MS", "30000"))
+MONGO_WAIT_QUEUE_TIMEOUT_MS = int(os.getenv("MONGO_WAIT_QUEUE_TIMEOUT_MS", "5000"))
 
 # Ensure variables are set correctly
 if not MONGODB_URL:
@@ -14,28 +25,127 @@ if not MONGODB_URL:
 if not DB_NAME:
     raise ValueError("DB_NAME is not set!")
 
-# Create MongoDB client
-client = AsyncIOMotorClient(MONGODB_URL)
-database = client[DB_NAME]
+# Indexes every collection needs for the queries the API runs
+INDEXES = {
+    "contacts": [
+        IndexModel([("email", ASCENDING)]),
+        IndexModel([("created_at", ASCENDING)]),
+        IndexModel([("is_solved", ASCENDING), ("_id", DESCENDING)]),
+        IndexModel([("is_solved", ASCENDING), ("created_at", ASCENDING)]),
+        IndexModel([("submission_key", ASCENDING)], unique=True, sparse=True),
+    ],
+    "admins": [
+        IndexModel([("email", ASCENDING)], unique=True),
+    ],
+    "faqs": [
+        IndexModel([("category", ASCENDING)]),
+    ],
+    "latest_works": [
+        IndexModel([("category", ASCENDING)]),
+    ],
+    "job_listings": [
+        IndexModel([("isActive", ASCENDING)]),
+    ],
+    "job_applications": [
+        IndexModel([("status", ASCENDING), ("_id", DESCENDING)]),
+        IndexModel([("jobId", ASCENDING), ("_id", DESCENDING)]),
+        IndexModel([("appliedDate", ASCENDING)]),
+        IndexModel([("status", ASCENDING), ("appliedDate", ASCENDING)]),
+        IndexModel([("resume", ASCENDING)], sparse=True),
+        IndexModel([("submission_key", ASCENDING)], unique=True, sparse=True),
+    ],
+    "contacts_archive": [
+        IndexModel([("created_at", ASCENDING)]),
+    ],
+    "job_applications_archive": [
+        IndexModel([("status", ASCENDING), ("_id", DESCENDING)]),
+        IndexModel([("jobId", ASCENDING), ("_id", DESCENDING)]),
+        IndexModel([("appliedDate", ASCENDING)]),
+        IndexModel([("resume", ASCENDING)], sparse=True),
+    ],
+    "resumes.files": [
+        IndexModel([("uploadDate", ASCENDING)]),
+    ],
+    "email_outbox": [
+        IndexModel([("status", ASCENDING), ("next_attempt_at", ASCENDING)]),
+        IndexModel([("status", ASCENDING), ("lease_expires_at", ASCENDING)]),
+    ],
+    "revoked_tokens": [
+        IndexModel([("expires_at", ASCENDING)], expireAfterSeconds=0),
+    ],
+}
 
-# Debugging
-print(f"Connected to MongoDB at {MONGODB_URL}, Database: {DB_NAME}")
+# Representative filtered queries issued by the endpoints, as
+# (collection, filter, sort). Unfiltered reads of whole collections are left
+# out on purpose: they scan everything whatever indexes exist.
+ENDPOINT_QUERIES = [
+    ("contacts", {"is_solved": False}, [("_id", DESCENDING)]),
+    ("contacts", {"is_solved": True}, [("_id", DESCENDING)]),
+    ("admins", {"email": "admin@example.com"}, None),
+    ("job_applications", {"status": "pending"}, [("_id", DESCENDING)]),
+    ("job_applications", {"jobId": "1"}, [("_id", DESCENDING)]),
+    ("job_applications", {}, [("_id", DESCENDING)]),
+    ("contacts", {"is_solved": True, "created_at": {"$lt": datetime.datetime(2000, 1, 1)}}, [("_id", ASCENDING)]),
+    ("job_applications", {"status": {"$in": ["approved", "rejected"]}, "appliedDate": {"$lt": "2000-01-01"}}, [("_id", ASCENDING)]),
+    ("job_applications_archive", {"status": "approved"}, [("_id", DESCENDING)]),
+    ("email_outbox", {"status": "pending", "next_attempt_at": {"$lte": datetime.datetime(2000, 1, 1)}}, [("next_attempt_at", ASCENDING)]),
+]
+
+
+def create_client() -> AsyncIOMotorClient:
+    """Create the Motor client for this process, with a sized pool and timeouts.
+
+    Called from the app lifespan, so under ``uvicorn --workers N`` (or any
+    pre-fork server) every worker opens its own pool after it has started;
+    ``MONGO_MAX_POOL_SIZE`` is per worker.
+    """
+    return AsyncIOMotorClient(
+        MONGODB_URL,
+        maxPoolSize=MONGO_MAX_POOL_SIZE,
+        minPoolSize=MONGO_MIN_POOL_SIZE,
+        maxIdleTimeMS=MONGO_MAX_IDLE_TIME_MS,
+        connectTimeoutMS=MONGO_CONNECT_TIMEOUT_MS,
+        serverSelectionTimeoutMS=MONGO_SERVER_SELECTION_TIMEOUT_MS,
+        socketTimeoutMS=MONGO_SOCKET_TIMEOUT_MS,
+        waitQueueTimeoutMS=MONGO_WAIT_QUEUE_TIMEOUT_MS,
+        event_listeners=[MongoCommandTimer()],
+    )
 
-# Initialize collections
-contacts_collection = database["contacts"]
-admins_collection = database["admins"]
 
 # Create indexes
-async def init_db():
-    # Create indexes for contacts collection
-    await contacts_collection.create_index("email")
-    await contacts_collection.create_index("created_at")
-    await contacts_collection.create_index("is_solved")
-    
-    # Create indexes for admins collection
-    await admins_collection.create_index("email", unique=True)
-    
+async def init_db(database):
+    for name, indexes in INDEXES.items():
+        await database[name].create_indexes(indexes)
+
     print("Database indexes created successfully")
 
+
+async def warm_pool(client: AsyncIOMotorClient, connections: int = MONGO_MIN_POOL_SIZE):
+    """Open ``connections`` pooled sockets up front by pinging concurrently."""
+    await asyncio.gather(*(client.admin.command("ping") for _ in range(max(1, connections))))
+
+
+def _has_collscan(plan: dict) -> bool:
+    if plan.get("stage") == "COLLSCAN":
+        return True
+    children = plan.get("inputStages", [])
+    if "inputStage" in plan:
+        children = [plan["inputStage"], *children]
+    return any(_has_collscan(child) for child in children)
+
+
+async def find_collscans(database) -> list[str]:
+    """Explain every ENDPOINT_QUERIES entry and return those that use COLLSCAN."""
+    offenders = []
+    for name, query, sort in ENDPOINT_QUERIES:
+        cursor = database[name].find(query)
+        if sort:
+            cursor = cursor.sort(sort)
+        explanation = await cursor.explain()
+        if _has_collscan(explanation["queryPlanner"]["winningPlan"]):
+            offenders.append(f"{name} {query} sort={sort}")
+    return offenders
+
+
 # Export collections
-__all__ = ["database", "contacts_collection", "admins_collection", "init_db"]
\ No newline at end of file
+__all__ = ["INDEXES", "create_client", "init_db", "warm_pool", "find_collscans"]
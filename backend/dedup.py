@@ -0,0 +1,93 @@
+import hashlib
+import time
+from collections import OrderedDict
+from fastapi import HTTPException
+
+# Field holding a submission's dedup key on the stored document (unique index)
+SUBMISSION_KEY = "submission_key"
+
+
+def content_hash(kind: str, *parts) -> str:
+    """SHA-256 of the normalized parts: case-folded, whitespace collapsed."""
+    normalized = [" ".join(str(part or "").split()).casefold() for part in parts]
+    return hashlib.sha256("\x1f".join([kind, *normalized]).encode("utf-8")).hexdigest()
+
+
+class RecentKeys:
+    """TTL set of recently seen keys, bounded to ``max_keys`` (oldest dropped first)."""
+
+    def __init__(self, ttl: float, max_keys: int = 10000):
+        self.ttl = ttl
+        self.max_keys = max_keys
+        self._expiry: OrderedDict[str, float] = OrderedDict()
+
+    def __contains__(self, key: str) -> bool:
+        expires = self._expiry.get(key)
+        if expires is None:
+            return False
+        if expires <= time.monotonic():
+            del self._expiry[key]
+            return False
+        return True
+
+    def add(self, key: str):
+        self._expiry[key] = time.monotonic() + self.ttl
+        self._expiry.move_to_end(key)
+        while len(self._expiry) > self.max_keys:
+            self._expiry.popitem(last=False)
+
+    def discard(self, key: str):
+        self._expiry.pop(key, None)
+
+    def __len__(self) -> int:
+        return len(self._expiry)
+
+
+class SubmissionDeduplicator:
+    """Rejects repeated form submissions within ``window`` seconds with a 409.
+
+    A submission is identified by a hash of its normalized content. The
+    hash, suffixed with the ``window``-second bucket the submission arrives
+    in, is stored on the submitted document itself under ``SUBMISSION_KEY``,
+    whose unique index makes the one insert that stores the submission also
+    reject duplicates sent to other workers; a new submission costs no extra
+    round trip. Hashes this worker stored recently are answered from an
+    in-memory TTL set without touching Mongo. Buckets are fixed, so copies
+    sent to different workers either side of a bucket boundary both go
+    through.
+    """
+
+    def __init__(self, window: float = 600.0, max_keys: int = 10000):
+        self.window = window
+        self.recent = RecentKeys(window, max_keys)
+        self.stored = 0
+        self.rejected = {"memory": 0, "index": 0}
+
+    def _reject(self, reason: str):
+        self.rejected[reason] += 1
+        raise HTTPException(status_code=409, detail="This submission was already received")
+
+    def key(self, kind: str, *parts) -> str:
+        """Return the key to store with the submission, or raise 409 if this worker stored it recently."""
+        digest = content_hash(kind, *parts)
+        if digest in self.recent:
+            self._reject("memory")
+        return f"{digest}:{int(time.time() // self.window)}"
+
+    def accepted(self, key: str):
+        """Record that the submission with ``key`` was stored."""
+        self.recent.add(key.split(":", 1)[0])
+        self.stored += 1
+
+    def duplicate(self, key: str):
+        """Raise 409 for a submission whose insert hit the unique index."""
+        self.recent.add(key.split(":", 1)[0])
+        self._reject("index")
+
+    def stats(self) -> dict:
+        return {
+            "window": self.window,
+            "stored": self.stored,
+            "rejected": dict(self.rejected),
+            "recent_keys": len(self.recent),
+        }
@@ -0,0 +1,181 @@
+import asyncio
+import datetime
+import json
+import logging
+from pymongo.errors import OperationFailure
+
+logger = logging.getLogger(__name__)
+
+HEARTBEAT_SECONDS = 15
+# Server errors meaning the resume token can no longer be used
+# (ChangeStreamHistoryLost, ChangeStreamFatalError)
+RESUME_FAILED_CODES = (286, 280)
+
+
+def _json_default(value):
+    if isinstance(value, datetime.datetime):
+        return value.isoformat()
+    return str(value)
+
+
+class LiveFeed:
+    """Fan-out of inquiry and application changes to connected admin clients.
+
+    When the deployment supports Mongo change streams, ``start`` watches the
+    source collections and every change is published from there. Otherwise
+    (standalone mongod) the write handlers' ``publish`` calls drive the feed.
+    Each subscriber gets a bounded queue; one that falls behind is dropped so
+    it reconnects and re-fetches a snapshot. ``formatters`` maps "inquiry" and
+    "application" to the functions that shape inserted documents like the
+    list endpoints do. With several workers, ``relay(event)`` forwards
+    published events to the others, which deliver them through ``receive``.
+
+    A change stream that errors is reopened after the last change it
+    delivered, retrying up to ``max_retries`` times in a row with backoff.
+    If the history is gone, subscribers are told to reconnect and re-fetch.
+    If the stream cannot be reopened at all, the feed falls back to the
+    write handlers' events.
+    """
+
+    def __init__(self, contacts, applications, formatters: dict, queue_size: int = 100, relay=None,
+                 max_retries: int = 5, retry_interval: float = 1.0):
+        self.contacts = contacts
+        self.applications = applications
+        self.formatters = formatters
+        self.queue_size = queue_size
+        self.relay = relay
+        self.max_retries = max_retries
+        self.retry_interval = retry_interval
+        self.using_change_streams = False
+        self.stream_errors = 0
+        self._subscribers: set[asyncio.Queue] = set()
+        self._tasks: list[asyncio.Task] = []
+
+    def _disconnect_all(self):
+        # Subscribers may have missed events: make them reconnect and re-fetch
+        for queue in list(self._subscribers):
+            self._subscribers.discard(queue)
+            while not queue.empty():
+                queue.get_nowait()
+            queue.put_nowait(None)
+
+    def _broadcast(self, event: dict):
+        for queue in list(self._subscribers):
+            try:
+                queue.put_nowait(event)
+            except asyncio.QueueFull:
+                # Too far behind: drop the subscriber and tell it to reconnect
+                self._subscribers.discard(queue)
+                queue.get_nowait()
+                queue.put_nowait(None)
+
+    def publish(self, event_type: str, item_id: str, data: dict | None = None):
+        """Publish a change from a write handler (ignored when change streams drive the feed)."""
+        if not self.using_change_streams:
+            event = {"type": event_type, "id": item_id, "data": data or {}}
+            self._broadcast(event)
+            if self.relay is not None:
+                self.relay(event)
+
+    def receive(self, event: dict):
+        """Deliver an event published by another worker."""
+        if not self.using_change_streams:
+            self._broadcast(event)
+
+    async def start(self):
+        try:
+            hello = await self.contacts.database.command("hello")
+        except Exception as e:
+            logger.info(f"Could not detect change stream support: {str(e)}")
+            hello = {}
+        # Change streams need a replica set or a sharded cluster
+        if "setName" not in hello and hello.get("msg") != "isdbgrid":
+            logger.info("Change streams unavailable, live feed uses in-process events")
+            return
+        self.using_change_streams = True
+        self._tasks = [
+            asyncio.create_task(self._watch(self.contacts, "inquiry")),
+            asyncio.create_task(self._watch(self.applications, "application")),
+        ]
+
+    async def stop(self):
+        for task in self._tasks:
+            task.cancel()
+        for task in self._tasks:
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+        self._tasks = []
+
+    async def _watch(self, collection, kind: str):
+        resume_token = None
+        failures = 0
+        while True:
+            try:
+                async with collection.watch(resume_after=resume_token) as stream:
+                    async for change in stream:
+                        failures = 0
+                        resume_token = change["_id"]
+                        self._handle_change(kind, change)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.stream_errors += 1
+                failures += 1
+                logger.error(f"Change stream on {collection.name} failed ({failures}/{self.max_retries}): {str(e)}")
+                if isinstance(e, OperationFailure) and e.code in RESUME_FAILED_CODES:
+                    resume_token = None
+                    self._disconnect_all()
+                if failures >= self.max_retries:
+                    self._fall_back()
+                    return
+                await asyncio.sleep(min(self.retry_interval * 2 ** (failures - 1), 30))
+
+    def _fall_back(self):
+        logger.error("Change streams unavailable, live feed falls back to in-process events")
+        self.using_change_streams = False
+        self._disconnect_all()
+        current = asyncio.current_task()
+        for task in self._tasks:
+            if task is not current:
+                task.cancel()
+
+    def _handle_change(self, kind: str, change: dict):
+        item_id = str(change["documentKey"]["_id"])
+        if change["operationType"] == "insert":
+            document = self.formatters[kind](change["fullDocument"])
+            self._broadcast({"type": f"{kind}.created", "id": item_id, "data": document})
+        elif change["operationType"] == "update":
+            fields = change["updateDescription"]["updatedFields"]
+            if kind == "inquiry" and fields.get("is_solved"):
+                self._broadcast({"type": "inquiry.solved", "id": item_id, "data": {}})
+            elif kind == "application" and "status" in fields:
+                self._broadcast({"type": "application.status", "id": item_id,
+                                 "data": {"status": fields["status"]}})
+
+    async def stream(self, request):
+        """Yield server-sent events for one client until it disconnects."""
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+        self._subscribers.add(queue)
+        try:
+            yield "retry: 3000\n\n"
+            while not await request.is_disconnected():
+                try:
+                    event = await asyncio.wait_for(queue.get(), timeout=HEARTBEAT_SECONDS)
+                except asyncio.TimeoutError:
+                    yield ": heartbeat\n\n"
+                    continue
+                if event is None:
+                    break
+                payload = json.dumps(event, default=_json_default)
+                yield f"event: {event['type']}\ndata: {payload}\n\n"
+        finally:
+            self._subscribers.discard(queue)
+
+    def stats(self) -> dict:
+        return {
+            "subscribers": len(self._subscribers),
+            "change_streams": self.using_change_streams,
+            "stream_errors": self.stream_errors,
+        }
@@ -0,0 +1,59 @@
+import csv
+import datetime
+import io
+import json
+from fastapi import HTTPException
+from fastapi.responses import StreamingResponse
+
+EXPORT_BATCH_SIZE = 500
+
+MEDIA_TYPES = {
+    "csv": "text/csv",
+    "ndjson": "application/x-ndjson",
+}
+
+
+def _to_row(document: dict) -> dict:
+    document["_id"] = str(document["_id"])
+    for key, value in document.items():
+        if isinstance(value, datetime.datetime):
+            document[key] = value.isoformat()
+    return document
+
+
+async def _csv_rows(cursor, columns):
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=columns, extrasaction="ignore")
+    writer.writeheader()
+    yield buffer.getvalue()
+    async for document in cursor:
+        buffer.seek(0)
+        buffer.truncate()
+        writer.writerow(_to_row(document))
+        yield buffer.getvalue()
+
+
+async def _ndjson_rows(cursor):
+    async for document in cursor:
+        yield json.dumps(_to_row(document), default=str) + "\n"
+
+
+def stream_export(collection, query: dict, columns, export_format: str, filename: str,
+                  projection: dict | None = None):
+    """Stream every matching document as CSV or NDJSON.
+
+    The Motor cursor is consumed in batches of ``EXPORT_BATCH_SIZE`` so memory
+    stays flat however large the collection is.
+    """
+    if export_format not in MEDIA_TYPES:
+        raise HTTPException(status_code=400, detail="Format must be csv or ndjson")
+    cursor = collection.find(query, projection).sort("_id", 1).batch_size(EXPORT_BATCH_SIZE)
+    if export_format == "csv":
+        body = _csv_rows(cursor, ["_id", *columns])
+    else:
+        body = _ndjson_rows(cursor)
+    return StreamingResponse(
+        body,
+        media_type=MEDIA_TYPES[export_format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}.{export_format}"'},
+    )
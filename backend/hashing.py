@@ -0,0 +1,77 @@
+import asyncio
+import os
+from concurrent.futures import ThreadPoolExecutor
+import bcrypt
+from fastapi import HTTPException
+from metrics import BCRYPT_SECONDS
+
+
+def hash_password(password: str) -> str:
+    salt = bcrypt.gensalt()
+    hashed_password = bcrypt.hashpw(password.encode("utf-8"), salt)
+    return hashed_password.decode("utf-8")
+
+
+def verify_password(plain_password: str, hashed_password: str) -> bool:
+    return bcrypt.checkpw(plain_password.encode("utf-8"), hashed_password.encode("utf-8"))
+
+
+def _timed(func, *args):
+    # Runs on the worker thread, so queue wait is not counted
+    with BCRYPT_SECONDS.time(func.__name__):
+        return func(*args)
+
+
+class PasswordHasher:
+    """Runs bcrypt on a dedicated thread pool so it never blocks the event loop.
+
+    At most ``workers`` hashes run at once and at most ``max_queue`` more may
+    wait for a slot; anything beyond that is rejected with a 503 so a login
+    storm sheds load instead of stalling public traffic. bcrypt releases the
+    GIL while hashing, so threads give real parallelism here.
+    """
+
+    def __init__(self, workers: int = 2, max_queue: int = 16):
+        self.workers = workers
+        self.max_queue = max_queue
+        self._executor: ThreadPoolExecutor | None = None
+        self._pending = 0
+        self.rejected = 0
+
+    async def _run(self, func, *args):
+        if self._pending >= self.workers + self.max_queue:
+            self.rejected += 1
+            raise HTTPException(status_code=503, detail="Server busy, please retry shortly")
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="bcrypt")
+        self._pending += 1
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._executor, _timed, func, *args)
+        finally:
+            self._pending -= 1
+
+    async def hash(self, password: str) -> str:
+        return await self._run(hash_password, password)
+
+    async def verify(self, plain_password: str, hashed_password: str) -> bool:
+        return await self._run(verify_password, plain_password, hashed_password)
+
+    def stats(self) -> dict:
+        return {
+            "workers": self.workers,
+            "max_queue": self.max_queue,
+            "pending": self._pending,
+            "rejected": self.rejected,
+        }
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+
+password_hasher = PasswordHasher(
+    workers=int(os.getenv("BCRYPT_WORKERS", "2")),
+    max_queue=int(os.getenv("BCRYPT_MAX_QUEUE", "16")),
+)
@@ -0,0 +1,159 @@
+import asyncio
+import hashlib
+import io
+import multiprocessing
+import os
+import re
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from fastapi import HTTPException, UploadFile
+
+IMAGE_CACHE_DIR = os.getenv("IMAGE_CACHE_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), "image_cache"))
+MAX_IMAGE_BYTES = int(os.getenv("MAX_IMAGE_BYTES", str(25 * 1024 * 1024)))
+UPLOAD_CHUNK_SIZE = 256 * 1024
+ALLOWED_CONTENT_TYPES = {"image/jpeg", "image/png", "image/webp"}
+
+# Variant name -> target width; images are never upscaled
+VARIANT_WIDTHS = {"thumb": 400, "small": 800, "medium": 1280, "large": 1920}
+# Output formats as (Pillow format, file extension, save options)
+OUTPUT_FORMATS = (
+    ("WEBP", "webp", {"quality": 80, "method": 4}),
+    ("JPEG", "jpg", {"quality": 82, "optimize": True, "progressive": True}),
+)
+MEDIA_TYPES = {"webp": "image/webp", "jpg": "image/jpeg"}
+KEY_RE = re.compile(r"^[0-9a-f]{64}\.(webp|jpg)$")
+
+
+def _store(cache_dir: str, data: bytes, extension: str) -> str:
+    """Write ``data`` under its SHA-256 and return the cache key."""
+    key = f"{hashlib.sha256(data).hexdigest()}.{extension}"
+    directory = os.path.join(cache_dir, key[:2])
+    path = os.path.join(directory, key)
+    if not os.path.exists(path):
+        os.makedirs(directory, exist_ok=True)
+        # Write then rename so a concurrent reader never sees a partial file
+        fd, temp_path = tempfile.mkstemp(dir=directory)
+        with os.fdopen(fd, "wb") as temp_file:
+            temp_file.write(data)
+        os.replace(temp_path, path)
+    return key
+
+
+def render_variants(data: bytes, cache_dir: str) -> dict:
+    """Decode one upload and write every variant to the cache (runs in a worker process)."""
+    from PIL import Image, ImageOps
+
+    with Image.open(io.BytesIO(data)) as source:
+        # JPEGs can be decoded at 1/2, 1/4 or 1/8 scale straight away
+        largest = max(VARIANT_WIDTHS.values())
+        source.draft("RGB", (largest, largest))
+        image = ImageOps.exif_transpose(source).convert("RGB")
+    width, height = image.size
+
+    variants = {}
+    for name, target_width in VARIANT_WIDTHS.items():
+        if target_width < width:
+            resized = image.resize((target_width, max(1, round(height * target_width / width))), Image.LANCZOS)
+        else:
+            resized = image
+        variant = {"width": resized.width, "height": resized.height}
+        for image_format, extension, options in OUTPUT_FORMATS:
+            buffer = io.BytesIO()
+            resized.save(buffer, image_format, **options)
+            variant[extension] = _store(cache_dir, buffer.getvalue(), extension)
+        variants[name] = variant
+    return {"width": width, "height": height, "variants": variants}
+
+
+async def read_image_upload(upload: UploadFile) -> bytes:
+    if upload.content_type not in ALLOWED_CONTENT_TYPES:
+        raise HTTPException(status_code=400, detail="Image must be a JPEG, PNG or WebP file")
+    chunks = []
+    size = 0
+    while chunk := await upload.read(UPLOAD_CHUNK_SIZE):
+        size += len(chunk)
+        if size > MAX_IMAGE_BYTES:
+            raise HTTPException(status_code=413, detail="Image is too large")
+        chunks.append(chunk)
+    return b"".join(chunks)
+
+
+class ImagePipeline:
+    """Generates resized WebP/JPEG variants of gallery uploads on a process pool.
+
+    Resizing and encoding are CPU bound and hold the GIL, so they run in
+    ``workers`` separate processes. Variants are stored content-addressed in
+    ``cache_dir``; identical output is written once and the files never
+    change, which lets them be served as immutable. Uploads beyond
+    ``workers + max_queue`` in progress are rejected with a 503.
+    """
+
+    def __init__(self, cache_dir: str = IMAGE_CACHE_DIR, workers: int = 2, max_queue: int = 8):
+        self.cache_dir = cache_dir
+        self.workers = workers
+        self.max_queue = max_queue
+        self._executor: ProcessPoolExecutor | None = None
+        self._pending = 0
+        self.processed = 0
+        self.rejected = 0
+
+    async def process(self, data: bytes) -> dict:
+        # Pillow is only loaded once the first image arrives
+        from PIL import Image, UnidentifiedImageError
+
+        if self._pending >= self.workers + self.max_queue:
+            self.rejected += 1
+            raise HTTPException(status_code=503, detail="Server busy, please retry shortly")
+        if self._executor is None:
+            # spawn, not fork: the parent holds Mongo client threads and sockets
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers, mp_context=multiprocessing.get_context("spawn"))
+        self._pending += 1
+        try:
+            loop = asyncio.get_running_loop()
+            manifest = await loop.run_in_executor(self._executor, render_variants, data, self.cache_dir)
+        except (UnidentifiedImageError, Image.DecompressionBombError, OSError):
+            raise HTTPException(status_code=400, detail="Could not read image")
+        except BrokenProcessPool:
+            # A worker died (e.g. killed for memory); start a fresh pool next time
+            self._executor = None
+            raise HTTPException(status_code=503, detail="Image processing unavailable, please retry")
+        finally:
+            self._pending -= 1
+        self.processed += 1
+        return manifest
+
+    def path_for(self, key: str) -> str | None:
+        """Return the on-disk path of a cached variant, or ``None`` for unknown keys."""
+        if not KEY_RE.match(key):
+            return None
+        path = os.path.join(self.cache_dir, key[:2], key)
+        return path if os.path.isfile(path) else None
+
+    def has_variants(self, manifest: dict) -> bool:
+        return all(
+            self.path_for(variant[extension]) is not None
+            for variant in manifest["variants"].values()
+            for _, extension, _ in OUTPUT_FORMATS
+        )
+
+    def stats(self) -> dict:
+        return {
+            "workers": self.workers,
+            "max_queue": self.max_queue,
+            "pending": self._pending,
+            "processed": self.processed,
+            "rejected": self.rejected,
+        }
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+image_pipeline = ImagePipeline(
+    workers=int(os.getenv("IMAGE_WORKERS", str(max(1, (os.cpu_count() or 2) - 1)))),
+    max_queue=int(os.getenv("IMAGE_MAX_QUEUE", "8")),
+)
@@ -0,0 +1,160 @@
+import asyncio
+import logging
+import os
+import uuid
+from pymongo import CursorType
+from pymongo.errors import CollectionInvalid
+
+logger = logging.getLogger(__name__)
+
+
+def _dispatch(handler, topic: str, payload: dict):
+    # A failing handler must not stop delivery of later messages
+    try:
+        handler(topic, payload)
+    except Exception as e:
+        logger.error(f"Cache event handler failed for {topic}: {str(e)}")
+
+
+class MongoInvalidationChannel:
+    """Broadcasts cache, search and feed changes between worker processes.
+
+    Messages go into a small capped collection that every worker tails, so a
+    write handled by one worker reaches the in-memory state of all the
+    others. Each worker skips its own messages (it applied them locally
+    already). ``handler(topic, payload)`` is called for every message from
+    another worker; when the tail is lost and re-established it is called
+    with the ``"resync"`` topic so the worker can drop whatever it may have
+    missed.
+    """
+
+    def __init__(self, database, handler, collection_name: str = "cache_events",
+                 size_bytes: int = 1024 * 1024, max_documents: int = 1000, retry_interval: float = 1.0):
+        self.database = database
+        self.collection = database[collection_name]
+        self.handler = handler
+        self.size_bytes = size_bytes
+        self.max_documents = max_documents
+        self.retry_interval = retry_interval
+        self.origin = f"{os.getpid()}-{uuid.uuid4().hex[:8]}"
+        self.published = 0
+        self.received = 0
+        self.resyncs = 0
+        self._outgoing: asyncio.Queue = asyncio.Queue()
+        self._tasks: list[asyncio.Task] = []
+
+    def publish(self, topic: str, payload: dict):
+        """Queue a message for the other workers; never blocks the caller."""
+        self._outgoing.put_nowait({"origin": self.origin, "topic": topic, "payload": payload})
+
+    async def start(self):
+        try:
+            await self.database.create_collection(
+                self.collection.name, capped=True, size=self.size_bytes, max=self.max_documents)
+        except CollectionInvalid:
+            pass  # created by another worker
+        self._tasks = [asyncio.create_task(self._send()), asyncio.create_task(self._tail())]
+
+    async def stop(self):
+        for task in self._tasks:
+            task.cancel()
+        for task in self._tasks:
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+        self._tasks = []
+
+    async def _send(self):
+        while True:
+            batch = [await self._outgoing.get()]
+            while not self._outgoing.empty():
+                batch.append(self._outgoing.get_nowait())
+            try:
+                await self.collection.insert_many(batch)
+                self.published += len(batch)
+            except Exception as e:
+                logger.error(f"Could not publish {len(batch)} cache event(s): {str(e)}")
+
+    async def _tail(self):
+        first = True
+        while True:
+            try:
+                # Everything after our own marker in natural order is new
+                marker = (await self.collection.insert_one({"origin": self.origin, "topic": "marker"})).inserted_id
+                if not first:
+                    self.resyncs += 1
+                    _dispatch(self.handler, "resync", {})
+                first = False
+                cursor = self.collection.find(cursor_type=CursorType.TAILABLE_AWAIT)
+                past_marker = False
+                while cursor.alive:
+                    async for message in cursor:
+                        if not past_marker:
+                            past_marker = message["_id"] == marker
+                            continue
+                        if message["origin"] != self.origin and message["topic"] != "marker":
+                            self.received += 1
+                            _dispatch(self.handler, message["topic"], message.get("payload", {}))
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Cache event tail failed: {str(e)}")
+            await asyncio.sleep(self.retry_interval)
+
+    def stats(self) -> dict:
+        return {
+            "channel": "mongo",
+            "origin": self.origin,
+            "published": self.published,
+            "received": self.received,
+            "resyncs": self.resyncs,
+            "pending": self._outgoing.qsize(),
+        }
+
+
+class LocalInvalidationChannel:
+    """In-process stand-in for ``MongoInvalidationChannel``.
+
+    Delivers each message to every other started channel in the same
+    process, which is enough for a single worker, and lets tests run several
+    app instances side by side without a replica set or capped collection.
+    """
+
+    _channels: set = set()
+
+    def __init__(self, handler):
+        self.handler = handler
+        self.origin = f"{os.getpid()}-{uuid.uuid4().hex[:8]}"
+        self.published = 0
+        self.received = 0
+
+    def publish(self, topic: str, payload: dict):
+        self.published += 1
+        for channel in list(LocalInvalidationChannel._channels):
+            if channel is not self:
+                channel.received += 1
+                _dispatch(channel.handler, topic, payload)
+
+    async def start(self):
+        LocalInvalidationChannel._channels.add(self)
+
+    async def stop(self):
+        LocalInvalidationChannel._channels.discard(self)
+
+    def stats(self) -> dict:
+        return {
+            "channel": "local",
+            "origin": self.origin,
+            "published": self.published,
+            "received": self.received,
+        }
+
+
+def create_channel(kind: str, database, handler):
+    """Build the channel named by ``kind`` ("mongo" or "local")."""
+    if kind == "mongo":
+        return MongoInvalidationChannel(database, handler)
+    if kind == "local":
+        return LocalInvalidationChannel(handler)
+    raise ValueError(f"Unknown cache channel: {kind}")
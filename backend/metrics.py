@@ -0,0 +1,201 @@
+import bisect
+import threading
+import time
+from fastapi.routing import APIRoute
+from pymongo import monitoring
+
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(names, values, extra: str = "") -> str:
+    parts = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, help_text: str, labels=()):
+        self.name = name
+        self.help_text = help_text
+        self.labels = tuple(labels)
+        self._lock = threading.Lock()
+
+    def header(self) -> list[str]:
+        return [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} {self.kind}"]
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, name, help_text, labels=()):
+        super().__init__(name, help_text, labels)
+        self._values: dict[tuple, float] = {}
+
+    def inc(self, *label_values, amount: float = 1):
+        with self._lock:
+            self._values[label_values] = self._values.get(label_values, 0) + amount
+
+    def render(self) -> list[str]:
+        # Snapshot under the lock: other threads may add label values mid-scrape
+        with self._lock:
+            items = list(self._values.items())
+        return self.header() + [
+            f"{self.name}{_format_labels(self.labels, key)} {value}" for key, value in items
+        ]
+
+
+class Gauge(Counter):
+    kind = "gauge"
+
+    def dec(self, *label_values, amount: float = 1):
+        self.inc(*label_values, amount=-amount)
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name, help_text, labels=(), buckets=DEFAULT_BUCKETS):
+        super().__init__(name, help_text, labels)
+        self.buckets = tuple(buckets)
+        # label values -> [per-bucket counts (+Inf last), sum]
+        self._values: dict[tuple, list] = {}
+
+    def observe(self, value: float, *label_values):
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            entry = self._values.get(label_values)
+            if entry is None:
+                entry = self._values[label_values] = [[0] * (len(self.buckets) + 1), 0.0]
+            entry[0][index] += 1
+            entry[1] += value
+
+    def time(self, *label_values):
+        return _Timer(self, label_values)
+
+    def render(self) -> list[str]:
+        lines = self.header()
+        # Copy the counts too: observe() mutates them in place from other threads
+        with self._lock:
+            items = [(key, list(counts), total) for key, (counts, total) in self._values.items()]
+        for key, counts, total in items:
+            cumulative = 0
+            for bound, count in zip((*self.buckets, "+Inf"), counts):
+                cumulative += count
+                bucket_label = 'le="' + str(bound) + '"'
+                lines.append(f"{self.name}_bucket{_format_labels(self.labels, key, bucket_label)} {cumulative}")
+            lines.append(f"{self.name}_sum{_format_labels(self.labels, key)} {total}")
+            lines.append(f"{self.name}_count{_format_labels(self.labels, key)} {cumulative}")
+        return lines
+
+
+class _Timer:
+    __slots__ = ("histogram", "label_values", "start")
+
+    def __init__(self, histogram, label_values):
+        self.histogram = histogram
+        self.label_values = label_values
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.histogram.observe(time.perf_counter() - self.start, *self.label_values)
+
+
+HTTP_REQUEST_SECONDS = Histogram(
+    "http_request_duration_seconds", "HTTP request latency by route", ("method", "route", "status"))
+HTTP_IN_FLIGHT = Gauge("http_requests_in_flight", "HTTP requests currently being served", ("method", "route"))
+HTTP_ERRORS = Counter("http_request_errors_total", "HTTP requests answered with a 5xx status", ("method", "route"))
+MONGO_COMMAND_SECONDS = Histogram(
+    "mongo_command_duration_seconds", "MongoDB command latency", ("collection", "command", "outcome"))
+SMTP_SEND_SECONDS = Histogram("smtp_send_duration_seconds", "Time to send one email over SMTP", ("outcome",))
+BCRYPT_SECONDS = Histogram("bcrypt_duration_seconds", "Time spent in bcrypt hash/verify", ("operation",))
+
+REGISTRY = [
+    HTTP_REQUEST_SECONDS, HTTP_IN_FLIGHT, HTTP_ERRORS,
+    MONGO_COMMAND_SECONDS, SMTP_SEND_SECONDS, BCRYPT_SECONDS,
+]
+
+
+def render_metrics(extra=()) -> str:
+    lines = []
+    for metric in (*REGISTRY, *extra):
+        lines.extend(metric.render())
+    return "\n".join(lines) + "\n"
+
+
+class InstrumentedRoute(APIRoute):
+    """APIRoute that tracks how many requests are inside its handler."""
+
+    def get_route_handler(self):
+        handler = super().get_route_handler()
+        route_path = self.path
+
+        async def instrumented_handler(request):
+            HTTP_IN_FLIGHT.inc(request.method, route_path)
+            try:
+                return await handler(request)
+            finally:
+                HTTP_IN_FLIGHT.dec(request.method, route_path)
+
+        return instrumented_handler
+
+
+class MetricsMiddleware:
+    """ASGI middleware recording latency and 5xx counts per route template."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        method = scope["method"]
+        status = 500
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            # FastAPI stores the matched route in the scope during routing
+            route = scope.get("route")
+            route_path = route.path if route is not None else "unmatched"
+            HTTP_REQUEST_SECONDS.observe(time.perf_counter() - start, method, route_path, status)
+            if status >= 500:
+                HTTP_ERRORS.inc(method, route_path)
+
+
+class MongoCommandTimer(monitoring.CommandListener):
+    """pymongo listener recording command latency per collection and command."""
+
+    def __init__(self):
+        self._collections: dict[int, str] = {}
+
+    def started(self, event):
+        collection = event.command.get(event.command_name)
+        self._collections[event.request_id] = collection if isinstance(collection, str) else ""
+
+    def _finish(self, event, outcome: str):
+        collection = self._collections.pop(event.request_id, "")
+        MONGO_COMMAND_SECONDS.observe(event.duration_micros / 1e6, collection, event.command_name, outcome)
+
+    def succeeded(self, event):
+        self._finish(event, "success")
+
+    def failed(self, event):
+        self._finish(event, "failure")
@@ -0,0 +1,189 @@
+import asyncio
+import datetime
+import logging
+import time
+from email.mime.multipart import MIMEMultipart
+from email.mime.text import MIMEText
+from email.utils import formataddr
+from pymongo import ReturnDocument
+from metrics import SMTP_SEND_SECONDS
+
+logger = logging.getLogger(__name__)
+
+
+class EmailOutbox:
+    """Persistent email queue drained by a background worker.
+
+    Messages are stored in ``collection`` and sent in batches over a single
+    long-lived SMTP connection. Failed sends are retried with exponential
+    backoff; after a successful send the ``on_sent`` callback runs (used to
+    mark the inquiry solved only once delivery is confirmed). A claimed
+    message is leased for ``lease_seconds``; only when the lease runs out
+    (its worker crashed mid-send) may another worker claim it again. ``mail_conf``
+    is a callable returning the mail settings; it and the SMTP client are
+    only loaded once there is something to send.
+    """
+
+    def __init__(self, collection, mail_conf, on_sent=None, batch_size: int = 20,
+                 max_attempts: int = 5, retry_base: float = 30.0, poll_interval: float = 10.0,
+                 lease_seconds: float = 300.0):
+        self.collection = collection
+        self._load_mail_conf = mail_conf
+        self._mail_conf = None
+        self.on_sent = on_sent
+        self.batch_size = batch_size
+        self.max_attempts = max_attempts
+        self.retry_base = retry_base
+        self.poll_interval = poll_interval
+        self.lease_seconds = lease_seconds
+        self._smtp = None  # aiosmtplib.SMTP, imported on first send
+        self._wakeup = asyncio.Event()
+        self._task: asyncio.Task | None = None
+
+    async def enqueue(self, recipient: str, subject: str, html_body: str, plain_text_body: str,
+                      inquiry_id: str | None = None) -> str:
+        now = datetime.datetime.utcnow()
+        result = await self.collection.insert_one({
+            "inquiry_id": inquiry_id,
+            "recipient": recipient,
+            "subject": subject,
+            "html_body": html_body,
+            "plain_text_body": plain_text_body,
+            "status": "pending",
+            "attempts": 0,
+            "next_attempt_at": now,
+            "created_at": now,
+        })
+        self._wakeup.set()
+        return str(result.inserted_id)
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self._disconnect()
+
+    async def _run(self):
+        while True:
+            try:
+                sent = await self.process_batch()
+            except Exception as e:
+                logger.error(f"Email outbox batch failed: {str(e)}")
+                sent = 0
+            if sent < self.batch_size:
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=self.poll_interval)
+                except asyncio.TimeoutError:
+                    pass
+
+    async def _claim(self):
+        now = datetime.datetime.utcnow()
+        return await self.collection.find_one_and_update(
+            {"$or": [
+                {"status": "pending", "next_attempt_at": {"$lte": now}},
+                # Left "sending" by a worker that died; rows without a lease predate leases
+                {"status": "sending", "lease_expires_at": {"$not": {"$gt": now}}},
+            ]},
+            {"$set": {
+                "status": "sending",
+                "claimed_at": now,
+                "lease_expires_at": now + datetime.timedelta(seconds=self.lease_seconds),
+            }},
+            sort=[("next_attempt_at", 1)],
+            return_document=ReturnDocument.AFTER,
+        )
+
+    async def process_batch(self) -> int:
+        """Send up to ``batch_size`` due messages; returns how many were claimed."""
+        claimed = 0
+        while claimed < self.batch_size:
+            message = await self._claim()
+            if message is None:
+                break
+            claimed += 1
+            try:
+                await self._send(message)
+            except Exception as e:
+                await self._disconnect()
+                await self._mark_failed(message, e)
+                continue
+            await self.collection.update_one(
+                {"_id": message["_id"]},
+                {"$set": {"status": "sent", "sent_at": datetime.datetime.utcnow()}},
+            )
+            if self.on_sent is not None:
+                await self.on_sent(message)
+        return claimed
+
+    async def _mark_failed(self, message: dict, error: Exception):
+        attempts = message.get("attempts", 0) + 1
+        update = {"attempts": attempts, "last_error": str(error)}
+        if attempts >= self.max_attempts:
+            update["status"] = "failed"
+            logger.error(f"Giving up on email {message['_id']} after {attempts} attempts: {str(error)}")
+        else:
+            delay = self.retry_base * 2 ** (attempts - 1)
+            update["status"] = "pending"
+            update["next_attempt_at"] = datetime.datetime.utcnow() + datetime.timedelta(seconds=delay)
+        await self.collection.update_one({"_id": message["_id"]}, {"$set": update})
+
+    @property
+    def mail_conf(self):
+        if self._mail_conf is None:
+            self._mail_conf = self._load_mail_conf()
+        return self._mail_conf
+
+    async def _connection(self):
+        import aiosmtplib
+
+        if self._smtp is None or not self._smtp.is_connected:
+            conf = self.mail_conf
+            smtp = aiosmtplib.SMTP(
+                hostname=conf.MAIL_SERVER,
+                port=conf.MAIL_PORT,
+                use_tls=conf.MAIL_SSL_TLS,
+                start_tls=conf.MAIL_STARTTLS,
+                timeout=conf.TIMEOUT,
+            )
+            await smtp.connect()
+            if conf.USE_CREDENTIALS:
+                await smtp.login(conf.MAIL_USERNAME, conf.MAIL_PASSWORD.get_secret_value())
+            self._smtp = smtp
+        return self._smtp
+
+    async def _disconnect(self):
+        if self._smtp is not None:
+            import aiosmtplib
+
+            try:
+                if self._smtp.is_connected:
+                    await self._smtp.quit()
+            except aiosmtplib.SMTPException:
+                self._smtp.close()
+            self._smtp = None
+
+    async def _send(self, message: dict):
+        conf = self.mail_conf
+        mime = MIMEMultipart("alternative")
+        mime["Subject"] = message["subject"]
+        mime["From"] = formataddr((conf.MAIL_FROM_NAME, conf.MAIL_FROM)) if conf.MAIL_FROM_NAME else conf.MAIL_FROM
+        mime["To"] = message["recipient"]
+        mime.attach(MIMEText(message["plain_text_body"], "plain"))
+        mime.attach(MIMEText(message["html_body"], "html"))
+        start = time.perf_counter()
+        outcome = "failure"
+        try:
+            smtp = await self._connection()
+            await smtp.send_message(mime)
+            outcome = "success"
+        finally:
+            SMTP_SEND_SECONDS.observe(time.perf_counter() - start, outcome)
@@ -0,0 +1,59 @@
+import datetime
+from bson import ObjectId
+from fastapi import HTTPException
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+
+
+def parse_fields(fields: str | None, allowed) -> dict | None:
+    """Turn a ``fields=a,b`` query parameter into a Mongo projection."""
+    if not fields:
+        return None
+    requested = [field.strip() for field in fields.split(",") if field.strip()]
+    unknown = [field for field in requested if field not in allowed]
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown fields: {', '.join(unknown)}")
+    return {field: 1 for field in requested}
+
+
+def parse_cursor(cursor: str | None) -> ObjectId | None:
+    if not cursor:
+        return None
+    if not ObjectId.is_valid(cursor):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return ObjectId(cursor)
+
+
+def parse_date(value: str | None, name: str) -> datetime.datetime | None:
+    if not value:
+        return None
+    try:
+        return datetime.datetime.fromisoformat(value)
+    except ValueError:
+        raise HTTPException(status_code=400, detail=f"Invalid {name} date")
+
+
+async def fetch_page(collection, query: dict, limit: int, cursor: str | None = None,
+                     projection: dict | None = None, cursor_field: str = "_id"):
+    """Fetch one page newest-first using the ``_id`` as the keyset.
+
+    ``projection`` is a ``$project`` stage body, so it may rename or convert
+    fields server-side (e.g. ``{"id": {"$toString": "$_id"}}``); ``cursor_field``
+    names the output field that holds the document id in that case.
+    Returns ``(documents, next_cursor)``; ``next_cursor`` is ``None`` on the
+    last page. One extra document is read to know whether another page exists.
+    """
+    limit = max(1, min(limit, MAX_PAGE_SIZE))
+    after = parse_cursor(cursor)
+    if after is not None:
+        query = {**query, "_id": {"$lt": after}}
+    pipeline = [{"$match": query}, {"$sort": {"_id": -1}}, {"$limit": limit + 1}]
+    if projection:
+        pipeline.append({"$project": projection})
+    documents = await collection.aggregate(pipeline).to_list(length=limit + 1)
+    next_cursor = None
+    if len(documents) > limit:
+        documents = documents[:limit]
+        next_cursor = str(documents[-1][cursor_field])
+    return documents, next_cursor
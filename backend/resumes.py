@@ -0,0 +1,319 @@
+import asyncio
+import datetime
+import logging
+import os
+import re
+from urllib.parse import quote
+from bson import ObjectId
+from fastapi import HTTPException, Request
+from fastapi.responses import StreamingResponse
+from gridfs.errors import NoFile
+from multipart.multipart import MultipartParseError, MultipartParser, parse_options_header
+
+logger = logging.getLogger(__name__)
+
+RESUME_CHUNK_SIZE = 256 * 1024
+MAX_RESUME_BYTES = int(os.getenv("MAX_RESUME_BYTES", str(10 * 1024 * 1024)))
+# Room for the multipart boundaries and part headers around the file itself
+MULTIPART_OVERHEAD_BYTES = 16 * 1024
+ALLOWED_CONTENT_TYPES = {
+    "application/pdf",
+    "application/msword",
+    "application/vnd.openxmlformats-officedocument.wordprocessingml.document",
+}
+
+RANGE_RE = re.compile(r"^bytes=(\d*)-(\d*)$")
+UNSAFE_FILENAME_RE = re.compile(r'[^\x20-\x7e]|["\\]')
+
+
+class _ResumeUpload:
+    """Collects the parser's callbacks for the ``file`` part of a form.
+
+    The parser is synchronous and GridFS writes are not, so the callbacks
+    only queue work; ``flush`` performs it after each chunk of the body.
+    """
+
+    def __init__(self, bucket):
+        self.bucket = bucket
+        self.file_id: str | None = None
+        self.size = 0
+        self._grid_in = None
+        self._headers: dict[bytes, bytes] = {}
+        self._field = b""
+        self._value = b""
+        self._in_file = False
+        self._pending: list[tuple] = []
+
+    def callbacks(self) -> dict:
+        return {
+            "on_part_begin": self._part_begin,
+            "on_header_field": self._header_field,
+            "on_header_value": self._header_value,
+            "on_header_end": self._header_end,
+            "on_headers_finished": self._headers_finished,
+            "on_part_data": self._part_data,
+            "on_part_end": self._part_end,
+        }
+
+    def _part_begin(self):
+        self._headers = {}
+        self._in_file = False
+
+    def _header_field(self, data: bytes, start: int, end: int):
+        self._field += data[start:end]
+
+    def _header_value(self, data: bytes, start: int, end: int):
+        self._value += data[start:end]
+
+    def _header_end(self):
+        self._headers[self._field.lower()] = self._value
+        self._field = b""
+        self._value = b""
+
+    def _headers_finished(self):
+        _, options = parse_options_header(self._headers.get(b"content-disposition", b""))
+        if options.get(b"name") != b"file":
+            return
+        self._in_file = True
+        content_type = self._headers.get(b"content-type", b"").decode("latin-1").strip()
+        filename = options.get(b"filename", b"").decode("utf-8", "replace") or "resume"
+        self._pending.append(("open", filename, content_type))
+
+    def _part_data(self, data: bytes, start: int, end: int):
+        if self._in_file:
+            self._pending.append(("data", bytes(data[start:end])))
+
+    def _part_end(self):
+        if self._in_file:
+            self._in_file = False
+            self._pending.append(("close",))
+
+    async def flush(self):
+        pending, self._pending = self._pending, []
+        for action, *args in pending:
+            if action == "open":
+                filename, content_type = args
+                if self.file_id is not None or self._grid_in is not None:
+                    raise HTTPException(status_code=400, detail="Send a single resume file")
+                if content_type not in ALLOWED_CONTENT_TYPES:
+                    raise HTTPException(status_code=400, detail="Resume must be a PDF or Word document")
+                self._grid_in = self.bucket.open_upload_stream(
+                    filename,
+                    chunk_size_bytes=RESUME_CHUNK_SIZE,
+                    metadata={"contentType": content_type},
+                )
+            elif action == "data":
+                self.size += len(args[0])
+                if self.size > MAX_RESUME_BYTES:
+                    raise HTTPException(status_code=413, detail="Resume is too large")
+                await self._grid_in.write(args[0])
+            else:
+                await self._grid_in.close()
+                self.file_id = str(self._grid_in._id)
+                self._grid_in = None
+
+    async def abort(self):
+        if self._grid_in is not None:
+            await self._grid_in.abort()
+            self._grid_in = None
+        if self.file_id is not None:
+            await self.bucket.delete(ObjectId(self.file_id))
+            self.file_id = None
+
+
+async def store_resume(bucket, request: Request) -> str:
+    """Stream the ``file`` field of a multipart request into GridFS and return its file ID.
+
+    Requests whose declared ``Content-Length`` cannot fit a resume are rejected
+    before any of the body is read. The body is then parsed as it arrives and
+    each piece of the file is written straight to GridFS, so an upload is
+    never buffered in memory or spooled to a temporary file.
+    """
+    content_length = request.headers.get("content-length")
+    if content_length is not None:
+        if not content_length.isdigit():
+            raise HTTPException(status_code=400, detail="Invalid Content-Length")
+        if int(content_length) > MAX_RESUME_BYTES + MULTIPART_OVERHEAD_BYTES:
+            raise HTTPException(status_code=413, detail="Resume is too large")
+
+    content_type, options = parse_options_header(request.headers.get("content-type", ""))
+    boundary = options.get(b"boundary")
+    if content_type != b"multipart/form-data" or not boundary:
+        raise HTTPException(status_code=400, detail="Expected a multipart/form-data upload")
+
+    upload = _ResumeUpload(bucket)
+    parser = MultipartParser(boundary, upload.callbacks())
+    try:
+        try:
+            async for chunk in request.stream():
+                parser.write(chunk)
+                await upload.flush()
+            parser.finalize()
+            await upload.flush()
+        except MultipartParseError:
+            raise HTTPException(status_code=400, detail="Malformed multipart body")
+        if upload._grid_in is not None:
+            raise HTTPException(status_code=400, detail="Incomplete resume upload")
+    except BaseException:
+        await upload.abort()
+        raise
+    if upload.file_id is None:
+        raise HTTPException(status_code=400, detail="Missing resume file")
+    return upload.file_id
+
+
+class ResumeSweeper:
+    """Deletes uploaded resumes that no application ever referenced.
+
+    Resumes are uploaded before the application that points at them, so an
+    abandoned form leaves an orphan in GridFS. Every ``interval`` seconds,
+    files older than ``max_age_hours`` are checked in batches against the
+    ``resume`` field of every collection in ``applications`` (hot and
+    archived), and the unreferenced ones are deleted.
+    """
+
+    def __init__(self, bucket, files, applications: list, max_age_hours: float = 24,
+                 batch_size: int = 500, interval: float = 3600.0):
+        self.bucket = bucket
+        self.files = files
+        self.applications = applications
+        self.max_age_hours = max_age_hours
+        self.batch_size = batch_size
+        self.interval = interval
+        self.deleted = 0
+        self.last_run_at: datetime.datetime | None = None
+        self._task: asyncio.Task | None = None
+
+    async def _referenced(self, ids: list[str]) -> set[str]:
+        referenced = set()
+        for collection in self.applications:
+            referenced.update(await collection.distinct("resume", {"resume": {"$in": ids}}))
+        return referenced
+
+    async def run_once(self) -> int:
+        cutoff = datetime.datetime.utcnow() - datetime.timedelta(hours=self.max_age_hours)
+        deleted = 0
+        last_id = None
+        while True:
+            query = {"uploadDate": {"$lt": cutoff}}
+            if last_id is not None:
+                query["_id"] = {"$gt": last_id}
+            files = await self.files.find(query, {"_id": 1}).sort("_id", 1).limit(self.batch_size).to_list(
+                length=self.batch_size)
+            if not files:
+                break
+            last_id = files[-1]["_id"]
+            ids = [str(file["_id"]) for file in files]
+            referenced = await self._referenced(ids)
+            for file_id in ids:
+                if file_id not in referenced:
+                    try:
+                        await self.bucket.delete(ObjectId(file_id))
+                        deleted += 1
+                    except NoFile:
+                        pass
+        self.deleted += deleted
+        self.last_run_at = datetime.datetime.utcnow()
+        return deleted
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self):
+        while True:
+            try:
+                await self.run_once()
+            except Exception as e:
+                logger.error(f"Resume sweep failed: {str(e)}")
+            await asyncio.sleep(self.interval)
+
+    def stats(self) -> dict:
+        return {
+            "max_age_hours": self.max_age_hours,
+            "interval": self.interval,
+            "deleted": self.deleted,
+            "last_run_at": self.last_run_at.isoformat() if self.last_run_at else None,
+        }
+
+
+def parse_range(header: str | None, length: int) -> tuple[int, int] | None:
+    """Parse a single ``bytes=`` range into inclusive ``(start, end)`` offsets."""
+    if not header:
+        return None
+    match = RANGE_RE.match(header.strip())
+    if not match or match.groups() == ("", ""):
+        raise HTTPException(status_code=416, detail="Invalid range",
+                            headers={"Content-Range": f"bytes */{length}"})
+    first, last = match.groups()
+    if first:
+        start = int(first)
+        end = min(int(last), length - 1) if last else length - 1
+    else:
+        start = max(0, length - int(last))
+        end = length - 1
+    if start > end or start >= length:
+        raise HTTPException(status_code=416, detail="Range not satisfiable",
+                            headers={"Content-Range": f"bytes */{length}"})
+    return start, end
+
+
+def content_disposition(filename: str) -> str:
+    """``attachment`` header value that survives any uploaded filename.
+
+    Headers go out as latin-1, so the plain ``filename`` gets an ASCII
+    fallback and the exact name travels UTF-8 percent-encoded in
+    ``filename*`` (RFC 6266 / RFC 5987), which browsers prefer.
+    """
+    fallback = UNSAFE_FILENAME_RE.sub("_", filename)
+    if fallback == filename:
+        return f'attachment; filename="{filename}"'
+    return f"attachment; filename=\"{fallback}\"; filename*=UTF-8''{quote(filename, safe='')}"
+
+
+async def _read_range(grid_out, start: int, remaining: int):
+    grid_out.seek(start)
+    while remaining > 0:
+        chunk = await grid_out.read(min(RESUME_CHUNK_SIZE, remaining))
+        if not chunk:
+            break
+        remaining -= len(chunk)
+        yield chunk
+
+
+async def resume_response(bucket, file_id: str, range_header: str | None) -> StreamingResponse:
+    """Stream a stored resume, honouring a single HTTP ``Range`` request."""
+    if not ObjectId.is_valid(file_id):
+        raise HTTPException(status_code=400, detail="Invalid resume ID")
+    try:
+        grid_out = await bucket.open_download_stream(ObjectId(file_id))
+    except NoFile:
+        raise HTTPException(status_code=404, detail="Resume not found")
+
+    length = grid_out.length
+    filename = grid_out.filename or "resume"
+    byte_range = parse_range(range_header, length)
+    start, end = byte_range or (0, length - 1)
+    headers = {
+        "Accept-Ranges": "bytes",
+        "Content-Length": str(end - start + 1),
+        "Content-Disposition": content_disposition(filename),
+    }
+    if byte_range:
+        headers["Content-Range"] = f"bytes {start}-{end}/{length}"
+    metadata = grid_out.metadata or {}
+    return StreamingResponse(
+        _read_range(grid_out, start, end - start + 1),
+        status_code=206 if byte_range else 200,
+        media_type=metadata.get("contentType", "application/octet-stream"),
+        headers=headers,
+    )
@@ -0,0 +1,119 @@
+import bisect
+import math
+import re
+from collections import defaultdict
+
+TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+
+def tokenize(text: str) -> list[str]:
+    return TOKEN_RE.findall(text.lower())
+
+
+class SearchIndex:
+    """Incrementally maintained in-memory inverted index over a few text fields.
+
+    ``fields`` maps a document field to its weight. Every query token may match
+    an indexed term exactly or as a prefix (exact matches score higher), all
+    tokens must match, and results are ranked by a weighted TF-IDF score.
+
+    ``build`` scans the collection into a fresh index and swaps it in at the
+    end, so searches keep using the previous contents meanwhile; changes made
+    during the scan are replayed onto the fresh index before the swap.
+    ``ready`` turns true once the first build has completed.
+    """
+
+    PREFIX_WEIGHT = 0.5
+
+    def __init__(self, fields: dict[str, float]):
+        self.fields = fields
+        self._postings: dict[str, dict[str, float]] = defaultdict(dict)
+        self._doc_terms: dict[str, set[str]] = {}
+        self._terms: list[str] = []
+        self._pending: list[tuple[str, dict | None]] | None = None
+        self.ready = False
+
+    def __len__(self) -> int:
+        return len(self._doc_terms)
+
+    def add(self, doc_id: str, document: dict):
+        """Index ``document`` under ``doc_id``, replacing any previous version."""
+        if self._pending is not None:
+            self._pending.append((doc_id, document))
+        self._add(doc_id, document)
+
+    def remove(self, doc_id: str):
+        if self._pending is not None:
+            self._pending.append((doc_id, None))
+        self._remove(doc_id)
+
+    def _add(self, doc_id: str, document: dict):
+        self._remove(doc_id)
+        weights: dict[str, float] = defaultdict(float)
+        for field, weight in self.fields.items():
+            value = document.get(field)
+            if value:
+                for term in tokenize(str(value)):
+                    weights[term] += weight
+        for term, weight in weights.items():
+            if term not in self._postings:
+                bisect.insort(self._terms, term)
+            self._postings[term][doc_id] = weight
+        self._doc_terms[doc_id] = set(weights)
+
+    def _remove(self, doc_id: str):
+        for term in self._doc_terms.pop(doc_id, ()):
+            postings = self._postings[term]
+            postings.pop(doc_id, None)
+            if not postings:
+                del self._postings[term]
+                self._terms.pop(bisect.bisect_left(self._terms, term))
+
+    def _expand(self, token: str):
+        """Yield ``(term, weight)`` for the exact term and every term it prefixes."""
+        start = bisect.bisect_left(self._terms, token)
+        for term in self._terms[start:]:
+            if not term.startswith(token):
+                break
+            yield term, 1.0 if term == token else self.PREFIX_WEIGHT
+
+    def search(self, query: str) -> list[tuple[str, float]]:
+        """Return every matching ``(doc_id, score)``, best first."""
+        tokens = tokenize(query)
+        if not tokens:
+            return []
+        total_docs = len(self._doc_terms) or 1
+        scores: dict[str, float] | None = None
+        for token in dict.fromkeys(tokens):
+            token_scores: dict[str, float] = defaultdict(float)
+            for term, match_weight in self._expand(token):
+                postings = self._postings[term]
+                idf = math.log(1 + total_docs / len(postings))
+                for doc_id, weight in postings.items():
+                    token_scores[doc_id] = max(token_scores[doc_id], match_weight * weight * idf)
+            if scores is None:
+                scores = token_scores
+            else:
+                scores = {doc_id: score + token_scores[doc_id]
+                          for doc_id, score in scores.items() if doc_id in token_scores}
+            if not scores:
+                return []
+        return sorted(scores.items(), key=lambda item: item[1], reverse=True)
+
+    async def build(self, collection, query: dict | None = None):
+        """(Re)build the index from the documents in ``collection`` matching ``query``."""
+        fresh = SearchIndex(self.fields)
+        self._pending = []
+        try:
+            projection = {field: 1 for field in self.fields}
+            async for document in collection.find(query or {}, projection):
+                fresh._add(str(document["_id"]), document)
+            for doc_id, document in self._pending:
+                if document is None:
+                    fresh._remove(doc_id)
+                else:
+                    fresh._add(doc_id, document)
+        finally:
+            self._pending = None
+        self._postings, self._doc_terms, self._terms = fresh._postings, fresh._doc_terms, fresh._terms
+        self.ready = True
@@ -0,0 +1,27 @@
+import orjson
+from bson import ObjectId
+from fastapi.responses import ORJSONResponse
+
+
+def json_default(value):
+    """orjson fallback for BSON types; datetimes are handled natively by orjson."""
+    if isinstance(value, ObjectId):
+        return str(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def dumps(value, sort_keys: bool = False) -> bytes:
+    option = orjson.OPT_SORT_KEYS if sort_keys else 0
+    return orjson.dumps(value, default=json_default, option=option)
+
+
+class MongoJSONResponse(ORJSONResponse):
+    """JSON response rendered by orjson that accepts raw Mongo documents.
+
+    ``ObjectId`` values become strings and datetimes ISO 8601 strings, so list
+    handlers can return driver output as is. Returning this class directly
+    from a handler also skips FastAPI's ``jsonable_encoder`` pass.
+    """
+
+    def render(self, content) -> bytes:
+        return dumps(content)
@@ -0,0 +1,147 @@
+import asyncio
+import datetime
+import logging
+
+logger = logging.getLogger(__name__)
+
+STATS_ID = "dashboard"
+APPLICATION_STATUSES = ("pending", "approved", "rejected")
+
+
+def _day(value) -> str:
+    if isinstance(value, datetime.datetime):
+        return value.strftime("%Y-%m-%d")
+    return str(value)[:10]
+
+
+class DashboardStats:
+    """Materialized dashboard counters kept in a single document.
+
+    Write handlers update the counters with ``$inc`` as they go, so reading
+    the dashboard is one ``find_one``. ``reconcile`` recomputes everything from
+    the source collections with a ``$facet`` aggregation to repair any drift;
+    records moved to the archive collections still count.
+    """
+
+    def __init__(self, collection, contacts, applications, reconcile_interval: float = 3600.0,
+                 archived_contacts=None, archived_applications=None):
+        self.collection = collection
+        self.contacts = contacts
+        self.applications = applications
+        self.archived_contacts = archived_contacts
+        self.archived_applications = archived_applications
+        self.reconcile_interval = reconcile_interval
+        self._task: asyncio.Task | None = None
+
+    async def _inc(self, counters: dict):
+        await self.collection.update_one({"_id": STATS_ID}, {"$inc": counters}, upsert=True)
+
+    async def record_inquiry(self, created_at: datetime.datetime):
+        await self._inc({
+            "inquiries.total": 1,
+            "inquiries.unsolved": 1,
+            f"days.{_day(created_at)}.inquiries": 1,
+        })
+
+    async def record_inquiry_solved(self, count: int = 1):
+        await self._inc({"inquiries.unsolved": -count, "inquiries.solved": count})
+
+    async def record_application(self, applied_date: str, status: str = "pending"):
+        await self._inc({
+            "applications.total": 1,
+            f"applications.{status}": 1,
+            f"days.{_day(applied_date)}.applications": 1,
+        })
+
+    async def record_status_change(self, old_status: str, new_status: str):
+        await self.record_status_changes([(old_status, new_status)])
+
+    async def record_status_changes(self, changes):
+        """Apply several ``(old_status, new_status)`` transitions in one update."""
+        counters = {}
+        for old_status, new_status in changes:
+            if old_status == new_status:
+                continue
+            counters[f"applications.{old_status}"] = counters.get(f"applications.{old_status}", 0) - 1
+            counters[f"applications.{new_status}"] = counters.get(f"applications.{new_status}", 0) + 1
+        if counters:
+            await self._inc(counters)
+
+    async def get(self) -> dict:
+        stats = await self.collection.find_one({"_id": STATS_ID}, {"_id": 0})
+        return stats or {}
+
+    @staticmethod
+    async def _facets(collections, pipeline: list) -> dict:
+        """Run ``pipeline`` on every collection given and concatenate its facets."""
+        merged = {"status": [], "days": []}
+        for collection in collections:
+            if collection is None:
+                continue
+            facets = await collection.aggregate(pipeline).to_list(length=1)
+            for name in merged:
+                merged[name] += facets[0][name]
+        return merged
+
+    async def reconcile(self):
+        """Rebuild the counters from the source and archive collections."""
+        inquiry_facets = await self._facets((self.contacts, self.archived_contacts), [{"$facet": {
+            "status": [{"$group": {"_id": "$is_solved", "count": {"$sum": 1}}}],
+            "days": [{"$group": {
+                "_id": {"$dateToString": {"format": "%Y-%m-%d", "date": "$created_at"}},
+                "count": {"$sum": 1},
+            }}],
+        }}])
+        application_facets = await self._facets((self.applications, self.archived_applications), [{"$facet": {
+            "status": [{"$group": {"_id": "$status", "count": {"$sum": 1}}}],
+            "days": [{"$group": {"_id": {"$substrCP": ["$appliedDate", 0, 10]}, "count": {"$sum": 1}}}],
+        }}])
+
+        inquiries = {"total": 0, "solved": 0, "unsolved": 0}
+        for row in inquiry_facets["status"]:
+            inquiries["solved" if row["_id"] else "unsolved"] += row["count"]
+            inquiries["total"] += row["count"]
+
+        applications = {"total": 0, **{status: 0 for status in APPLICATION_STATUSES}}
+        for row in application_facets["status"]:
+            applications[row["_id"]] = applications.get(row["_id"], 0) + row["count"]
+            applications["total"] += row["count"]
+
+        days = {}
+        for key, facets in (("inquiries", inquiry_facets), ("applications", application_facets)):
+            for row in facets["days"]:
+                if row["_id"]:
+                    day = days.setdefault(row["_id"], {})
+                    day[key] = day.get(key, 0) + row["count"]
+
+        await self.collection.replace_one(
+            {"_id": STATS_ID},
+            {
+                "inquiries": inquiries,
+                "applications": applications,
+                "days": days,
+                "reconciled_at": datetime.datetime.utcnow(),
+            },
+            upsert=True,
+        )
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self):
+        while True:
+            try:
+                await self.reconcile()
+            except Exception as e:
+                logger.error(f"Stats reconciliation failed: {str(e)}")
+            await asyncio.sleep(self.reconcile_interval)
@@ -0,0 +1,158 @@
+"""EmailOutbox against a local SMTP server (aiosmtpd) and an in-memory Mongo.
+
+    pip install pytest aiosmtpd mongomock-motor
+    python -m pytest test_outbox.py
+"""
+import asyncio
+import datetime
+import socket
+from types import SimpleNamespace
+import pytest
+
+aiosmtpd_controller = pytest.importorskip("aiosmtpd.controller")
+mongomock_motor = pytest.importorskip("mongomock_motor")
+
+from outbox import EmailOutbox
+
+REFUSED = "refused@example.com"
+
+
+class RecordingHandler:
+    """Accepts every message except those addressed to ``REFUSED``."""
+
+    def __init__(self):
+        self.messages = []
+
+    async def handle_RCPT(self, server, session, envelope, address, rcpt_options):
+        if address == REFUSED:
+            return "550 Mailbox unavailable"
+        envelope.rcpt_tos.append(address)
+        return "250 OK"
+
+    async def handle_DATA(self, server, session, envelope):
+        self.messages.append(envelope)
+        return "250 Message accepted for delivery"
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+@pytest.fixture
+def smtp_server():
+    handler = RecordingHandler()
+    controller = aiosmtpd_controller.Controller(handler, hostname="127.0.0.1", port=free_port())
+    controller.start()
+    yield handler, controller.port
+    controller.stop()
+
+
+def mail_conf(port: int):
+    return SimpleNamespace(
+        MAIL_SERVER="127.0.0.1",
+        MAIL_PORT=port,
+        MAIL_SSL_TLS=False,
+        MAIL_STARTTLS=False,
+        TIMEOUT=5,
+        USE_CREDENTIALS=False,
+        MAIL_FROM="site@example.com",
+        MAIL_FROM_NAME="Site",
+    )
+
+
+def run_outbox(port: int, scenario, **options):
+    """Run ``scenario(outbox, collection)`` with a fresh outbox and collection."""
+
+    async def main():
+        collection = mongomock_motor.AsyncMongoMockClient()["outbox_test"]["email_outbox"]
+        outbox = EmailOutbox(collection, lambda: mail_conf(port), **options)
+        try:
+            return await scenario(outbox, collection)
+        finally:
+            await outbox.stop()
+
+    return asyncio.run(main())
+
+
+def test_delivers_message_and_runs_on_sent(smtp_server):
+    handler, port = smtp_server
+    sent = []
+
+    async def on_sent(message):
+        sent.append(message)
+
+    async def scenario(outbox, collection):
+        outbox.on_sent = on_sent
+        await outbox.enqueue("client@example.com", "Re: Quote", "<p>Hi</p>", "Hi", inquiry_id="abc")
+        assert await outbox.process_batch() == 1
+        return await collection.find_one({})
+
+    stored = run_outbox(port, scenario)
+
+    assert stored["status"] == "sent"
+    assert stored["sent_at"] is not None
+    assert [message["inquiry_id"] for message in sent] == ["abc"]
+    assert len(handler.messages) == 1
+    assert handler.messages[0].rcpt_tos == ["client@example.com"]
+    assert b"Subject: Re: Quote" in handler.messages[0].content
+
+
+def test_refused_send_is_retried_with_backoff(smtp_server):
+    handler, port = smtp_server
+
+    async def scenario(outbox, collection):
+        await outbox.enqueue(REFUSED, "Re: Quote", "<p>Hi</p>", "Hi")
+        before = datetime.datetime.utcnow()
+        assert await outbox.process_batch() == 1
+        failed = await collection.find_one({})
+        # Not due yet, so the next batch leaves it alone
+        assert await outbox.process_batch() == 0
+        return before, failed
+
+    before, failed = run_outbox(port, scenario, retry_base=60.0)
+
+    assert failed["status"] == "pending"
+    assert failed["attempts"] == 1
+    assert "Mailbox unavailable" in failed["last_error"]
+    assert failed["next_attempt_at"] >= before + datetime.timedelta(seconds=59)
+    assert handler.messages == []
+
+
+def test_gives_up_after_max_attempts(smtp_server):
+    handler, port = smtp_server
+
+    async def scenario(outbox, collection):
+        await outbox.enqueue(REFUSED, "Re: Quote", "<p>Hi</p>", "Hi")
+        # retry_base=0 makes every retry due at once, so one batch runs them all
+        await outbox.process_batch()
+        return await collection.find_one({})
+
+    stored = run_outbox(port, scenario, retry_base=0.0, max_attempts=3)
+
+    assert stored["status"] == "failed"
+    assert stored["attempts"] == 3
+    assert handler.messages == []
+
+
+def test_reclaims_only_expired_leases(smtp_server):
+    handler, port = smtp_server
+
+    async def scenario(outbox, collection):
+        now = datetime.datetime.utcnow()
+        message = {"subject": "Re: Quote", "html_body": "<p>Hi</p>", "plain_text_body": "Hi", "attempts": 0,
+                   "status": "sending", "next_attempt_at": now, "created_at": now}
+        # The worker holding this one died; its lease ran out a minute ago
+        await collection.insert_one({**message, "_id": "expired", "recipient": "expired@example.com",
+                                     "lease_expires_at": now - datetime.timedelta(minutes=1)})
+        # Still being sent by a live worker
+        await collection.insert_one({**message, "_id": "leased", "recipient": "leased@example.com",
+                                     "lease_expires_at": now + datetime.timedelta(minutes=5)})
+        assert await outbox.process_batch() == 1
+        return {doc["_id"]: doc["status"] async for doc in collection.find({})}
+
+    statuses = run_outbox(port, scenario)
+
+    assert statuses == {"expired": "sent", "leased": "sending"}
+    assert [envelope.rcpt_tos for envelope in handler.messages] == [["expired@example.com"]]
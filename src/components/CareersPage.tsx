@@ -2,6 +2,7 @@ import React, { useState, useEffect } from 'react';
 import { motion, AnimatePresence } from 'framer-motion';
 import { ChefHat, Camera, Users, X } from 'lucide-react';
 import axios from 'axios';
+import { fetchBundleSection } from '../lib/publicBundle';
 import Navbar from './Navbar';
 import { BackgroundBeams } from './ui/background-beams';
 
@@ -47,9 +48,9 @@ const CareersPage = () => {
   useEffect(() => {
     const fetchJobs = async () => {
       try {
-        const response = await axios.get('http://127.0.0.1:8000/job-listings');
+        const listings = await fetchBundleSection<JobListing>('job-listings');
         // Filter only active jobs
-        const activeJobs = response.data.filter((job: JobListing) => job.isActive);
+        const activeJobs = listings.filter((job) => job.isActive);
         setJobs(activeJobs);
         setError(null);
       } catch (err) {
@@ -82,8 +83,18 @@ const CareersPage = () => {
     setSubmitStatus({ type: null, message: '' });
 
     try {
+      // Upload the resume file first; the application only stores its ID
+      let resumeId: string | undefined;
+      if (formData.resume) {
+        const upload = new FormData();
+        upload.append('file', formData.resume);
+        const uploadResponse = await axios.post('http://127.0.0.1:8000/job-applications/resume', upload);
+        resumeId = uploadResponse.data.resume_id;
+      }
+
       const applicationData = {
         ...formData,
+        resume: resumeId,
         status: 'pending',
         appliedDate: new Date().toISOString()
       };
@@ -105,9 +116,12 @@ const CareersPage = () => {
         });
       }
     } catch (error) {
+      const duplicate = axios.isAxiosError(error) && error.response?.status === 409;
       setSubmitStatus({
         type: 'error',
-        message: 'Failed to submit application. Please try again.'
+        message: duplicate
+          ? 'You have already applied for this position.'
+          : 'Failed to submit application. Please try again.'
       });
       console.error('Error submitting application:', error);
     } finally {
@@ -36,6 +36,10 @@ const ContactSection = () => {
       );
       setStatusMessage(response.data.message);
     } catch (error) {
+      if (axios.isAxiosError(error) && error.response?.status === 409) {
+        setStatusMessage("We already received this message.");
+        return;
+      }
       setStatusMessage("Error submitting form");
       console.error("There was an error submitting the form", error);
     }
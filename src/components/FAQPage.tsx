@@ -1,7 +1,7 @@
 import React, { useState, useEffect } from 'react';
 import { motion, AnimatePresence } from 'framer-motion';
 import { ChevronDown } from 'lucide-react';
-import axios from 'axios';
+import { fetchBundleSection } from '../lib/publicBundle';
 import Navbar from './Navbar';
 import { BackgroundBeams } from './ui/background-beams';
 
@@ -22,8 +22,7 @@ const FAQPage = () => {
   useEffect(() => {
     const fetchFAQs = async () => {
       try {
-        const response = await axios.get('http://127.0.0.1:8000/faqs');
-        setFaqs(response.data);
+        setFaqs(await fetchBundleSection<FAQ>('faqs'));
         setError(null);
       } catch (err) {
         console.error('Error fetching FAQs:', err);
@@ -1,9 +1,11 @@
-import React, { useState } from 'react';
+import React, { useEffect, useState } from 'react';
 import { motion, AnimatePresence } from 'framer-motion';
 import { ChevronLeft, ChevronRight, X, Calendar, MapPin, Users } from 'lucide-react';
+import axios from 'axios';
+import { GALLERY_EVENTS_URL, GalleryAsset, GalleryEvent as StoredGalleryEvent, imageSources } from '../lib/gallery';
 
 interface GalleryEvent {
-  id: number;
+  id: number | string;
   title: string;
   description: string;
   date: string;
@@ -13,6 +15,7 @@ interface GalleryEvent {
   thumbnail: string;
   images: string[];
   details: string;
+  assets?: Record<string, GalleryAsset>;
 }
 
 const events: GalleryEvent[] = [
@@ -115,9 +118,21 @@ const events: GalleryEvent[] = [
 ];
 
 const InteractiveGallery = () => {
+  const [galleryEvents, setGalleryEvents] = useState<GalleryEvent[]>(events);
   const [selectedEvent, setSelectedEvent] = useState<GalleryEvent | null>(null);
   const [currentImageIndex, setCurrentImageIndex] = useState(0);
 
+  // Events managed in the admin panel replace the built-in examples once loaded
+  useEffect(() => {
+    axios.get<StoredGalleryEvent[]>(GALLERY_EVENTS_URL)
+      .then((response) => {
+        if (response.data.length > 0) {
+          setGalleryEvents(response.data.map((event) => ({ ...event, id: event._id as string })));
+        }
+      })
+      .catch((error) => console.error('Error fetching gallery events:', error));
+  }, []);
+
   const openEventDetails = (event: GalleryEvent) => {
     setSelectedEvent(event);
     setCurrentImageIndex(0);
@@ -157,7 +172,7 @@ const InteractiveGallery = () => {
         </motion.div>
 
         <div className="grid grid-cols-1 md:grid-cols-2 lg:grid-cols-3 gap-6">
-          {events.map((event, index) => (
+          {galleryEvents.map((event, index) => (
             <motion.div
               key={event.id}
               initial={{ opacity: 0, y: 20 }}
@@ -170,8 +185,9 @@ const InteractiveGallery = () => {
               <div className="bg-neutral-900/50 border border-neutral-800 rounded-xl overflow-hidden hover:border-neutral-700 transition-colors">
                 <div className="relative h-64 overflow-hidden">
                   <img
-                    src={event.thumbnail}
+                    {...imageSources(event.thumbnail, event.assets, 'small', '(min-width: 1024px) 33vw, (min-width: 768px) 50vw, 100vw')}
                     alt={event.title}
+                    loading="lazy"
                     className="w-full h-full object-cover transform transition-transform duration-500 group-hover:scale-110"
                   />
                   <div className="absolute top-4 right-4 bg-white/80 text-gray-800 px-3 py-1 rounded-full text-sm">
@@ -227,7 +243,7 @@ const InteractiveGallery = () => {
                       animate={{ opacity: 1 }}
                       exit={{ opacity: 0 }}
                       transition={{ duration: 0.5 }}
-                      src={selectedEvent.images[currentImageIndex]}
+                      {...imageSources(selectedEvent.images[currentImageIndex], selectedEvent.assets, 'large')}
                       alt={`${selectedEvent.title} - Image ${currentImageIndex + 1}`}
                       className="w-full h-full object-cover"
                     />
@@ -314,8 +330,9 @@ const InteractiveGallery = () => {
                           onClick={() => setCurrentImageIndex(index)}
                         >
                           <img
-                            src={image}
+                            {...imageSources(image, selectedEvent.assets, 'thumb', '33vw')}
                             alt={`Thumbnail ${index + 1}`}
+                            loading="lazy"
                             className="w-full h-24 object-cover"
                           />
                         </div>
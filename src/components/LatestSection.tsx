@@ -1,7 +1,7 @@
 import React, { useRef, useEffect, useState } from "react";
 import { motion, useScroll, useTransform } from "framer-motion";
 import { HeroParallax } from "./ui/hero-parallax";
-import axios from 'axios';
+import { fetchBundleSection } from '../lib/publicBundle';
 
 interface LatestWork {
   _id: string;
@@ -24,8 +24,7 @@ const LatestSection = () => {
   useEffect(() => {
     const fetchWorks = async () => {
       try {
-        const response = await axios.get('http://127.0.0.1:8000/latest-works');
-        setWorks(response.data);
+        setWorks(await fetchBundleSection<LatestWork>('latest-works'));
       } catch (error) {
         console.error('Error fetching works:', error);
       }
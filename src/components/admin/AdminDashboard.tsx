@@ -22,6 +22,7 @@ import GalleryManagement from "./sections/GalleryManagement";
 import LatestWorksManagement from "./sections/LatestWorksManagement";
 import FAQManagement from "./sections/FAQManagement";
 import AdminDashboard from "./sections/AdminDashboard";
+import { logoutAdmin } from "../../lib/adminApi";
 
 const AdminLayout = () => {
   const navigate = useNavigate();
@@ -71,8 +72,8 @@ const AdminLayout = () => {
     },
   ];
 
-  const handleLogout = () => {
-    localStorage.removeItem("adminToken");
+  const handleLogout = async () => {
+    await logoutAdmin();
     navigate("/admin/login");
   };
 
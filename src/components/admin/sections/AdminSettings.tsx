@@ -1,6 +1,7 @@
 import React, { useState } from 'react'; 
 import { motion } from 'framer-motion';
 import { User, Lock, Mail } from 'lucide-react';
+import { adminHeaders } from '../../../lib/adminApi';
 
 const AdminSettings = () => {
   const [formData, setFormData] = useState({
@@ -38,6 +39,7 @@ const AdminSettings = () => {
         method: "PATCH",
         headers: {
           "Content-Type": "application/json",
+          ...adminHeaders(),
         },
         body: JSON.stringify(updateData),
       });
@@ -66,6 +68,7 @@ const AdminSettings = () => {
         method: "POST",
         headers: {
           "Content-Type": "application/json",
+          ...adminHeaders(),
         },
         body: JSON.stringify(newAdmin),
       });
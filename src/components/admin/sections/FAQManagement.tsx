@@ -1,7 +1,7 @@
 import React, { useState, useEffect } from 'react';
 import { motion, AnimatePresence } from 'framer-motion';
 import { Plus, X, Edit2, Trash2, MessageSquare } from 'lucide-react';
-import axios from 'axios';
+import { adminApi } from '../../../lib/adminApi';
 
 interface FAQ {
   _id?: string;
@@ -23,7 +23,7 @@ const FAQManagement = () => {
   // Fetch FAQs from backend
   const fetchFAQs = async () => {
     try {
-      const response = await axios.get('http://127.0.0.1:8000/faqs');
+      const response = await adminApi.get('http://127.0.0.1:8000/faqs');
       setFaqs(response.data);
     } catch (error) {
       console.error('Error fetching FAQs:', error);
@@ -39,10 +39,10 @@ const FAQManagement = () => {
     try {
       if (editingFAQ?._id) {
         // Update existing FAQ
-        await axios.put(`http://127.0.0.1:8000/faqs/${editingFAQ._id}`, newFAQ);
+        await adminApi.put(`http://127.0.0.1:8000/faqs/${editingFAQ._id}`, newFAQ);
       } else {
         // Create new FAQ
-        await axios.post('http://127.0.0.1:8000/faqs', newFAQ);
+        await adminApi.post('http://127.0.0.1:8000/faqs', newFAQ);
       }
 
       setIsAddingFAQ(false);
@@ -63,7 +63,7 @@ const FAQManagement = () => {
   const handleDelete = async (id: string) => {
     if (window.confirm('Are you sure you want to delete this FAQ?')) {
       try {
-        await axios.delete(`http://127.0.0.1:8000/faqs/${id}`);
+        await adminApi.delete(`http://127.0.0.1:8000/faqs/${id}`);
         fetchFAQs(); // Refresh the FAQ list
       } catch (error) {
         console.error('Error deleting FAQ:', error);
@@ -1,91 +1,100 @@
-import React, { useState } from 'react';
+import React, { useState, useEffect } from 'react';
 import { motion, AnimatePresence } from 'framer-motion';
-import { Plus, X, Edit2, Trash2, Image as ImageIcon, Calendar, MapPin, Users } from 'lucide-react';
-
-interface GalleryEvent {
-  id: string;
-  title: string;
-  description: string;
-  date: string;
-  location: string;
-  attendees: number;
-  category: string;
-  thumbnail: string;
-  images: string[];
-  details: string;
-  highlights: string[];
-}
+import { Plus, X, Edit2, Trash2, Upload, Image as ImageIcon, Calendar, MapPin, Users } from 'lucide-react';
+import { adminApi } from '../../../lib/adminApi';
+import { GALLERY_EVENTS_URL, GALLERY_UPLOAD_URL, GalleryAsset, GalleryEvent, imageSources } from '../../../lib/gallery';
+
+const emptyEvent: GalleryEvent = {
+  title: '',
+  description: '',
+  date: '',
+  location: '',
+  attendees: 0,
+  category: '',
+  thumbnail: '',
+  images: [],
+  details: '',
+  highlights: ['']
+};
 
 const GalleryManagement = () => {
-  const [events, setEvents] = useState<GalleryEvent[]>([
-    {
-      id: '1',
-      title: "Corporate Leadership Summit",
-      description: "Annual gathering of industry leaders",
-      date: "March 15, 2024",
-      location: "Grand Convention Center",
-      attendees: 500,
-      category: "Corporate",
-      thumbnail: "https://images.unsplash.com/photo-1511795409834-ef04bbd61622?q=80&w=2069",
-      images: [
-        "https://images.unsplash.com/photo-1511795409834-ef04bbd61622?q=80&w=2069",
-        "https://images.unsplash.com/photo-1515187029135-18ee286d815b?q=80&w=2070",
-        "https://images.unsplash.com/photo-1540575467063-178a50c2df87?q=80&w=2070"
-      ],
-      details: "Our annual Corporate Leadership Summit brought together 500+ executives from Fortune 500 companies for a day of insightful discussions, networking, and strategic planning.",
-      highlights: [
-        "500+ attendees from Fortune 500 companies",
-        "20 keynote speakers",
-        "Interactive workshops",
-        "Networking sessions"
-      ]
+  const [events, setEvents] = useState<GalleryEvent[]>([]);
+  const [uploading, setUploading] = useState(false);
+
+  // Fetch gallery events from backend
+  const fetchEvents = async () => {
+    try {
+      const response = await adminApi.get(GALLERY_EVENTS_URL);
+      setEvents(response.data);
+    } catch (error) {
+      console.error('Error fetching gallery events:', error);
     }
-  ]);
+  };
+
+  useEffect(() => {
+    fetchEvents();
+  }, []);
 
   const [isAddingEvent, setIsAddingEvent] = useState(false);
   const [editingEvent, setEditingEvent] = useState<GalleryEvent | null>(null);
-  const [newEvent, setNewEvent] = useState<Partial<GalleryEvent>>({
-    title: '',
-    description: '',
-    date: '',
-    location: '',
-    attendees: 0,
-    category: '',
-    thumbnail: '',
-    images: [],
-    details: '',
-    highlights: ['']
-  });
-
-  const handleSubmit = (e: React.FormEvent) => {
+  const [newEvent, setNewEvent] = useState<GalleryEvent>(emptyEvent);
+
+  const handleSubmit = async (e: React.FormEvent) => {
     e.preventDefault();
-    if (editingEvent) {
-      setEvents(events.map(event =>
-        event.id === editingEvent.id ? { ...event, ...newEvent } as GalleryEvent : event
-      ));
+    // assets are resolved by the server; only image IDs/URLs are stored
+    const payload = { ...newEvent, highlights: newEvent.highlights.filter(Boolean) };
+    delete payload._id;
+    delete payload.assets;
+    try {
+      if (editingEvent?._id) {
+        await adminApi.put(`${GALLERY_EVENTS_URL}/${editingEvent._id}`, payload);
+      } else {
+        await adminApi.post(GALLERY_EVENTS_URL, payload);
+      }
+      setIsAddingEvent(false);
       setEditingEvent(null);
-    } else {
-      setEvents([
-        ...events,
-        {
-          ...newEvent as GalleryEvent,
-          id: Date.now().toString(),
-        },
-      ]);
+      setNewEvent(emptyEvent);
+      fetchEvents(); // Refresh the event list
+    } catch (error) {
+      console.error('Error saving gallery event:', error);
+    }
+  };
+
+  // Upload originals; the server stores resized variants and returns the image ID
+  const uploadImages = async (files: FileList | null): Promise<GalleryAsset[]> => {
+    if (!files || files.length === 0) return [];
+    setUploading(true);
+    try {
+      const uploaded = await Promise.all(Array.from(files).map(async (file) => {
+        const formData = new FormData();
+        formData.append('file', file);
+        const response = await adminApi.post<GalleryAsset>(GALLERY_UPLOAD_URL, formData);
+        return response.data;
+      }));
+      setNewEvent(prev => ({
+        ...prev,
+        assets: { ...(prev.assets || {}), ...Object.fromEntries(uploaded.map(asset => [asset._id, asset])) }
+      }));
+      return uploaded;
+    } catch (error) {
+      console.error('Error uploading images:', error);
+      alert('Image upload failed. Please try again.');
+      return [];
+    } finally {
+      setUploading(false);
+    }
+  };
+
+  const uploadThumbnail = async (files: FileList | null) => {
+    const [asset] = await uploadImages(files);
+    if (asset) {
+      setNewEvent(prev => ({ ...prev, thumbnail: asset._id }));
     }
-    setIsAddingEvent(false);
-    setNewEvent({
-      title: '',
-      description: '',
-      date: '',
-      location: '',
-      attendees: 0,
-      category: '',
-      thumbnail: '',
-      images: [],
-      details: '',
-      highlights: ['']
-    });
+  };
+
+  const uploadGalleryImages = async (files: FileList | null) => {
+    const uploaded = await uploadImages(files);
+    setNewEvent(prev => ({ ...prev, images: [...prev.images, ...uploaded.map(asset => asset._id)] }));
   };
 
   const handleEdit = (event: GalleryEvent) => {
@@ -94,9 +103,14 @@ const GalleryManagement = () => {
     setIsAddingEvent(true);
   };
 
-  const handleDelete = (id: string) => {
+  const handleDelete = async (id: string) => {
     if (window.confirm('Are you sure you want to delete this event?')) {
-      setEvents(events.filter(event => event.id !== id));
+      try {
+        await adminApi.delete(`${GALLERY_EVENTS_URL}/${id}`);
+        fetchEvents(); // Refresh the event list
+      } catch (error) {
+        console.error('Error deleting gallery event:', error);
+      }
     }
   };
 
@@ -168,14 +182,14 @@ const GalleryManagement = () => {
         <div className="grid grid-cols-1 md:grid-cols-2 lg:grid-cols-3 gap-6">
           {events.map((event) => (
             <motion.div
-              key={event.id}
+              key={event._id}
               initial={{ opacity: 0, y: 20 }}
               animate={{ opacity: 1, y: 0 }}
               className="group relative bg-neutral-900 rounded-xl overflow-hidden"
             >
               <div className="aspect-w-16 aspect-h-9">
                 <img
-                  src={event.thumbnail}
+                  {...imageSources(event.thumbnail, event.assets, 'small', '(min-width: 1024px) 33vw, 100vw')}
                   alt={event.title}
                   className="w-full h-full object-cover"
                 />
@@ -202,7 +216,7 @@ const GalleryManagement = () => {
                 <motion.button
                   whileHover={{ scale: 1.05 }}
                   whileTap={{ scale: 0.95 }}
-                  onClick={() => handleDelete(event.id)}
+                  onClick={() => handleDelete(event._id as string)}
                   className="p-2 bg-red-500/10 text-red-500 rounded-lg hover:bg-red-500/20 transition-colors"
                 >
                   <Trash2 className="w-5 h-5" />
@@ -345,16 +359,36 @@ const GalleryManagement = () => {
                   </div>
 
                   <div>
-                    <label className="block text-sm font-medium text-neutral-300 mb-2">
-                      Thumbnail URL
-                    </label>
+                    <div className="flex justify-between items-center mb-2">
+                      <label className="block text-sm font-medium text-neutral-300">
+                        Thumbnail (URL or uploaded image)
+                      </label>
+                      <label className="text-blue-500 hover:text-blue-400 text-sm flex items-center gap-1 cursor-pointer">
+                        <Upload className="h-4 w-4" />
+                        {uploading ? 'Uploading...' : 'Upload'}
+                        <input
+                          type="file"
+                          accept="image/jpeg,image/png,image/webp"
+                          className="hidden"
+                          disabled={uploading}
+                          onChange={(e) => uploadThumbnail(e.target.files)}
+                        />
+                      </label>
+                    </div>
                     <input
-                      type="url"
+                      type="text"
                       value={newEvent.thumbnail}
                       onChange={(e) => setNewEvent({ ...newEvent, thumbnail: e.target.value })}
                       className="w-full px-3 py-2 bg-neutral-800 rounded-lg border border-neutral-700 focus:ring-2 focus:ring-blue-500 focus:outline-none text-white"
                       required
                     />
+                    {newEvent.thumbnail && (
+                      <img
+                        {...imageSources(newEvent.thumbnail, newEvent.assets, 'thumb', '160px')}
+                        alt="Thumbnail preview"
+                        className="mt-2 h-20 rounded-lg object-cover"
+                      />
+                    )}
                   </div>
 
                   <div>
@@ -362,24 +396,45 @@ const GalleryManagement = () => {
                       <label className="block text-sm font-medium text-neutral-300">
                         Additional Images
                       </label>
-                      <button
-                        type="button"
-                        onClick={addImage}
-                        className="text-blue-500 hover:text-blue-400 text-sm flex items-center gap-1"
-                      >
-                        <Plus className="h-4 w-4" />
-                        Add Image
-                      </button>
+                      <div className="flex items-center gap-4">
+                        <label className="text-blue-500 hover:text-blue-400 text-sm flex items-center gap-1 cursor-pointer">
+                          <Upload className="h-4 w-4" />
+                          {uploading ? 'Uploading...' : 'Upload Images'}
+                          <input
+                            type="file"
+                            accept="image/jpeg,image/png,image/webp"
+                            multiple
+                            className="hidden"
+                            disabled={uploading}
+                            onChange={(e) => uploadGalleryImages(e.target.files)}
+                          />
+                        </label>
+                        <button
+                          type="button"
+                          onClick={addImage}
+                          className="text-blue-500 hover:text-blue-400 text-sm flex items-center gap-1"
+                        >
+                          <Plus className="h-4 w-4" />
+                          Add Image URL
+                        </button>
+                      </div>
                     </div>
                     <div className="space-y-2">
                       {newEvent.images?.map((image, index) => (
                         <div key={index} className="flex gap-2">
+                          {newEvent.assets?.[image] && (
+                            <img
+                              {...imageSources(image, newEvent.assets, 'thumb', '64px')}
+                              alt={`Image ${index + 1}`}
+                              className="h-10 w-16 rounded object-cover"
+                            />
+                          )}
                           <input
-                            type="url"
+                            type="text"
                             value={image}
                             onChange={(e) => updateImage(index, e.target.value)}
                             className="flex-1 px-3 py-2 bg-neutral-800 rounded-lg border border-neutral-700 focus:ring-2 focus:ring-blue-500 focus:outline-none text-white"
-                            placeholder="Image URL"
+                            placeholder="Image URL or uploaded image ID"
                           />
                           <button
                             type="button"
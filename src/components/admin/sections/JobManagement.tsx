@@ -1,7 +1,7 @@
 import React, { useState, useEffect } from 'react';
 import { motion, AnimatePresence } from 'framer-motion';
 import { ChefHat, Camera, Users, X, Check, Trash2, Plus, Edit2 } from 'lucide-react';
-import axios from 'axios';
+import { adminApi, withAdminToken } from '../../../lib/adminApi';
 
 interface JobApplication {
   _id: string;
@@ -33,6 +33,8 @@ const JobManagement = () => {
   const [jobListings, setJobListings] = useState<JobListing[]>([]);
   const [loading, setLoading] = useState(true);
   const [error, setError] = useState<string | null>(null);
+  const [nextCursor, setNextCursor] = useState<string | null>(null);
+  const [loadingMore, setLoadingMore] = useState(false);
   const [isAddingJob, setIsAddingJob] = useState(false);
   const [editingJob, setEditingJob] = useState<JobListing | null>(null);
   const [newJob, setNewJob] = useState<JobListing>({
@@ -49,14 +51,29 @@ const JobManagement = () => {
     fetchData();
   }, [activeTab]);
 
+  // After the initial snapshot, apply pushed application changes
+  useEffect(() => {
+    const feed = new EventSource(withAdminToken('http://127.0.0.1:8000/admin/feed'));
+    feed.addEventListener('application.created', (e) => {
+      const { id, data } = JSON.parse((e as MessageEvent).data);
+      setApplications((prev) => (prev.some((app) => app._id === id) ? prev : [{ ...data, _id: id }, ...prev]));
+    });
+    feed.addEventListener('application.status', (e) => {
+      const { id, data } = JSON.parse((e as MessageEvent).data);
+      setApplications((prev) => prev.map((app) => (app._id === id ? { ...app, status: data.status } : app)));
+    });
+    return () => feed.close();
+  }, []);
+
   const fetchData = async () => {
     setLoading(true);
     try {
       if (activeTab === 'applications') {
-        const response = await axios.get('http://127.0.0.1:8000/job-applications');
+        const response = await adminApi.get('http://127.0.0.1:8000/job-applications');
         setApplications(response.data);
+        setNextCursor(response.headers['x-next-cursor'] ?? null);
       } else {
-        const response = await axios.get('http://127.0.0.1:8000/job-listings');
+        const response = await adminApi.get('http://127.0.0.1:8000/job-listings');
         setJobListings(response.data);
       }
       setError(null);
@@ -68,10 +85,29 @@ const JobManagement = () => {
     }
   };
 
+  // Applications are paged newest first; X-Next-Cursor points at the next page
+  const loadMoreApplications = async () => {
+    if (!nextCursor) return;
+    setLoadingMore(true);
+    try {
+      const response = await adminApi.get('http://127.0.0.1:8000/job-applications', { params: { cursor: nextCursor } });
+      setApplications((prev) => {
+        const seen = new Set(prev.map((app) => app._id));
+        return [...prev, ...response.data.filter((app: JobApplication) => !seen.has(app._id))];
+      });
+      setNextCursor(response.headers['x-next-cursor'] ?? null);
+    } catch (err) {
+      console.error('Error fetching more applications:', err);
+      setError('Failed to load more applications');
+    } finally {
+      setLoadingMore(false);
+    }
+  };
+
   const handleStatusChange = async (applicationId: string, newStatus: 'approved' | 'rejected') => {
     try {
-      await axios.patch(`http://127.0.0.1:8000/job-applications/${applicationId}/status?status=${newStatus}`);
-      fetchData();
+      await adminApi.patch(`http://127.0.0.1:8000/job-applications/${applicationId}/status?status=${newStatus}`);
+      setApplications((prev) => prev.map((app) => (app._id === applicationId ? { ...app, status: newStatus } : app)));
     } catch (error) {
       console.error('Error updating application status:', error);
     }
@@ -81,9 +117,9 @@ const JobManagement = () => {
     e.preventDefault();
     try {
       if (editingJob?._id) {
-        await axios.put(`http://127.0.0.1:8000/job-listings/${editingJob._id}`, newJob);
+        await adminApi.put(`http://127.0.0.1:8000/job-listings/${editingJob._id}`, newJob);
       } else {
-        await axios.post('http://127.0.0.1:8000/job-listings', newJob);
+        await adminApi.post('http://127.0.0.1:8000/job-listings', newJob);
       }
       setIsAddingJob(false);
       setEditingJob(null);
@@ -105,7 +141,7 @@ const JobManagement = () => {
   const handleDeleteJob = async (jobId: string) => {
     if (window.confirm('Are you sure you want to delete this job listing?')) {
       try {
-        await axios.delete(`http://127.0.0.1:8000/job-listings/${jobId}`);
+        await adminApi.delete(`http://127.0.0.1:8000/job-listings/${jobId}`);
         fetchData();
       } catch (error) {
         console.error('Error deleting job listing:', error);
@@ -278,6 +314,17 @@ const JobManagement = () => {
                     <p>Phone: {application.phone}</p>
                     <p>Age: {application.experience}</p>
                     {application.address && <p>Address: {application.address}</p>}
+                    {application.resume && (
+                      <p>
+                        Resume:{' '}
+                        <a
+                          href={withAdminToken(`http://127.0.0.1:8000/job-applications/resume/${application.resume}`)}
+                          className="text-blue-400 hover:underline"
+                        >
+                          Download
+                        </a>
+                      </p>
+                    )}
                     <p>Applied: {new Date(application.appliedDate).toLocaleDateString()}</p>
                   </div>
                 </motion.div>
@@ -289,6 +336,16 @@ const JobManagement = () => {
                 No job applications yet
               </div>
             )}
+
+            {nextCursor && (
+              <button
+                onClick={loadMoreApplications}
+                disabled={loadingMore}
+                className="w-full py-3 text-neutral-400 hover:text-white bg-neutral-900 rounded-lg transition-colors disabled:opacity-50"
+              >
+                {loadingMore ? 'Loading...' : 'Load more applications'}
+              </button>
+            )}
           </div>
         ) : (
           <div className="grid gap-4">
@@ -1,7 +1,7 @@
 import React, { useState, useEffect } from 'react';
 import { motion, AnimatePresence } from 'framer-motion';
 import { Plus, X, Edit2, Trash2, Image as ImageIcon } from 'lucide-react';
-import axios from 'axios';
+import { adminApi } from '../../../lib/adminApi';
 
 interface LatestWork {
   _id?: string;
@@ -25,7 +25,7 @@ const LatestWorksManagement = () => {
   // Fetch works from backend
   const fetchWorks = async () => {
     try {
-      const response = await axios.get('http://127.0.0.1:8000/latest-works');
+      const response = await adminApi.get('http://127.0.0.1:8000/latest-works');
       setWorks(response.data);
     } catch (error) {
       console.error('Error fetching works:', error);
@@ -41,10 +41,10 @@ const LatestWorksManagement = () => {
     try {
       if (editingWork?._id) {
         // Update existing work
-        await axios.put(`http://127.0.0.1:8000/latest-works/${editingWork._id}`, newWork);
+        await adminApi.put(`http://127.0.0.1:8000/latest-works/${editingWork._id}`, newWork);
       } else {
         // Create new work
-        await axios.post('http://127.0.0.1:8000/latest-works', newWork);
+        await adminApi.post('http://127.0.0.1:8000/latest-works', newWork);
       }
 
       setIsAddingWork(false);
@@ -70,7 +70,7 @@ const LatestWorksManagement = () => {
   const handleDelete = async (id: string) => {
     if (window.confirm('Are you sure you want to delete this work? This action cannot be undone.')) {
       try {
-        await axios.delete(`http://127.0.0.1:8000/latest-works/${id}`);
+        await adminApi.delete(`http://127.0.0.1:8000/latest-works/${id}`);
         fetchWorks(); // Refresh the works list
       } catch (error) {
         console.error('Error deleting work:', error);
@@ -1,7 +1,7 @@
 import React, { useEffect, useState } from 'react';
 import { motion } from 'framer-motion';
 import { Mail, CheckCircle, Send } from 'lucide-react';
-import axios from 'axios';
+import { adminApi, withAdminToken } from '../../../lib/adminApi';
 
 interface Inquiry {
   id: string;
@@ -22,15 +22,38 @@ const UserInquiries = () => {
   const [sending, setSending] = useState(false);
   const [error, setError] = useState<string | null>(null);
   const [success, setSuccess] = useState<string | null>(null);
+  const [nextCursor, setNextCursor] = useState<string | null>(null);
+  const [loadingMore, setLoadingMore] = useState(false);
 
   useEffect(() => {
     fetchInquiries();
   }, []);
 
-  const fetchInquiries = async () => {
+  // After the initial snapshot, apply pushed changes instead of re-fetching
+  useEffect(() => {
+    const feed = new EventSource(withAdminToken('http://127.0.0.1:8000/admin/feed'));
+    feed.addEventListener('inquiry.created', (e) => {
+      const { data } = JSON.parse((e as MessageEvent).data);
+      setInquiries((prev) => (prev.some((inq) => inq.id === data.id) ? prev : [data, ...prev]));
+    });
+    feed.addEventListener('inquiry.solved', (e) => {
+      const { id } = JSON.parse((e as MessageEvent).data);
+      setInquiries((prev) => prev.filter((inq) => inq.id !== id));
+    });
+    return () => feed.close();
+  }, []);
+
+  // The list is paged newest first; X-Next-Cursor points at the next page
+  const fetchInquiries = async (cursor?: string) => {
     try {
-      const response = await axios.get(API_BASE_URL);
-      setInquiries(response.data.filter((inq: Inquiry) => !inq.is_solved));
+      const response = await adminApi.get(API_BASE_URL, { params: cursor ? { cursor } : undefined });
+      const page = response.data.filter((inq: Inquiry) => !inq.is_solved);
+      setInquiries((prev) => {
+        if (!cursor) return page;
+        const seen = new Set(prev.map((inq) => inq.id));
+        return [...prev, ...page.filter((inq: Inquiry) => !seen.has(inq.id))];
+      });
+      setNextCursor(response.headers['x-next-cursor'] ?? null);
     } catch (error) {
       console.error("Error fetching inquiries:", error);
       setError("Failed to fetch inquiries");
@@ -39,9 +62,16 @@ const UserInquiries = () => {
     }
   };
 
+  const loadMore = async () => {
+    if (!nextCursor) return;
+    setLoadingMore(true);
+    await fetchInquiries(nextCursor);
+    setLoadingMore(false);
+  };
+
   const markAsSolved = async (id: string) => {
     try {
-      const response = await axios.patch(`${API_BASE_URL}/${id}/solve`);
+      const response = await adminApi.patch(`${API_BASE_URL}/${id}/solve`);
 
       if (response.status === 200) {
         setInquiries((prev) => prev.filter((inq) => inq.id !== id));
@@ -67,16 +97,19 @@ const UserInquiries = () => {
         html_body: `<p style="font-family: Arial, sans-serif; color: #333;">${replyMessage.replace(/\n/g, '<br>')}</p>` // Convert new lines to HTML <br>
       };
   
-      const response = await axios.post(
+      const response = await adminApi.post(
         `${API_BASE_URL}/${selectedInquiry.id}/reply`,
         emailData,
         { headers: { "Content-Type": "application/json" } }
       );
   
-      if (response.status === 200) {
-        setSuccess("Reply sent successfully");
+      if (response.status === 202) {
+        // The server marks the inquiry solved once the email is delivered
+        const id = selectedInquiry.id;
+        setInquiries((prev) => prev.filter((inq) => inq.id !== id));
+        setSelectedInquiry(null);
+        setSuccess("Reply queued for delivery");
         setReplyMessage('');
-        await markAsSolved(selectedInquiry.id);
       }
     } catch (error) {
       console.error("Error sending message:", error);
@@ -125,6 +158,15 @@ const UserInquiries = () => {
                   </motion.div>
                 ))
               )}
+              {nextCursor && (
+                <button
+                  onClick={loadMore}
+                  disabled={loadingMore}
+                  className="w-full mt-2 p-2 text-sm text-neutral-400 hover:text-white hover:bg-neutral-800 rounded-lg transition-colors disabled:opacity-50"
+                >
+                  {loadingMore ? 'Loading...' : 'Load more'}
+                </button>
+              )}
             </div>
 
             {/* Right Section - Inquiry Details */}
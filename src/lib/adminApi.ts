@@ -0,0 +1,55 @@
+import axios from 'axios';
+
+const API_URL = 'http://127.0.0.1:8000';
+const TOKEN_KEY = 'adminToken';
+
+export const getAdminToken = () => localStorage.getItem(TOKEN_KEY);
+
+// Axios instance for admin calls: sends the stored token and returns to the
+// login page once it is rejected (expired, logged out or password changed)
+export const adminApi = axios.create();
+
+adminApi.interceptors.request.use((config) => {
+  const token = getAdminToken();
+  if (token) {
+    config.headers.Authorization = `Bearer ${token}`;
+  }
+  return config;
+});
+
+adminApi.interceptors.response.use(
+  (response) => response,
+  (error) => {
+    if (axios.isAxiosError(error) && error.response?.status === 401) {
+      localStorage.removeItem(TOKEN_KEY);
+      window.location.assign('/admin/login');
+    }
+    return Promise.reject(error);
+  }
+);
+
+// Headers for admin calls made with fetch
+export const adminHeaders = (): Record<string, string> => {
+  const token = getAdminToken();
+  return token ? { Authorization: `Bearer ${token}` } : {};
+};
+
+// EventSource and download links cannot send headers, so the token goes in the URL
+export const withAdminToken = (url: string) => {
+  const token = getAdminToken();
+  if (!token) {
+    return url;
+  }
+  return `${url}${url.includes('?') ? '&' : '?'}access_token=${encodeURIComponent(token)}`;
+};
+
+export async function logoutAdmin() {
+  try {
+    // Plain axios: a rejected token must not trigger the redirect above
+    await axios.post(`${API_URL}/admin/logout`, null, { headers: adminHeaders() });
+  } catch (error) {
+    console.error('Error logging out:', error);
+  } finally {
+    localStorage.removeItem(TOKEN_KEY);
+  }
+}
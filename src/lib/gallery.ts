@@ -0,0 +1,58 @@
+const API_URL = 'http://127.0.0.1:8000';
+
+export interface ImageVariant {
+  width: number;
+  height: number;
+  webp: string;
+  jpg: string;
+}
+
+export interface GalleryAsset {
+  _id: string;
+  width: number;
+  height: number;
+  variants: Record<string, ImageVariant>;
+}
+
+export interface GalleryEvent {
+  _id?: string;
+  title: string;
+  description: string;
+  date: string;
+  location: string;
+  attendees: number;
+  category: string;
+  thumbnail: string;
+  images: string[];
+  details: string;
+  highlights: string[];
+  assets?: Record<string, GalleryAsset>;
+}
+
+export type VariantName = 'thumb' | 'small' | 'medium' | 'large';
+
+export const GALLERY_EVENTS_URL = `${API_URL}/gallery-events`;
+export const GALLERY_UPLOAD_URL = `${API_URL}/gallery/images`;
+
+const variantUrl = (key: string) => `${API_URL}/gallery/images/${key}`;
+
+// Resolve an image reference (uploaded image ID or external URL) to img attributes.
+// Uploaded images get a JPEG src of the requested size plus a WebP srcSet.
+export function imageSources(
+  ref: string,
+  assets: Record<string, GalleryAsset> | undefined,
+  size: VariantName,
+  sizes = '100vw'
+) {
+  const asset = assets?.[ref];
+  if (!asset) {
+    return { src: ref };
+  }
+  const widths = new Map<number, string>();
+  Object.values(asset.variants).forEach((variant) => widths.set(variant.width, variantUrl(variant.webp)));
+  return {
+    src: variantUrl(asset.variants[size].jpg),
+    srcSet: Array.from(widths, ([width, url]) => `${url} ${width}w`).join(', '),
+    sizes,
+  };
+}
@@ -0,0 +1,27 @@
+import axios from 'axios';
+
+export type BundleSection = 'latest-works' | 'faqs' | 'job-listings';
+
+interface PublicBundle {
+  version: string;
+  sections: Record<BundleSection, unknown[]>;
+}
+
+let bundleRequest: Promise<PublicBundle> | null = null;
+
+// One request for every public section, shared by all components on the page
+export function fetchPublicBundle(): Promise<PublicBundle> {
+  if (!bundleRequest) {
+    bundleRequest = axios.get<PublicBundle>('http://127.0.0.1:8000/public/bundle').then((response) => response.data);
+    // Let the next caller retry after a failure
+    bundleRequest.catch(() => {
+      bundleRequest = null;
+    });
+  }
+  return bundleRequest;
+}
+
+export async function fetchBundleSection<T>(section: BundleSection): Promise<T[]> {
+  const bundle = await fetchPublicBundle();
+  return bundle.sections[section] as T[];
+}